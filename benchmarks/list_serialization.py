@@ -0,0 +1,97 @@
+"""
+Benchmark of the list endpoints: walks 10k rows of GET /client/ and GET /commande/
+page by page (100 rows per page, keyset cursor), on a throwaway SQLite database.
+
+Usage:
+    python benchmarks/list_serialization.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def seed(engine, rows: int) -> None:
+    """
+    Inserts the communes, clients and orders listed by the benchmark.
+    """
+    from sqlmodel import Session
+    from src.models import Client, Commande, Commune, Departement
+    from src.repositories.bulk import insert_many
+
+    with Session(engine) as session:
+        insert_many(session, Departement, [{"departement_code": "59", "departement_nom": "Nord"}])
+        insert_many(session, Commune, [{"fk_commune_departement": "59", "commune_codepostal": "59000", "commune_ville": "Lille"}])
+        insert_many(session, Client, [
+            {
+                "client_genre": "Madame", "client_nom": f"NOM{i}", "client_prenom": f"Prenom{i}",
+                "client_adresse1": f"{i} rue de la Paix", "fk_commune_id": 1,
+                "client_telephone_portable": "0601020304", "client_email": f"client{i}@example.com", "client_newsletter": i % 2,
+            }
+            for i in range(rows)
+        ])
+        insert_many(session, Commande, [
+            {"commande_date": datetime.date(2024, 1, 1), "client_timbre": 2.5, "commande_timbre": 3.5, "client_cheque": 20.0, "fk_client_id": i % rows + 1}
+            for i in range(rows)
+        ])
+        session.commit()
+
+
+async def walk(client, url: str) -> int:
+    """
+    Fetches every page of a list endpoint, following the X-Next-Cursor header. Returns the number of rows.
+    """
+    rows = 0
+    params = {"limit": 100}
+    while True:
+        result = await client.get(url, params=params)
+        result.raise_for_status()
+        rows += len(result.json())
+        cursor = result.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+        params = {"limit": 100, "cursor": cursor}
+
+
+async def main(rows: int, repeat: int) -> None:
+    import httpx
+    from src.main import app
+    from src.database import engine, init_schema, dispose_engines
+
+    try:
+        await init_schema("create")
+        seed(engine, rows)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for url in ("/client/", "/commande/"):
+                await walk(client, url)
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    count = await walk(client, url)
+                    timings.append(time.perf_counter() - start)
+                best = min(timings)
+                print(f"GET {url:<12} {count} rows in {count // 100} pages: best {best * 1000:.0f} ms, "
+                      f"{best * 1000 / (count / 100):.2f} ms/page, {count / best:,.0f} rows/s")
+    finally:
+        # The aiosqlite connection threads would keep the process alive
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="digicheese-bench-") as directory:
+        os.environ["DB_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        os.environ["DB_REPLICA_URL"] = ""
+        os.environ["CACHE_TTL"] = "0"
+        asyncio.run(main(args.rows, args.repeat))
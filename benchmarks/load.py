@@ -0,0 +1,312 @@
+"""
+HTTP load benchmark: seeds a SQLite database with a realistic volume, starts the app with uvicorn
+and drives it with concurrent httpx clients over a mixed workload (lists, gets, order creation,
+colis updates). Reports p50/p95/p99 latency and throughput per route, compared with
+benchmarks/baseline.json.
+
+Usage:
+    python benchmarks/load.py [--clients 100000] [--details 1000000] [--duration 30] [--concurrency 32]
+    python benchmarks/load.py --db /tmp/bench.db        # seed once, then reuse the database
+    python benchmarks/load.py --url http://host:8000    # load a running server, already seeded (see --db)
+    python benchmarks/load.py --save-baseline           # record the results as the new baseline
+    python benchmarks/load.py --check                   # exit with 1 if a route regressed beyond --tolerance
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Lines per order and lines per colis of the seeded data
+LINES_PER_COMMANDE = 5
+LINES_PER_COLIS = 2
+# Rows per executemany while seeding
+SEED_CHUNK = 20000
+
+
+def seed(url: str, clients: int, details: int) -> dict:
+    """
+    Creates the schema and inserts the benchmark data set. Returns the row counts.
+
+    Volumes: `clients` clients spread over 200 communes, `details` order lines, five per order,
+    a colis for every other order holding two of its lines, 50 objets with three variations each.
+    The values are drawn from a seeded generator, so that two runs load the same data.
+    """
+    from sqlalchemy import create_engine, insert, text
+    from sqlmodel import SQLModel
+    from src.models import (
+        Client, Colis, Commande, Commune, Departement, DetailColis, DetailCommande, Objet, TarifPostal, VariationObjet,
+    )
+    from src.services.client_service import SEARCH_COLUMNS
+
+    rng = random.Random(42)
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    commandes = details // LINES_PER_COMMANDE
+    colis = commandes // 2
+    counts = {}
+
+    def rows(model, generate, count):
+        with engine.begin() as connection:
+            for start in range(0, count, SEED_CHUNK):
+                connection.execute(insert(model), [generate(i) for i in range(start, min(start + SEED_CHUNK, count))])
+        counts[model.__tablename__] = count
+
+    def client(i):
+        values = {
+            "client_genre": rng.choice(["Madame", "Monsieur"]), "client_nom": f"NOM{i}", "client_prenom": f"Prenom{i % 5000}",
+            "client_adresse1": f"{i % 200 + 1} rue de la Paix", "fk_commune_id": i % 200 + 1,
+            "client_telephone_portable": f"06{i:08d}", "client_email": f"client{i}@example.com", "client_newsletter": i % 2,
+        }
+        values.update({target: normalize(values.get(source)) for source, (target, normalize) in SEARCH_COLUMNS.items()})
+        return values
+
+    with engine.begin() as connection:
+        # WAL lets the readers run while an order is written
+        connection.execute(text("PRAGMA journal_mode=WAL"))
+    rows(Departement, lambda i: {"departement_code": f"{i + 10}", "departement_nom": f"Departement {i + 10}"}, 10)
+    rows(Commune, lambda i: {"fk_commune_departement": f"{i % 10 + 10}", "commune_codepostal": f"{i % 10 + 10}{i:03d}", "commune_ville": f"Ville {i}"}, 200)
+    rows(Objet, lambda i: {"objet_libelee": f"Objet {i}", "objet_points": rng.randint(5, 100)}, 50)
+    rows(VariationObjet, lambda i: {
+        "variation_objet_taille": ["Petit", "Moyen", "Grand"][i % 3], "variation_objet_poids": round(rng.uniform(0.1, 3), 4),
+        "fk_variation_objet_objet_id": i // 3 + 1,
+    }, 150)
+    rows(TarifPostal, lambda i: {"tarif_poids_max": [1, 5, 20, 1000][i], "tarif_montant": [4.5, 8.0, 15.0, 40.0][i]}, 4)
+    rows(Client, client, clients)
+    first_day = datetime.date(2023, 1, 1)
+    rows(Commande, lambda i: {
+        "commande_date": first_day + datetime.timedelta(days=i % 730), "fk_client_id": rng.randint(1, clients),
+        "client_timbre": 2.5, "commande_timbre": 3.5, "client_cheque": 20.0,
+    }, commandes)
+    rows(DetailCommande, lambda i: {
+        "fk_detail_commande_commande_id": i // LINES_PER_COMMANDE + 1, "fk_detail_commande_variation_objet_id": rng.randint(1, 150),
+        "detail_commande_quantitee": rng.randint(1, 10), "detail_commande_commentaire": "",
+    }, details)
+    rows(Colis, lambda i: {"colis_code_suivi": f"CS{i:09d}", "colis_timbre": 4.5, "colis_commentaire": ""}, colis)
+    # Colis i holds the first lines of order 2i + 1
+    rows(DetailColis, lambda i: {
+        "fk_colis_id": i // LINES_PER_COLIS + 1, "fk_detail_commande_id": (i // LINES_PER_COLIS) * 2 * LINES_PER_COMMANDE + i % LINES_PER_COLIS + 1,
+        "detail_colis_quantitee": 1,
+    }, colis * LINES_PER_COLIS)
+    engine.dispose()
+    return counts
+
+
+def workload(clients: int, commandes: int, colis: int) -> list[tuple[str, int, callable]]:
+    """
+    Mixed workload: (route, weight, function building the request from a random generator).
+    """
+    from src.pagination import encode_cursor
+
+    return [
+        ("GET /client/", 10, lambda rng: ("GET", "/client/", {"params": {"limit": 100, "cursor": encode_cursor(rng.randint(0, clients - 100))}})),
+        ("GET /commande/", 10, lambda rng: ("GET", "/commande/", {"params": {"limit": 100, "cursor": encode_cursor(rng.randint(0, commandes - 100))}})),
+        ("GET /detail_commande/", 5, lambda rng: ("GET", "/detail_commande/", {"params": {"limit": 100}})),
+        ("GET /client/{id}", 20, lambda rng: ("GET", f"/client/{rng.randint(1, clients)}", {})),
+        ("GET /commande/{id}", 20, lambda rng: ("GET", f"/commande/{rng.randint(1, commandes)}", {})),
+        ("GET /commande/{id}/full", 10, lambda rng: ("GET", f"/commande/{rng.randint(1, commandes)}/full", {})),
+        ("POST /commande/", 5, lambda rng: ("POST", "/commande/", {"json": {
+            "fk_client_id": rng.randint(1, clients), "commande_date": "2025-01-01", "client_timbre": 2.5, "commande_timbre": 3.5, "client_cheque": 20.0,
+        }})),
+        ("PATCH /colis/{id}", 5, lambda rng: ("PATCH", f"/colis/{rng.randint(1, colis)}", {"json": {"colis_commentaire": f"bench {rng.random()}"}})),
+    ]
+
+
+async def worker(client, operations, seed_value: int, warmup_end: float, deadline: float, samples: dict) -> None:
+    """
+    Sends requests back to back until the deadline; records (latency, error or None) per route after the warm-up.
+    """
+    rng = random.Random(seed_value)
+    routes = [route for route, _, _ in operations]
+    weights = [weight for _, weight, _ in operations]
+    builders = {route: build for route, _, build in operations}
+    while True:
+        route = rng.choices(routes, weights)[0]
+        method, path, options = builders[route](rng)
+        start = time.perf_counter()
+        if start >= deadline:
+            return
+        try:
+            response = await client.request(method, path, **options)
+            error = f"HTTP {response.status_code}" if response.status_code >= 400 else None
+        except Exception as e:
+            error = type(e).__name__
+        if start >= warmup_end:
+            samples.setdefault(route, []).append((time.perf_counter() - start, error))
+
+
+def percentile(latencies: list[float], rank: float) -> float:
+    """
+    Nearest-rank percentile of sorted latencies.
+    """
+    return latencies[max(0, math.ceil(rank / 100 * len(latencies)) - 1)]
+
+
+def summarize(samples: dict, duration: float) -> dict:
+    """
+    Computes the count, errors, throughput and latency percentiles (ms) of each route.
+    """
+    results = {}
+    for route, measures in sorted(samples.items()):
+        latencies = sorted(latency for latency, _ in measures)
+        errors = [error for _, error in measures if error]
+        if errors:
+            print(f"{route}: {len(errors)} errors ({', '.join(sorted(set(errors)))})")
+        results[route] = {
+            "requests": len(measures),
+            "errors": len(errors),
+            "rps": round(len(measures) / duration, 1),
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+        }
+    return results
+
+
+def report(results: dict, baseline: dict | None, tolerance: float) -> list[str]:
+    """
+    Prints the results, with the change against the baseline. Returns the regressed routes:
+    p95 above the baseline by more than the tolerance, throughput below it by more, or an
+    error rate more than one point above the baseline one.
+    """
+    regressions = []
+    print(f"{'route':<26}{'requests':>9}{'errors':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}   vs baseline")
+    for route, result in results.items():
+        line = (f"{route:<26}{result['requests']:>9}{result['errors']:>7}{result['rps']:>9.1f}"
+                f"{result['p50']:>9.2f}{result['p95']:>9.2f}{result['p99']:>9.2f}")
+        reference = (baseline or {}).get(route)
+        if reference:
+            p95_change = result["p95"] / reference["p95"] - 1 if reference["p95"] else 0.0
+            rps_change = result["rps"] / reference["rps"] - 1 if reference["rps"] else 0.0
+            error_rate_change = result["errors"] / result["requests"] - reference["errors"] / max(reference["requests"], 1)
+            regressed = p95_change > tolerance or rps_change < -tolerance or error_rate_change > 0.01
+            line += f"   p95 {p95_change:+.0%}, req/s {rps_change:+.0%}" + ("  REGRESSION" if regressed else "")
+            if regressed:
+                regressions.append(route)
+        elif baseline is not None:
+            line += "   (new route)"
+        print(line)
+    return regressions
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(url: str, workers: int) -> tuple[subprocess.Popen, str]:
+    """
+    Starts the app with uvicorn on a free local port, against the benchmark database.
+
+    The keep-alive timeout is raised above the default 5 seconds: a saturated single worker can
+    leave a connection unused that long, and the client would then reuse a closed connection.
+    """
+    port = free_port()
+    env = dict(
+        os.environ, DB_URL=url, DB_REPLICA_URL="", DB_REPLICA_HOST="", DB_SCHEMA="verify", DB_POOL_WARMUP="1",
+    )
+    command = [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--log-level", "warning", "--workers", str(workers), "--timeout-keep-alive", "30"]
+    return subprocess.Popen(command, cwd=ROOT, env=env), f"http://127.0.0.1:{port}"
+
+
+async def wait_ready(client, server: subprocess.Popen | None, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError("the server exited during startup")
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("the server did not answer in time")
+
+
+async def run(base_url: str, server, operations, concurrency: int, warmup: float, duration: float) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await wait_ready(client, server)
+        samples = {}
+        warmup_end = time.perf_counter() + warmup
+        deadline = warmup_end + duration
+        await asyncio.gather(*(worker(client, operations, index, warmup_end, deadline, samples) for index in range(concurrency)))
+    return summarize(samples, duration)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100000)
+    parser.add_argument("--details", type=int, default=1000000, help="order lines (five per order)")
+    parser.add_argument("--db", help="SQLite file to reuse; seeded only if it does not exist (default: a throwaway file, removed at exit)")
+    parser.add_argument("--url", help="base URL of a running server to load instead of starting one; its database must already be seeded with the same --clients and --details")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes of the started server")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds of load before measuring")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of measured load")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 and throughput change (default 0.2)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--check", action="store_true", help="exit with 1 if a route regressed")
+    args = parser.parse_args()
+
+    # The throwaway database (hundreds of MB) is removed with its directory, even on failure
+    with tempfile.TemporaryDirectory(prefix="digicheese-bench-") as scratch:
+        path = args.db or os.path.join(scratch, "bench.db")
+        url = f"sqlite:///{path}"
+        # A --url target reads its own database: it must already hold the --clients/--details volume
+        if (args.db or not args.url) and not os.path.exists(path):
+            start = time.perf_counter()
+            counts = seed(url, args.clients, args.details)
+            print(f"seeded {path} in {time.perf_counter() - start:.0f} s: " + ", ".join(f"{table} {count}" for table, count in counts.items()))
+
+        commandes = args.details // LINES_PER_COMMANDE
+        operations = workload(args.clients, commandes, commandes // 2)
+        server, base_url = (None, args.url) if args.url else start_server(url, args.workers)
+        try:
+            results = asyncio.run(run(base_url, server, operations, args.concurrency, args.warmup, args.duration))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    config = {"clients": args.clients, "details": args.details, "workers": args.workers, "concurrency": args.concurrency, "duration": args.duration}
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            stored = json.load(file)
+        if stored["config"] != config:
+            print(f"baseline recorded with {stored['config']}, compare with care")
+        baseline = stored["routes"]
+    total = sum(result["requests"] for result in results.values())
+    print(f"{total} requests in {args.duration:.0f} s ({total / args.duration:.0f} req/s), {args.concurrency} connections")
+    regressions = report(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump({"config": config, "recorded": datetime.date.today().isoformat(), "routes": results}, file, indent=2)
+            file.write("\n")
+        print(f"baseline written to {args.baseline}")
+    if regressions:
+        print(f"regressed: {', '.join(regressions)}")
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,29 @@
+if __name__ == "__main__":
+    import argparse
+    import json
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Import communes (and their departements) from an INSEE-style CSV file.")
+    parser.add_argument("file", help="CSV file with postal code, city and departement columns")
+    parser.add_argument("--chunk-size", type=int, default=None, help="number of rows written per transaction (default DB_BULK_CHUNK_SIZE)")
+    parser.add_argument("--create-departements", action="store_true", help="create unknown departements instead of rejecting their rows")
+    parser.add_argument("--encoding", default="utf-8", help="character encoding of the file (default utf-8)")
+    args = parser.parse_args()
+
+    from sqlmodel import Session
+    from src.database import engine
+    from src.services import CommuneImportService
+
+    try:
+        with open(args.file, encoding=args.encoding, newline="") as lines, Session(engine, autoflush=False) as session:
+            service = CommuneImportService(session, args.chunk_size, args.create_departements)
+            for progress in service.import_csv(lines):
+                for rejected in progress.pop("rejected_rows", []):
+                    print(f"line {rejected['line']} rejected: {rejected['reason']}")
+                print(json.dumps(progress))
+
+    except Exception as e:
+        print(f"Error: {e}")
+        raise SystemExit(1)
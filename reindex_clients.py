@@ -0,0 +1,22 @@
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Recompute the normalized search columns of every client.")
+    parser.add_argument("--chunk-size", type=int, default=None, help="number of clients updated per transaction (default DB_BULK_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    from sqlmodel import Session
+    from src.database import engine
+    from src.services import ClientService
+
+    try:
+        with Session(engine, autoflush=False) as session:
+            updated = ClientService(session).rebuild_search_columns(args.chunk_size)
+        print(f"{updated} clients reindexed")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        raise SystemExit(1)
@@ -1,22 +1,75 @@
 if __name__ == "__main__":
     import uvicorn
+    import asyncio
+    import importlib.util
     import os
     from dotenv import load_dotenv
 
     load_dotenv()
 
+    def env_int(name, default):
+        value = os.getenv(name, default)
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"Environment variable {name} must be an integer.")
+
+    def env_choice(name, default, choices):
+        value = os.getenv(name, default).lower()
+        if value not in choices:
+            raise ValueError(f"Environment variable {name} must be one of: {', '.join(choices)}.")
+        return value
+
     try:
         server_host = os.getenv("SERVER_HOST","localhost")
-        server_port = os.getenv("SERVER_PORT",8000)
+        server_port = env_int("SERVER_PORT", 8000)
         reload = os.getenv("SERVER_RELOAD", 'False').lower() in ('true', '1', 't')
-        
-        try:
-            server_port = int(server_port)
-        except ValueError:
-            raise ValueError("Environment variable SERVER_PORT must be an integer.")
 
+        # Profil de production : plusieurs processus workers, chacun avec ses propres pools
+        workers = env_int("SERVER_WORKERS", 1)
+        loop = env_choice("SERVER_LOOP", "auto", ("auto", "asyncio", "uvloop"))
+        http = env_choice("SERVER_HTTP", "auto", ("auto", "h11", "httptools"))
+        backlog = env_int("SERVER_BACKLOG", 2048)
+        keep_alive = env_int("SERVER_KEEP_ALIVE", 5)
+        graceful_timeout = env_int("SERVER_GRACEFUL_TIMEOUT", 30)
+
+        if workers < 1:
+            raise ValueError("Environment variable SERVER_WORKERS must be at least 1.")
+        if reload and workers > 1:
+            raise ValueError("SERVER_RELOAD and SERVER_WORKERS > 1 cannot be used together.")
+        # uvloop et httptools sont optionnels (uvloop n'existe pas sous Windows) : `auto` s'en passe
+        for name, value in (("SERVER_LOOP", loop), ("SERVER_HTTP", http)):
+            if value in ("uvloop", "httptools") and importlib.util.find_spec(value) is None:
+                raise ValueError(f"{name}={value} requires the {value} package: pip install {value}, or use {name}=auto.")
+
+        if workers > 1:
+            # Le schéma est vérifié une seule fois ici, et non par chaque worker en parallèle
+            # (des CREATE TABLE concurrents échoueraient). Les workers sont lancés par spawn :
+            # ils réimportent l'application et créent leurs moteurs, aucun pool n'est hérité.
+            from src.database import init_schema, dispose_engines
+            import src.models  # enregistre les tables dans SQLModel.metadata
+
+            async def prepare_schema():
+                try:
+                    await init_schema()
+                finally:
+                    await dispose_engines()
+
+            asyncio.run(prepare_schema())
+            os.environ["DB_SCHEMA"] = "off"
 
-        uvicorn.run("src.main:app", host=server_host, port=server_port, reload=reload)
+        uvicorn.run(
+            "src.main:app",
+            host=server_host,
+            port=server_port,
+            reload=reload,
+            workers=workers,
+            loop=loop,
+            http=http,
+            backlog=backlog,
+            timeout_keep_alive=keep_alive,
+            timeout_graceful_shutdown=graceful_timeout,
+        )
 
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,132 @@
+import threading
+import time
+from bisect import bisect_left
+from .database import AUTOCOMPLETE_CONFIG
+from .search import normalize_text, prefix_upper_bound
+
+
+class PrefixIndex:
+    """
+    Index en mémoire de recherche par préfixe, sur des tableaux triés.
+
+    Chaque ligne est indexée sous une ou plusieurs clés (par exemple le code postal et le
+    nom de ville normalisé). Les clés sont gardées dans une liste triée, parcourue par
+    dichotomie : une recherche coûte O(log n + résultats), sans requête SQL.
+
+    L'index est propre au processus. Il est marqué périmé par `invalidate()` à chaque
+    écriture de la table, et après `refresh` secondes pour voir les écritures des autres
+    workers (0 : seulement sur écriture) ; il est alors rechargé à la lecture suivante.
+    Le rechargement remplace les tableaux d'un seul bloc : les lectures en cours
+    continuent sur l'ancienne version. Un seul appelant à la fois recharge l'index
+    (`begin_reload`) : pendant ce temps, les autres servent la version précédente au
+    lieu de relire chacun toute la table.
+    """
+
+    def __init__(self, name: str, refresh: int | None = None):
+        self.name = name
+        self.refresh = AUTOCOMPLETE_CONFIG["refresh"] if refresh is None else refresh
+        self._lock = threading.Lock()
+        self._version = 0
+        self._loaded_version = None
+        self._loaded_at = 0.0
+        self._reloading = False
+        # (clés triées, lignes dans l'ordre des clés), remplacés ensemble
+        self._arrays = ([], [])
+
+    @property
+    def stale(self) -> bool:
+        """
+        Indique si l'index doit être rechargé avant d'être lu.
+        """
+        if self._loaded_version != self._version:
+            return True
+        return self.refresh > 0 and self._loaded_at + self.refresh < time.monotonic()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        """
+        Marque l'index comme périmé, après une écriture de la table.
+        """
+        with self._lock:
+            self._version += 1
+
+    def begin_reload(self) -> bool:
+        """
+        Réserve le rechargement de l'index pour l'appelant, qui doit appeler `end_reload` ensuite.
+
+        Retourne False si un autre appelant recharge déjà un index déjà chargé une fois :
+        la version précédente peut alors être servie. Un index jamais chargé n'a rien à
+        servir, chaque appelant le charge.
+        """
+        with self._lock:
+            if self._reloading and self._loaded_version is not None:
+                return False
+            self._reloading = True
+            return True
+
+    def end_reload(self) -> None:
+        """
+        Libère le rechargement réservé par `begin_reload`.
+        """
+        with self._lock:
+            self._reloading = False
+
+    def load(self, entries: list[tuple[str, dict]], version: int) -> None:
+        """
+        Remplace le contenu de l'index.
+
+        `entries` associe chaque clé à sa ligne ; `version` est celle lue avant la requête
+        de chargement, afin qu'une écriture survenue pendant le chargement le laisse périmé.
+        """
+        entries = sorted((entry for entry in entries if entry[0]), key=lambda entry: entry[0])
+        arrays = ([key for key, _ in entries], [row for _, row in entries])
+        with self._lock:
+            self._arrays = arrays
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    def search(self, prefix: str, limit: int) -> list[dict]:
+        """
+        Retourne au plus `limit` lignes distinctes dont une clé commence par le préfixe, par ordre de clé.
+        """
+        keys, rows = self._arrays
+        start = bisect_left(keys, prefix)
+        upper = prefix_upper_bound(prefix)
+        end = bisect_left(keys, upper, lo=start) if upper is not None else len(keys)
+        results = []
+        seen = set()
+        for position in range(start, end):
+            row = rows[position]
+            if id(row) not in seen:
+                seen.add(id(row))
+                results.append(row)
+                if len(results) == limit:
+                    break
+        return results
+
+    def snapshot(self) -> dict:
+        """
+        Retourne l'état de l'index : nombre de clés, âge et péremption.
+        """
+        keys, _ = self._arrays
+        return {
+            "keys": len(keys),
+            "age": round(time.monotonic() - self._loaded_at, 3) if self._loaded_version is not None else None,
+            "refresh": self.refresh,
+            "stale": self.stale,
+            "reloading": self._reloading,
+        }
+
+
+def commune_keys(row: dict) -> list[tuple[str, dict]]:
+    """
+    Clés d'autocomplétion d'une commune : son code postal et son nom de ville normalisé.
+    """
+    return [(normalize_text(row["commune_codepostal"]), row), (normalize_text(row["commune_ville"]), row)]
+
+
+# Index d'autocomplétion des communes, chargé au démarrage et rechargé après les écritures
+commune_index = PrefixIndex("t_communes")
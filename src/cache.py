@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import SQLModel
+from .database import CACHE_CONFIG, async_engine, async_read_engine, read_engine
+
+
+class TTLCache:
+    """
+    Cache LRU borné, à durée de vie, des lignes d'une table indexées par clé primaire.
+
+    Les entrées sont des dictionnaires de valeurs de colonnes, jamais des instances
+    ORM : une instance est liée à la session qui l'a chargée. Les clés sont
+    normalisées en chaînes, les routes recevant parfois un code en entier.
+    Le cache est propre au processus : avec plusieurs workers, la durée de vie
+    borne le temps pendant lequel un worker peut servir une ligne modifiée par un autre.
+
+    Chaque invalidation avance une génération. Une lecture qui remplit le cache relève la
+    génération avant sa requête et la passe à `set` : si une écriture a invalidé le cache
+    entre-temps, la ligne lue est peut-être déjà périmée et n'est pas enregistrée.
+    """
+
+    def __init__(self, name: str, max_size: int | None = None, ttl: int | None = None):
+        self.name = name
+        self.max_size = CACHE_CONFIG["max_size"] if max_size is None else max_size
+        self.ttl = CACHE_CONFIG["ttl"] if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generation = 0
+        self.reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def reset_stats(self) -> None:
+        """
+        Remet à zéro les compteurs.
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+    def get(self, key) -> dict | None:
+        """
+        Retourne les valeurs en cache pour une clé, ou None si elles sont absentes ou expirées.
+        """
+        if not self.enabled:
+            return None
+        key = str(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    @property
+    def generation(self) -> int:
+        """
+        Génération courante, à relever avant la requête qui remplira le cache.
+        """
+        return self._generation
+
+    def set(self, key, values: dict, generation: int | None = None) -> None:
+        """
+        Enregistre les valeurs d'une ligne, en évinçant les entrées les moins récemment lues au-delà de max_size.
+
+        Avec `generation`, les valeurs sont ignorées si le cache a été invalidé depuis que cette génération a été relevée.
+        """
+        if not self.enabled:
+            return
+        key = str(key)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys) -> None:
+        """
+        Retire des clés du cache.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._entries.pop(str(key), None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """
+        Vide le cache, par exemple après une écriture en masse dont les clés ne sont pas connues.
+        """
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Retourne une copie des compteurs, avec le taux de succès.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Caches des tables de référence, indexés par nom de table
+caches: dict[str, TTLCache] = {}
+
+
+def cache_for(model: type[SQLModel]) -> TTLCache:
+    """
+    Retourne le cache de la table d'un modèle, créé au premier appel.
+    """
+    name = model.__tablename__
+    if name not in caches:
+        caches[name] = TTLCache(name)
+    return caches[name]
+
+
+def fills_cache(session) -> bool:
+    """
+    Indique si une lecture faite dans cette session peut remplir le cache.
+
+    Les sessions ouvertes sur le réplica ne le remplissent pas : un réplica en retard
+    y remettrait, juste après une invalidation, la ligne d'avant l'écriture, servie
+    ensuite pendant toute la durée de vie. Elles lisent le cache comme les autres.
+    """
+    return async_read_engine is async_engine or session.bind not in (read_engine, async_read_engine)
+
+
+def row_values(instance: SQLModel) -> dict:
+    """
+    Extrait les valeurs des colonnes d'une instance ORM, pour les mettre en cache.
+    """
+    return {column.name: getattr(instance, column.name) for column in instance.__table__.columns}
+
+
+def cached_instance(model: type[SQLModel], values: dict) -> SQLModel:
+    """
+    Reconstruit une instance détachée à partir des valeurs en cache.
+
+    L'instance est à rattacher à la session avec `session.merge(instance, load=False)`,
+    qui ne lance aucune requête : les relations restent chargées à la demande.
+    """
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return instance
+
+
+def get_cache_stats() -> dict:
+    """
+    Retourne les compteurs de chaque cache, par nom de table.
+    """
+    return {name: cache.snapshot() for name, cache in caches.items()}
@@ -1,10 +1,43 @@
-from sqlmodel import create_engine, Session
+from sqlmodel import create_engine, Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import inspect, UniqueConstraint
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 import os
+import threading
+import time
 from dotenv import load_dotenv, dotenv_values
+from .metrics import instrument_engine
+from .slow_queries import SlowQueryLog
 
 
 load_dotenv()
 
+
+def _env_int(name: str, default: int) -> int:
+    """
+    Lit une variable d'environnement entière, avec une valeur par défaut.
+    """
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Environment variable {name} must be an integer.")
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """
+    Lit une variable d'environnement booléenne (true/1/t), avec une valeur par défaut.
+    """
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.lower() in ('true', '1', 't')
+
+
 # Configuration de la base de données
 DB_CONFIG = {
     "connector": "mysql+pymysql",
@@ -14,11 +47,284 @@ DB_CONFIG = {
     "database": os.getenv("DB_NAME")
 }
 
-# URL de connexion à la base de données
-DATABASE_URL = f"{DB_CONFIG['connector']}://{DB_CONFIG['username']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}/{DB_CONFIG['database']}"
+# Configuration du pool de connexions
+POOL_CONFIG = {
+    "pool_size": _env_int("DB_POOL_SIZE", 5),
+    "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+    "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+    # Doit rester inférieur au wait_timeout de MySQL
+    "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+    "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+}
+
+# Configuration des insertions en masse
+BULK_CONFIG = {
+    # Nombre de lignes par INSERT multi-lignes
+    "chunk_size": _env_int("DB_BULK_CHUNK_SIZE", 1000),
+    # Nombre maximal d'éléments acceptés par requête /bulk
+    "max_items": _env_int("DB_BULK_MAX_ITEMS", 10000),
+}
+
+# Configuration des exports en streaming (/<entité>/export)
+EXPORT_CONFIG = {
+    # Nombre de lignes lues par aller-retour sur le curseur côté serveur
+    "yield_per": _env_int("DB_EXPORT_YIELD_PER", 1000),
+}
+
+# Configuration du cache en mémoire des données de référence (départements, communes, objets, variations)
+CACHE_CONFIG = {
+    # Nombre maximal d'entrées par table (les moins récemment lues sont évincées)
+    "max_size": _env_int("CACHE_MAX_SIZE", 10000),
+    # Durée de vie d'une entrée en secondes (0 désactive le cache)
+    "ttl": _env_int("CACHE_TTL", 300),
+}
+
+# Configuration de l'index d'autocomplétion des communes (src/autocomplete.py)
+AUTOCOMPLETE_CONFIG = {
+    # Charge l'index au démarrage plutôt qu'à la première recherche
+    "preload": _env_bool("AUTOCOMPLETE_PRELOAD", True),
+    # Âge maximal de l'index en secondes, pour voir les écritures des autres workers (0 : rechargé seulement sur écriture)
+    "refresh": _env_int("AUTOCOMPLETE_REFRESH", 300),
+}
+
+# Configuration des métriques HTTP (src/metrics.py, GET /metrics)
+METRICS_CONFIG = {
+    # Mesure la latence, le nombre d'instructions SQL et le temps en base de chaque requête
+    "enabled": _env_bool("METRICS_ENABLED", True),
+}
+
+# Configuration du journal des requêtes lentes (src/slow_queries.py, GET /monitoring/slow-queries)
+SLOW_QUERY_CONFIG = {
+    # Journal désactivé par défaut : il ajoute deux lectures d'horloge par instruction, et un EXPLAIN par instruction lente
+    "enabled": _env_bool("SLOW_QUERY_LOG", False),
+    # Durée à partir de laquelle une instruction est journalisée, en millisecondes
+    "threshold_ms": _env_int("SLOW_QUERY_THRESHOLD_MS", 200),
+    # Nombre d'entrées gardées (les plus anciennes sont écartées)
+    "max_entries": _env_int("SLOW_QUERY_LOG_SIZE", 100),
+    # Enregistre le plan d'exécution (EXPLAIN) de chaque instruction lente
+    "explain": _env_bool("SLOW_QUERY_EXPLAIN", True),
+}
+
+# Journal des requêtes lentes de tous les moteurs
+slow_query_log = SlowQueryLog(**SLOW_QUERY_CONFIG)
+
+# Configuration du démarrage de l'application
+STARTUP_CONFIG = {
+    # create : crée les tables manquantes, verify : échoue si des tables ou des contraintes d'unicité manquent, off : aucune vérification
+    "schema": os.getenv("DB_SCHEMA", "create").lower(),
+    # Nombre de connexions ouvertes au démarrage pour préchauffer chaque pool
+    "pool_warmup": _env_int("DB_POOL_WARMUP", 1),
+}
+
+if STARTUP_CONFIG["schema"] not in ("create", "verify", "off"):
+    raise ValueError("Environment variable DB_SCHEMA must be one of: create, verify, off.")
+
+# URL de connexion à la base de données (DB_URL permet de la surcharger entièrement, ex: SQLite en local)
+DATABASE_URL = os.getenv("DB_URL") or f"{DB_CONFIG['connector']}://{DB_CONFIG['username']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}/{DB_CONFIG['database']}"
+
+# URL du réplica en lecture seule (DB_REPLICA_URL, ou DB_REPLICA_HOST avec les identifiants de DB_CONFIG)
+# Les lectures retombent sur la base principale si aucun réplica n'est configuré
+REPLICA_DATABASE_URL = os.getenv("DB_REPLICA_URL") or (
+    f"{DB_CONFIG['connector']}://{DB_CONFIG['username']}:{DB_CONFIG['password']}@{os.getenv('DB_REPLICA_HOST')}/{DB_CONFIG['database']}"
+    if os.getenv("DB_REPLICA_HOST") else None
+)
+
+# Pilotes asynchrones utilisés à la place des pilotes synchrones
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Convertit une URL de connexion synchrone vers le pilote asynchrone équivalent.
+    """
+    parsed_url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed_url.get_backend_name(), parsed_url.drivername)
+    return parsed_url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+# URL de connexion asynchrone à la base de données
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+
+class PoolStats:
+    """
+    Compteurs de télémétrie du pool de connexions.
+
+    Enregistre le nombre d'emprunts de connexions ainsi que le temps d'attente
+    cumulé et maximal pour obtenir une connexion du pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Remet à zéro tous les compteurs.
+        """
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """
+        Enregistre le temps d'attente d'un emprunt de connexion.
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+
+    def snapshot(self) -> dict:
+        """
+        Retourne une copie des compteurs, avec le temps d'attente moyen en millisecondes.
+        """
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / attempts, 3) if attempts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+# Statistiques de chaque pool, indexées par le nom du moteur (pool_logging_name)
+pool_stats: dict[str, PoolStats] = {}
+
+
+class TimedPoolMixin:
+    """
+    Mixin de pool qui mesure le temps d'attente de chaque emprunt de connexion.
+    """
+
+    def _do_get(self):
+        stats = pool_stats.setdefault(self.logging_name or "default", PoolStats())
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        stats.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    """
+    QueuePool instrumenté pour les moteurs synchrones.
+    """
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool instrumenté pour les moteurs asynchrones.
+    """
+
+
+def _engine_options(url: str, name: str, asynchronous: bool) -> dict:
+    """
+    Construit les options de création d'un moteur à partir de POOL_CONFIG.
+
+    Les bases SQLite en mémoire gardent le pool par défaut de SQLAlchemy,
+    le pool à file d'attente n'ayant pas de sens pour elles.
+    """
+    parsed_url = make_url(url)
+    options = {"pool_logging_name": name}
+    if parsed_url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if parsed_url.database in (None, "", ":memory:"):
+            return options
+    options["poolclass"] = TimedAsyncAdaptedQueuePool if asynchronous else TimedQueuePool
+    options.update(POOL_CONFIG)
+    return options
+
+
+def build_engine(url: str, name: str = "primary", echo: bool = False):
+    """
+    Crée un moteur de base de données synchrone configuré avec POOL_CONFIG,
+    instrumenté pour les métriques si METRICS_ENABLED et pour le journal des requêtes lentes si SLOW_QUERY_LOG.
+    """
+    db_engine = create_engine(url, echo=echo, **_engine_options(url, name, asynchronous=False))
+    if METRICS_CONFIG["enabled"]:
+        instrument_engine(db_engine)
+    if SLOW_QUERY_CONFIG["enabled"]:
+        slow_query_log.instrument(db_engine)
+    return db_engine
+
+
+def build_async_engine(url: str, name: str = "primary_async", echo: bool = False):
+    """
+    Crée un moteur de base de données asynchrone configuré avec POOL_CONFIG,
+    instrumenté pour les métriques si METRICS_ENABLED et pour le journal des requêtes lentes si SLOW_QUERY_LOG.
+    """
+    db_engine = create_async_engine(url, echo=echo, **_engine_options(url, name, asynchronous=True))
+    if METRICS_CONFIG["enabled"]:
+        instrument_engine(db_engine.sync_engine)
+    if SLOW_QUERY_CONFIG["enabled"]:
+        slow_query_log.instrument(db_engine.sync_engine)
+    return db_engine
+
+
+def get_pool_status() -> dict:
+    """
+    Retourne l'état courant de chaque pool, indexé par nom de moteur.
+    """
+    status = {
+        "primary": _pool_status(engine.pool),
+        "primary_async": _pool_status(async_engine.sync_engine.pool),
+    }
+    if REPLICA_DATABASE_URL:
+        status["replica"] = _pool_status(read_engine.pool)
+        status["replica_async"] = _pool_status(async_read_engine.sync_engine.pool)
+    return status
+
+
+def _pool_status(pool) -> dict:
+    """
+    Retourne l'état d'un pool : connexions empruntées, inactives, en débordement,
+    ainsi que les statistiques de temps d'attente.
+    """
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": POOL_CONFIG["max_overflow"],
+            "timeout": pool.timeout(),
+        })
+    stats = pool_stats.get(pool.logging_name or "default")
+    status.update(stats.snapshot() if stats else PoolStats().snapshot())
+    return status
+
 
 # Moteur de base de données
-engine = create_engine(DATABASE_URL, echo=False)
+engine = build_engine(DATABASE_URL, echo=False)
+
+# Moteur asynchrone et fabrique de sessions asynchrones
+async_engine = build_async_engine(ASYNC_DATABASE_URL, echo=False)
+async_session_factory = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Moteurs de lecture : réplica si configuré, sinon les moteurs principaux
+if REPLICA_DATABASE_URL:
+    read_engine = build_engine(REPLICA_DATABASE_URL, name="replica", echo=False)
+    async_read_engine = build_async_engine(to_async_url(REPLICA_DATABASE_URL), name="replica_async", echo=False)
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+async_read_session_factory = async_sessionmaker(async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # déclaration d'une base qui permet après de créer un modèle et de mapper avec SqlModel
 def get_db():
@@ -31,6 +337,154 @@ def get_db():
         yield db
     finally:
         db.close()
-        
+
+
+def get_read_db():
+    """
+    Fonction génératrice pour fournir une session de lecture, ouverte sur le réplica s'il est configuré.
+    À n'utiliser que pour des requêtes en lecture seule.
+    """
+    db = Session(read_engine, autoflush=False, autocommit=False)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """
+    Fonction génératrice asynchrone pour fournir une session de base de données asynchrone.
+    Utilisée par les endpoints `async def`, elle ne bloque pas de thread pendant les requêtes SQL.
+    """
+    async with async_session_factory() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """
+    Fonction génératrice asynchrone pour fournir une session de lecture, ouverte sur le réplica s'il est configuré.
+    Utilisée par les routes GET, les mutations gardant get_async_db sur la base principale.
+    """
+    async with async_read_session_factory() as db:
+        yield db
+
+
+def get_async_session_factory():
+    """
+    Dépendance fournissant la fabrique de sessions sur la base principale, pour les réponses en streaming
+    qui écrivent en base (imports). Voir get_async_read_session_factory.
+    """
+    return async_session_factory
+
+
+def get_async_read_session_factory():
+    """
+    Dépendance fournissant la fabrique de sessions de lecture, pour les réponses en streaming.
+    Le corps d'une StreamingResponse est envoyé après la fermeture des dépendances `yield` :
+    la réponse ouvre donc elle-même sa session, le temps de l'envoi.
+    """
+    return async_read_session_factory
+
+
+def _missing_tables(connection) -> list[str]:
+    """
+    Retourne les tables déclarées dans les modèles mais absentes de la base.
+    """
+    existing_tables = set(inspect(connection).get_table_names())
+    return [table for table in SQLModel.metadata.tables if table not in existing_tables]
+
+
+def _missing_unique_constraints(connection) -> list[str]:
+    """
+    Retourne les contraintes d'unicité déclarées dans les modèles mais absentes des tables
+    existantes, sous la forme "table (colonnes)".
+
+    create_all ne modifie pas une table existante : une contrainte ajoutée à un modèle
+    (uq_communes_codepostal_ville, clé des upserts de communes) doit être créée à la main.
+    Une contrainte UNIQUE ou un index unique sur les mêmes colonnes conviennent.
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in SQLModel.metadata.tables.values():
+        if table.name not in existing_tables:
+            continue
+        declared = [tuple(constraint.columns.keys()) for constraint in table.constraints if isinstance(constraint, UniqueConstraint)]
+        declared += [tuple(index.columns.keys()) for index in table.indexes if index.unique]
+        if not declared:
+            continue
+        existing = {frozenset(constraint["column_names"]) for constraint in inspector.get_unique_constraints(table.name)}
+        existing |= {frozenset(index["column_names"]) for index in inspector.get_indexes(table.name) if index["unique"]}
+        missing += [f"{table.name} ({', '.join(columns)})" for columns in declared if frozenset(columns) not in existing]
+    return missing
+
+
+async def init_schema(mode: str | None = None) -> None:
+    """
+    Vérifie le schéma de la base principale une seule fois, au démarrage.
+
+    En mode `create`, les tables manquantes sont créées ; en mode `verify`, une
+    RuntimeError est levée si des tables ou des contraintes d'unicité manquent ;
+    en mode `off`, rien n'est fait.
+    """
+    mode = mode or STARTUP_CONFIG["schema"]
+    if mode == "off":
+        return
+    async with async_engine.begin() as connection:
+        if mode == "create":
+            await connection.run_sync(SQLModel.metadata.create_all)
+            return
+        missing_tables = await connection.run_sync(_missing_tables)
+        missing_constraints = await connection.run_sync(_missing_unique_constraints)
+    if missing_tables:
+        raise RuntimeError(f"Tables manquantes dans la base de données : {', '.join(missing_tables)}")
+    if missing_constraints:
+        raise RuntimeError(f"Contraintes d'unicité manquantes dans la base de données : {'; '.join(missing_constraints)}")
+
+
+async def warm_up_pools(connections: int | None = None) -> None:
+    """
+    Ouvre puis rend au pool quelques connexions sur chaque moteur asynchrone,
+    afin que les premières requêtes ne paient pas l'établissement des connexions.
+    """
+    connections = STARTUP_CONFIG["pool_warmup"] if connections is None else connections
+    db_engines = {async_engine, async_read_engine}
+    for db_engine in db_engines:
+        opened = []
+        try:
+            for _ in range(connections):
+                opened.append(await db_engine.connect())
+        finally:
+            for connection in opened:
+                await connection.close()
+
+
+def reset_pools_after_fork() -> None:
+    """
+    Remplace les pools hérités du processus parent par des pools vides, dans un processus fils.
+
+    Une connexion ouverte avant un fork est partagée par les deux processus : ses échanges se
+    mélangeraient. Les anciennes connexions ne sont pas fermées (dispose(close=False)), car le
+    parent s'en sert encore ; chaque worker ouvre ensuite les siennes. Les compteurs d'attente
+    repartent aussi de zéro. Appelée automatiquement après chaque fork (os.register_at_fork).
+    """
+    for db_engine in {engine, read_engine, async_engine.sync_engine, async_read_engine.sync_engine}:
+        db_engine.dispose(close=False)
+    pool_stats.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_pools_after_fork)
+
+
+async def dispose_engines() -> None:
+    """
+    Ferme toutes les connexions des pools, à l'arrêt de l'application.
+    """
+    for db_engine in {async_engine, async_read_engine}:
+        await db_engine.dispose()
+    for db_engine in {engine, read_engine}:
+        db_engine.dispose()
+
 # Il est possible de créer des fonctions utilitaires pour supprimer et recréer la base de données
-# Attention à ne pas essayer de se connecter à la base de données pendant cette opération (DATABASE_URL)
\ No newline at end of file
+# Attention à ne pas essayer de se connecter à la base de données pendant cette opération (DATABASE_URL)
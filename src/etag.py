@@ -0,0 +1,63 @@
+import hashlib
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from .pagination import NEXT_CURSOR_HEADER
+
+# En-têtes recopiés dans une réponse 304
+NOT_MODIFIED_HEADERS = ("ETag", NEXT_CURSOR_HEADER)
+
+
+def _values(item) -> tuple:
+    """
+    Retourne les valeurs sérialisées d'un élément : les colonnes d'une instance ORM, les champs
+    d'un schéma pydantic ou les valeurs d'une ligne lue en dictionnaire.
+    """
+    if isinstance(item, dict):
+        return tuple(item.values())
+    table = getattr(item, "__table__", None)
+    if table is not None:
+        return tuple(getattr(item, column.name) for column in table.columns)
+    if isinstance(item, BaseModel):
+        return tuple(item.model_dump().values())
+    return (item,)
+
+
+def compute_etag(payload) -> str:
+    """
+    Calcule un ETag fort à partir des valeurs d'un élément ou d'une liste d'éléments.
+
+    L'empreinte porte sur les valeurs des colonnes, dans l'ordre, et non sur le JSON :
+    elle évite de sérialiser la réponse pour la comparer, et une même donnée produit
+    toujours la même représentation.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    items = payload if isinstance(payload, list) else [payload]
+    digest.update(str(len(items)).encode())
+    for item in items:
+        digest.update(repr(_values(item)).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Indique si l'en-tête If-None-Match désigne l'ETag (comparaison faible, comme le prévoit la RFC 9110).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip().removeprefix("W/") for candidate in if_none_match.split(","))
+    return etag in candidates
+
+
+def not_modified(request: Request, response: Response, payload) -> Response | None:
+    """
+    Ajoute l'en-tête ETag de la charge utile à la réponse et, si la requête porte un
+    If-None-Match correspondant, retourne la réponse 304 à renvoyer à la place du contenu.
+    """
+    etag = compute_etag(payload)
+    response.headers["ETag"] = etag
+    if not etag_matches(request.headers.get("If-None-Match"), etag):
+        return None
+    headers = {name: response.headers[name] for name in NOT_MODIFIED_HEADERS if name in response.headers}
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Literal
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlmodel import SQLModel
+from .database import EXPORT_CONFIG
+from .repositories.statements import public_columns
+
+# Formats d'export disponibles et type MIME associé
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+def _json_default(value):
+    """
+    Sérialise les types renvoyés par le pilote que le module json ne connaît pas.
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_ndjson(rows: list[dict], columns: list[str], header: bool) -> str:
+    """
+    Encode un lot de lignes en NDJSON : un objet JSON par ligne.
+    """
+    return "".join(json.dumps(dict(row), default=_json_default, ensure_ascii=False) + "\n" for row in rows)
+
+
+def _encode_csv(rows: list[dict], columns: list[str], header: bool) -> str:
+    """
+    Encode un lot de lignes en CSV, précédé de la ligne d'en-tête pour le premier lot.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([row[column] for column in columns] for row in rows)
+    return buffer.getvalue()
+
+
+ENCODERS = {
+    "ndjson": _encode_ndjson,
+    "csv": _encode_csv,
+}
+
+
+async def stream_rows(session_factory, model: type[SQLModel], format: ExportFormat, yield_per: int | None = None):
+    """
+    Générateur asynchrone parcourant toute la table d'un modèle par lots, sur un curseur côté serveur.
+
+    Les colonnes exposées sont lues comme tuples Core (sans instanciation ORM), dans l'ordre de la clé primaire,
+    et seul le lot courant est gardé en mémoire. La session est ouverte et fermée par le générateur.
+    """
+    table = model.__table__
+    exported = public_columns(table)
+    columns = [column.name for column in exported]
+    encode = ENCODERS[format]
+    statement = (
+        select(*exported)
+        .order_by(*table.primary_key.columns)
+        .execution_options(yield_per=yield_per or EXPORT_CONFIG["yield_per"])
+    )
+    async with session_factory() as session:
+        result = await session.stream(statement)
+        header = True
+        async for rows in result.mappings().partitions():
+            yield encode(rows, columns, header).encode()
+            header = False
+        if header and format == "csv":
+            # Table vide : l'export CSV garde sa ligne d'en-tête
+            yield encode([], columns, header).encode()
+
+
+def export_response(session_factory, model: type[SQLModel], format: ExportFormat) -> StreamingResponse:
+    """
+    Construit la réponse en streaming exportant toute la table d'un modèle au format demandé.
+    """
+    filename = f"{model.__tablename__}.{format}"
+    return StreamingResponse(
+        stream_rows(session_factory, model, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
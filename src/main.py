@@ -1,7 +1,11 @@
-from fastapi import FastAPI, HTTPException, status
-from sqlmodel import SQLModel, select, Session
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 
-from .database import get_db, engine
+from .database import init_schema, warm_up_pools, dispose_engines, get_async_read_session_factory, AUTOCOMPLETE_CONFIG, METRICS_CONFIG
+from .metrics import MetricsMiddleware, RequestContextMiddleware
+from .repositories.commune_repository import load_commune_index
 
 from .routers import (
     router_commande,
@@ -12,10 +16,36 @@ from .routers import (
     router_departement,
     router_detail_commande,
     router_objet,
-    router_variation_objet
+    router_variation_objet,
+    router_monitoring,
+    router_metrics
 )
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Cycle de vie de l'application.
+
+    Au démarrage, vérifie le schéma (DB_SCHEMA), préchauffe les pools (DB_POOL_WARMUP) et
+    charge l'index d'autocomplétion des communes (AUTOCOMPLETE_PRELOAD), plutôt que de se
+    connecter à la base dès l'import du module. À l'arrêt, ferme les pools.
+    """
+    await init_schema()
+    await warm_up_pools()
+    if AUTOCOMPLETE_CONFIG["preload"]:
+        async with get_async_read_session_factory()() as session:
+            await session.run_sync(load_commune_index)
+    yield
+    await dispose_engines()
+
+
+app = FastAPI(lifespan=lifespan)
+
+if METRICS_CONFIG["enabled"]:
+    app.add_middleware(MetricsMiddleware)
+else:
+    # Le journal des requêtes lentes attribue ses entrées à la route même sans métriques
+    app.add_middleware(RequestContextMiddleware)
 
 
 routers = [
@@ -27,13 +57,27 @@ routers = [
     router_departement,
     router_detail_commande,
     router_objet,
-    router_variation_objet
+    router_variation_objet,
+    router_monitoring,
+    router_metrics
 ]
 
 for router in routers:
     app.include_router(router)
 
-SQLModel.metadata.create_all(bind=engine)
+
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    """
+    Répond 409 Conflict quand une écriture viole une contrainte de la base, par exemple la
+    suppression d'une ligne encore référencée par une clé étrangère NOT NULL (un département
+    qui a des communes). La session de la requête est annulée à sa fermeture.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "Opération refusée par une contrainte d'intégrité de la base de données"},
+    )
+
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,219 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+
+# Bornes des histogrammes, cumulatives comme le veut le format Prometheus (+Inf est ajouté au rendu)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Route des requêtes qui ne correspondent à aucune route déclarée : garde un nombre fini de séries
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """
+    Compteurs SQL d'une requête HTTP en cours : nombre d'instructions et temps passé en base.
+
+    Une instance est placée dans une variable de contexte par le middleware ; les événements
+    des moteurs l'incrémentent. Elle est partagée (et non copiée) par les tâches et threads
+    qui héritent du contexte, ce qui couvre run_sync et le threadpool.
+    """
+
+    __slots__ = ("statements", "db_time", "scope")
+
+    def __init__(self, scope: dict | None = None):
+        self.statements = 0
+        self.db_time = 0.0
+        self.scope = scope
+
+
+# Compteurs de la requête en cours, None hors requête (démarrage, scripts)
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    """
+    Histogramme à bornes fixes d'une série, au sens de Prometheus : effectifs par borne, somme et nombre.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class HttpMetrics:
+    """
+    Métriques des requêtes HTTP, par méthode et modèle de route (/commande/{id}, pas /commande/12).
+
+    Pour chaque série : un histogramme de latence, un histogramme du nombre d'instructions SQL,
+    un histogramme du temps passé en base, et le nombre de réponses par code de statut.
+    Les métriques sont propres au processus.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Remet à zéro toutes les séries.
+        """
+        with self._lock:
+            self.latency: dict[tuple, Histogram] = {}
+            self.statements: dict[tuple, Histogram] = {}
+            self.db_time: dict[tuple, Histogram] = {}
+            self.responses: dict[tuple, int] = {}
+
+    def record(self, method: str, route: str, status_code: int, duration: float, stats: RequestStats) -> None:
+        """
+        Enregistre une requête terminée.
+        """
+        key = (method, route)
+        with self._lock:
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.statements[key] = Histogram(STATEMENT_BUCKETS)
+                self.db_time[key] = Histogram(LATENCY_BUCKETS)
+            self.latency[key].observe(duration)
+            self.statements[key].observe(stats.statements)
+            self.db_time[key].observe(stats.db_time)
+            response_key = (method, route, str(status_code))
+            self.responses[response_key] = self.responses.get(response_key, 0) + 1
+
+    def render(self) -> str:
+        """
+        Rend toutes les séries au format texte d'exposition de Prometheus (version 0.0.4).
+        """
+        lines = []
+        with self._lock:
+            lines.append("# HELP http_requests_total Nombre de requêtes HTTP traitées.")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route, status_code), count in sorted(self.responses.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=status_code)} {count}")
+            _render_histograms(lines, "http_request_duration_seconds", "Durée de traitement des requêtes HTTP, en secondes.", self.latency)
+            _render_histograms(lines, "http_request_db_statements", "Nombre d'instructions SQL exécutées par requête HTTP.", self.statements)
+            _render_histograms(lines, "http_request_db_duration_seconds", "Temps passé en base par requête HTTP, en secondes.", self.db_time)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _render_histograms(lines: list[str], name: str, help_text: str, series: dict[tuple, Histogram]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), histogram in sorted(series.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=str(bound))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(method=method, route=route)} {histogram.sum!r}")
+        lines.append(f"{name}_count{_labels(method=method, route=route)} {histogram.count}")
+
+
+# Métriques HTTP du processus, exposées par GET /metrics
+http_metrics = HttpMetrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += time.perf_counter() - context._metrics_start
+
+
+def instrument_engine(engine) -> None:
+    """
+    Compte les instructions SQL et leur durée, pour la requête HTTP en cours, sur un moteur synchrone
+    (pour un moteur asynchrone, passer `async_engine.sync_engine`). Un executemany compte pour une instruction.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI mesurant chaque requête HTTP : latence, instructions SQL et temps en base.
+
+    Écrit en ASGI pur plutôt qu'avec BaseHTTPMiddleware, pour ne pas ajouter de tâche ni de
+    file d'attente à chaque requête. La route est lue dans le scope une fois le routage fait ;
+    la durée court jusqu'à l'envoi du dernier morceau de la réponse.
+    """
+
+    def __init__(self, app, metrics: HttpMetrics | None = None):
+        self.app = app
+        self.metrics = metrics or http_metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            self.metrics.record(scope["method"], route_path(scope), status_code, time.perf_counter() - start, stats)
+
+
+class RequestContextMiddleware:
+    """
+    Middleware ASGI qui pose seulement le contexte de la requête (current_request), sans rien mesurer.
+
+    Installé à la place de MetricsMiddleware quand les métriques sont désactivées, pour que
+    le journal des requêtes lentes connaisse toujours la méthode et la route de chaque instruction.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_request.set(RequestStats(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
+
+
+def route_path(scope: dict) -> str:
+    """
+    Retourne le modèle de la route d'une requête routée, ou UNMATCHED_ROUTE.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
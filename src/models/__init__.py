@@ -5,5 +5,10 @@ from .commune_model import Commune, CommuneCreate, CommuneUpdate, CommuneRead
 from .departement_model import Departement, DepartementCreate, DepartementUpdate, DepartementRead
 from .colis_model import Colis , ColisCreate, ColisRead, ColisUpdate
 from .detail_colis_model import DetailColis, DetailColisCreate , DetailColisRead, DetailColisUpdate
-from .objet_model import Objet, ObjetCreate, ObjetUpdate, ObjetRead
-from .variation_objet_model import VariationObjet, VariationObjetCreate, VariationObjetUpdate, VariationObjetRead
\ No newline at end of file
+from .objet_model import Objet, ObjetCreate, ObjetUpdate, ObjetRead, ObjetUpsert
+from .variation_objet_model import VariationObjet, VariationObjetCreate, VariationObjetUpdate, VariationObjetRead
+from .bulk_model import BulkCreateRead, UpsertRead, BulkDeleteRead
+from .commande_full_model import CommandeFullRead, DetailCommandeFullRead, VariationObjetFullRead, ClientFullRead, CommuneFullRead
+from .valuation_model import CommandeValuationRead, CommandeValuationDetailRead, DetailCommandeValuationRead
+from .backlog_model import DetailCommandeBacklogRead
+from .postage_model import TarifPostal, TarifPostalCreate, TarifPostalRead, ColisPostageRead, PostageRecomputeRead
\ No newline at end of file
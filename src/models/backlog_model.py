@@ -0,0 +1,41 @@
+from sqlmodel import SQLModel, Field
+
+
+class DetailCommandeBacklogRead(SQLModel):
+    """
+    Ligne de commande restant à expédier : quantité commandée, quantité déjà mise en colis et reliquat.
+    """
+
+    detail_commande_id: int = Field(
+        description="Identifiant de la ligne de commande"
+    )
+
+    fk_detail_commande_commande_id: int | None = Field(
+        default=None,
+        description="Identifiant de la commande"
+    )
+
+    fk_client_id: int | None = Field(
+        default=None,
+        description="Identifiant du client de la commande"
+    )
+
+    fk_detail_commande_variation_objet_id: int | None = Field(
+        default=None,
+        description="Identifiant de la variation d'objet commandée"
+    )
+
+    ordered_quantity: int = Field(
+        default=0,
+        description="Quantité commandée"
+    )
+
+    shipped_quantity: int = Field(
+        default=0,
+        description="Quantité déjà répartie dans les colis"
+    )
+
+    remaining_quantity: int = Field(
+        default=0,
+        description="Quantité restant à expédier"
+    )
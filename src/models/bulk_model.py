@@ -0,0 +1,47 @@
+from sqlmodel import SQLModel, Field
+
+
+class BulkCreateRead(SQLModel):
+    """
+    Schéma de réponse des créations en masse.
+
+    Indique le nombre d'enregistrements créés et leurs identifiants, dans l'ordre de la requête.
+    """
+
+    created: int = Field(
+        description="Nombre d'enregistrements créés"
+    )
+
+    ids: list[int | str] = Field(
+        default_factory=list,
+        description="Identifiants des enregistrements créés, dans l'ordre de la requête"
+    )
+
+
+class UpsertRead(SQLModel):
+    """
+    Schéma de réponse des upserts en masse.
+
+    Distingue les enregistrements insérés de ceux qui existaient déjà et ont été mis à jour.
+    """
+
+    inserted: int = Field(
+        description="Nombre d'enregistrements insérés"
+    )
+
+    updated: int = Field(
+        description="Nombre d'enregistrements existants mis à jour"
+    )
+
+
+
+class BulkDeleteRead(SQLModel):
+    """
+    Schéma de réponse des suppressions en masse.
+
+    Les identifiants inexistants sont ignorés : seul le nombre de lignes réellement supprimées est renvoyé.
+    """
+
+    deleted: int = Field(
+        description="Nombre d'enregistrements supprimés"
+    )
@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from .commune_model import Commune
 from typing import TYPE_CHECKING
@@ -91,9 +92,15 @@ class Client(ClientBase, table=True):
     Modèle ORM mappé à la table 't_clients'.
 
     Représente les clients du programme de fidélité et inclut des relations avec leur commune et leurs commandes.
+    Les colonnes *_norm sont des copies normalisées (src/search.py), indexées pour la recherche :
+    tenues à jour par ClientService, elles ne sont exposées par aucun schéma ni export.
     """
 
     __tablename__ = "t_clients"
+    __table_args__ = (
+        # Sur MySQL, la recherche par nom et prénom s'appuie aussi sur un index FULLTEXT
+        Index("ft_clients_nom_prenom_norm", "client_nom_norm", "client_prenom_norm", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     client_id: int | None = Field(
         default=None,
@@ -101,6 +108,51 @@ class Client(ClientBase, table=True):
         description="Identifiant unique du client"
     )
 
+    client_nom_norm: str | None = Field(
+        default=None,
+        max_length=40,
+        index=True,
+        nullable=True,
+        sa_column_kwargs={"info": {"internal": True}},
+        description="Nom en minuscules, sans accents ni ponctuation"
+    )
+
+    client_prenom_norm: str | None = Field(
+        default=None,
+        max_length=30,
+        index=True,
+        nullable=True,
+        sa_column_kwargs={"info": {"internal": True}},
+        description="Prénom en minuscules, sans accents ni ponctuation"
+    )
+
+    client_email_norm: str | None = Field(
+        default=None,
+        max_length=255,
+        index=True,
+        nullable=True,
+        sa_column_kwargs={"info": {"internal": True}},
+        description="Email sans espaces, en minuscules"
+    )
+
+    client_telephone_fix_norm: str | None = Field(
+        default=None,
+        max_length=10,
+        index=True,
+        nullable=True,
+        sa_column_kwargs={"info": {"internal": True}},
+        description="Téléphone fixe réduit à ses chiffres, au format national"
+    )
+
+    client_telephone_portable_norm: str | None = Field(
+        default=None,
+        max_length=10,
+        index=True,
+        nullable=True,
+        sa_column_kwargs={"info": {"internal": True}},
+        description="Téléphone portable réduit à ses chiffres, au format national"
+    )
+
     commandes: list["Commande"] = Relationship(
         back_populates="client"
     )
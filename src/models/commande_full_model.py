@@ -0,0 +1,72 @@
+from sqlmodel import Field
+from .client_model import ClientRead
+from .commande_model import CommandeRead
+from .commune_model import CommuneRead
+from .departement_model import DepartementRead
+from .detail_commande_model import DetailCommandeRead
+from .objet_model import ObjetRead
+from .variation_objet_model import VariationObjetRead
+
+
+class VariationObjetFullRead(VariationObjetRead):
+    """
+    Variation d'objet d'une ligne de commande, avec l'objet dont elle dérive.
+    """
+
+    objet: ObjetRead | None = Field(
+        default=None,
+        description="Objet de la variation"
+    )
+
+
+class DetailCommandeFullRead(DetailCommandeRead):
+    """
+    Ligne d'une commande complète, avec la variation d'objet commandée.
+    """
+
+    variation_objet: VariationObjetFullRead | None = Field(
+        default=None,
+        description="Variation d'objet commandée, avec son objet"
+    )
+
+
+class CommuneFullRead(CommuneRead):
+    """
+    Commune du client d'une commande complète, avec son département.
+    """
+
+    departement: DepartementRead | None = Field(
+        default=None,
+        description="Département de la commune"
+    )
+
+
+class ClientFullRead(ClientRead):
+    """
+    Client d'une commande complète, avec sa commune.
+    """
+
+    commune: CommuneFullRead | None = Field(
+        default=None,
+        description="Commune du client, avec son département"
+    )
+
+
+class CommandeFullRead(CommandeRead):
+    """
+    Schéma de lecture d'une commande complète.
+
+    Regroupe en un seul document la commande, ses lignes avec leur variation d'objet
+    et leur objet, et le client avec sa commune et son département : de quoi afficher
+    la commande sans autre appel à l'API.
+    """
+
+    client: ClientFullRead | None = Field(
+        default=None,
+        description="Client de la commande, avec sa commune"
+    )
+
+    details_commande: list[DetailCommandeFullRead] = Field(
+        default_factory=list,
+        description="Lignes de la commande, avec leur variation d'objet"
+    )
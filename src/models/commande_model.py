@@ -15,6 +15,7 @@ class CommandeBase(SQLModel):
 
     commande_date: datetime.date | None = Field(
         default=None,
+        index=True,
         nullable=True,
         description="Date à laquelle la commande a été passée"
     )
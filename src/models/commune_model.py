@@ -1,4 +1,4 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, UniqueConstraint
 from .departement_model import Departement
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -39,9 +39,13 @@ class Commune(CommuneBase, table=True):
     Modèle ORM mappé à la table 't_communes' de la base de données.
 
     Inclut la logique de persistance et les relations avec le département et les clients associés.
+    Le couple (code postal, ville) est unique : il sert de clé naturelle pour les upserts.
     """
 
     __tablename__ = "t_communes"
+    __table_args__ = (
+        UniqueConstraint("commune_codepostal", "commune_ville", name="uq_communes_codepostal_ville"),
+    )
 
     commune_id: int | None = Field(
         default=None,
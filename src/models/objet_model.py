@@ -70,6 +70,18 @@ class ObjetUpdate(ObjetBase):
     )
 
 
+class ObjetUpsert(ObjetBase):
+    """
+    Schéma utilisé pour créer ou mettre à jour un objet en masse.
+
+    L'identifiant est obligatoire : il sert de clé pour décider entre insertion et mise à jour.
+    """
+
+    objet_id: int = Field(
+        description="Identifiant de l'objet à créer ou mettre à jour"
+    )
+
+
 class ObjetRead(ObjetBase):
     """
     Schéma utilisé pour lire les données d'objet.
@@ -0,0 +1,88 @@
+from decimal import Decimal
+from sqlmodel import SQLModel, Field
+
+
+class TarifPostalBase(SQLModel):
+    """
+    Schéma de base d'une tranche de la grille d'affranchissement.
+
+    Une tranche s'applique aux colis dont le poids est inférieur ou égal à son poids
+    maximal et supérieur au poids maximal de la tranche précédente.
+    """
+
+    tarif_poids_max: Decimal = Field(
+        max_digits=10,
+        decimal_places=4,
+        unique=True,
+        description="Poids maximal de la tranche, en kilogrammes"
+    )
+
+    tarif_montant: float = Field(
+        description="Montant d'affranchissement de la tranche"
+    )
+
+
+class TarifPostal(TarifPostalBase, table=True):
+    """
+    Modèle ORM mappé à la table 't_tarifs_postaux' : la grille d'affranchissement des colis.
+    """
+
+    __tablename__ = "t_tarifs_postaux"
+
+    tarif_id: int | None = Field(
+        default=None,
+        primary_key=True,
+        description="Identifiant unique de la tranche"
+    )
+
+
+class TarifPostalCreate(TarifPostalBase):
+    """
+    Schéma utilisé pour remplacer la grille d'affranchissement, une entrée par tranche.
+    """
+    pass
+
+
+class TarifPostalRead(TarifPostalBase):
+    """
+    Schéma utilisé pour lire une tranche de la grille d'affranchissement.
+    """
+
+    tarif_id: int | None = Field(
+        default=None,
+        description="Identifiant unique de la tranche"
+    )
+
+
+class ColisPostageRead(SQLModel):
+    """
+    Poids d'un colis calculé à partir de ses lignes, et affranchissement correspondant.
+    """
+
+    colis_id: int = Field(
+        description="Identifiant du colis"
+    )
+
+    poids: Decimal = Field(
+        description="Poids du colis en kilogrammes : somme des quantités multipliées par le poids des variations"
+    )
+
+    timbre: float | None = Field(
+        default=None,
+        description="Affranchissement de la tranche du poids, ou null si aucune tranche ne le couvre"
+    )
+
+
+class PostageRecomputeRead(SQLModel):
+    """
+    Schéma de réponse du recalcul en masse des affranchissements.
+    """
+
+    updated: int = Field(
+        description="Nombre de colis dont le timbre a été recalculé"
+    )
+
+    unpriced: list[int] = Field(
+        default_factory=list,
+        description="Colis laissés inchangés, leur poids dépassant la grille (ou la grille étant vide)"
+    )
@@ -0,0 +1,78 @@
+import datetime
+from sqlmodel import SQLModel, Field
+
+
+class DetailCommandeValuationRead(SQLModel):
+    """
+    Valorisation d'une ligne de commande : quantité commandée multipliée par les points de l'objet.
+    """
+
+    detail_commande_id: int = Field(
+        description="Identifiant de la ligne de commande"
+    )
+
+    fk_detail_commande_variation_objet_id: int | None = Field(
+        default=None,
+        description="Identifiant de la variation d'objet commandée"
+    )
+
+    objet_id: int | None = Field(
+        default=None,
+        description="Identifiant de l'objet de la variation"
+    )
+
+    detail_commande_quantitee: int = Field(
+        default=0,
+        description="Quantité commandée (0 si non renseignée)"
+    )
+
+    objet_points: int = Field(
+        default=0,
+        description="Points unitaires de l'objet (0 si non renseignés)"
+    )
+
+    line_points: int = Field(
+        default=0,
+        description="Total de points de la ligne"
+    )
+
+
+class CommandeValuationRead(SQLModel):
+    """
+    Valorisation d'une commande : totaux de ses lignes, calculés par la base.
+    """
+
+    commande_id: int = Field(
+        description="Identifiant de la commande"
+    )
+
+    commande_date: datetime.date | None = Field(
+        default=None,
+        description="Date de la commande"
+    )
+
+    line_count: int = Field(
+        default=0,
+        description="Nombre de lignes de la commande"
+    )
+
+    total_quantity: int = Field(
+        default=0,
+        description="Quantité totale commandée"
+    )
+
+    total_points: int = Field(
+        default=0,
+        description="Total de points de la commande"
+    )
+
+
+class CommandeValuationDetailRead(CommandeValuationRead):
+    """
+    Valorisation d'une commande, avec le détail de chacune de ses lignes.
+    """
+
+    lines: list[DetailCommandeValuationRead] = Field(
+        default_factory=list,
+        description="Valorisation de chaque ligne, dans l'ordre de leur identifiant"
+    )
@@ -0,0 +1,63 @@
+import base64
+import json
+from fastapi import HTTPException, Query, Response, status
+
+# En-tête de réponse portant le curseur de la page suivante
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(key: int | str) -> str:
+    """
+    Encode une clé primaire en curseur opaque (base64 url-safe).
+    """
+    raw = json.dumps([key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int | str:
+    """
+    Décode un curseur produit par encode_cursor.
+
+    Raises:
+        ValueError: si le curseur est mal formé.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)[0]
+    except (ValueError, TypeError, IndexError, KeyError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(key, (int, str)) or isinstance(key, bool):
+        raise ValueError("Invalid cursor.")
+    return key
+
+
+def cursor_param(key_type: type[int] | type[str] = int):
+    """
+    Retourne la dépendance FastAPI qui décode le paramètre `cursor` en clé primaire,
+    du type de la clé primaire de l'endpoint (`cursor_param(str)` pour un code de département).
+
+    La dépendance lève une HTTPException 400 si le curseur est mal formé ou si sa clé n'est
+    pas du type attendu : `["abc"]` envoyé à /client/ ne doit pas devenir `client_id > 'abc'`.
+    """
+    def dependency(cursor: str | None = Query(default=None, description="Curseur opaque renvoyé dans l'en-tête X-Next-Cursor de la page précédente")) -> int | str | None:
+        if not cursor:
+            return None
+        try:
+            key = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if not isinstance(key, key_type):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+        return key
+
+    return dependency
+
+
+def set_next_cursor(response: Response, items: list, key: str, limit: int | None) -> None:
+    """
+    Ajoute l'en-tête X-Next-Cursor quand la page est complète, à partir de la clé du dernier élément.
+    """
+    if items and limit and len(items) >= limit:
+        last = items[-1]
+        value = last[key] if isinstance(last, dict) else getattr(last, key)
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(value)
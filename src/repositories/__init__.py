@@ -1,9 +1,10 @@
-from .commande_repository import CommandeRepository
-from .client_repository import ClientRepository
-from .colis_repository import ColisRepository
-from .departement_repository import DepartementRepository
-from .commune_repository import CommuneRepository
-from .detail_colis_repository import DetailColisRepository
-from .detail_commande_repository import DetailCommandeRepository
-from .objet_repository import ObjetRepository
-from .variation_objet_repository import VariationObjetRepository
\ No newline at end of file
+from .commande_repository import CommandeRepository, AsyncCommandeRepository
+from .client_repository import ClientRepository, AsyncClientRepository
+from .colis_repository import ColisRepository, AsyncColisRepository
+from .departement_repository import DepartementRepository, AsyncDepartementRepository
+from .commune_repository import CommuneRepository, AsyncCommuneRepository
+from .detail_colis_repository import DetailColisRepository, AsyncDetailColisRepository
+from .detail_commande_repository import DetailCommandeRepository, AsyncDetailCommandeRepository
+from .objet_repository import ObjetRepository, AsyncObjetRepository
+from .variation_objet_repository import VariationObjetRepository, AsyncVariationObjetRepository
+from .tarif_postal_repository import TarifPostalRepository, AsyncTarifPostalRepository
\ No newline at end of file
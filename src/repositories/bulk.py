@@ -0,0 +1,143 @@
+from sqlalchemy import insert, select, text, tuple_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import Session, SQLModel
+from ..database import BULK_CONFIG
+
+
+def insert_many(session: Session, model: type[SQLModel], rows: list[dict], chunk_size: int | None = None) -> list:
+    """
+    Insert several rows of a table model with one multi-row INSERT per chunk.
+
+    The rows are plain dictionaries sharing the same keys. Within a chunk, rows carrying
+    their primary key (e.g. a departement code) and rows leaving it to the database are
+    written by two separate INSERTs, so that neither loses or invents a key. The
+    transaction is left open: the caller decides when to commit.
+
+    When the dialect supports RETURNING (SQLite, MariaDB), the generated primary
+    keys are read back from the INSERT itself. Otherwise (MySQL), they are derived
+    from LAST_INSERT_ID() and @@auto_increment_increment: a multi-row INSERT ... VALUES
+    is a "simple insert", for which InnoDB allocates one block of keys spaced by the
+    increment, under every innodb_autoinc_lock_mode (the gaps of the interleaved mode
+    only affect INSERT ... SELECT and LOAD DATA).
+
+    Parameters:
+        session (Session): The SQLModel session used for database operations.
+        model (type[SQLModel]): The table model to insert into.
+        rows (list[dict]): The column values of each row.
+        chunk_size (int | None): Maximum number of rows per INSERT (defaults to DB_BULK_CHUNK_SIZE).
+
+    Returns:
+        list: The primary keys of the inserted rows, in input order.
+    """
+    if not rows:
+        return []
+
+    table = model.__table__
+    primary_key = table.primary_key.columns.values()[0]
+    chunk_size = chunk_size or BULK_CONFIG["chunk_size"]
+    connection = session.connection()
+    dialect = connection.dialect
+    increment = None
+
+    ids = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        chunk_ids = [row.get(primary_key.name) for row in chunk]
+
+        keyed = [row for row in chunk if row.get(primary_key.name) is not None]
+        if keyed:
+            # Keys supplied by the caller (e.g. departement code)
+            connection.execute(insert(table).values(keyed))
+
+        generated = [
+            {key: value for key, value in row.items() if key != primary_key.name}
+            for row in chunk if row.get(primary_key.name) is None
+        ]
+        if generated:
+            if dialect.insert_returning:
+                result = connection.execute(insert(table).values(generated).returning(primary_key))
+                # RETURNING order is not guaranteed, but keys are allocated in row order within one INSERT
+                new_ids = sorted(result.scalars().all())
+            else:
+                if increment is None:
+                    increment = connection.execute(text("SELECT @@auto_increment_increment")).scalar_one()
+                result = connection.execute(insert(table).values(generated))
+                first_id = result.lastrowid
+                new_ids = list(range(first_id, first_id + len(generated) * increment, increment))
+            new_ids = iter(new_ids)
+            chunk_ids = [next(new_ids) if row_id is None else row_id for row_id in chunk_ids]
+        ids.extend(chunk_ids)
+    return ids
+
+
+def upsert_many(session: Session, model: type[SQLModel], rows: list[dict], key_columns: list[str], chunk_size: int | None = None) -> tuple[int, int]:
+    """
+    Insert or update several rows of a table model, identified by a natural key.
+
+    Each chunk is written with the dialect's native upsert: INSERT ... ON DUPLICATE
+    KEY UPDATE on MySQL, INSERT ... ON CONFLICT DO UPDATE on SQLite and PostgreSQL.
+    The key columns must be covered by a primary key or unique constraint. The
+    keys already present are counted with one SELECT per chunk beforehand, since
+    affected-row counts of native upserts are not comparable across dialects.
+    The transaction is left open: the caller decides when to commit.
+
+    Parameters:
+        session (Session): The SQLModel session used for database operations.
+        model (type[SQLModel]): The table model to upsert into.
+        rows (list[dict]): The column values of each row, sharing the same keys.
+        key_columns (list[str]): The columns forming the natural key.
+        chunk_size (int | None): Maximum number of rows per statement (defaults to DB_BULK_CHUNK_SIZE).
+
+    Returns:
+        tuple[int, int]: The number of inserted rows and the number of updated rows.
+
+    Raises:
+        ValueError: If a row has an empty natural key, or if the dialect has no native upsert.
+    """
+    missing_keys = [index for index, row in enumerate(rows) if any(row.get(key) is None for key in key_columns)]
+    if missing_keys:
+        raise ValueError(f"Rows {missing_keys} are missing a value for {', '.join(key_columns)}.")
+    if not rows:
+        return 0, 0
+
+    table = model.__table__
+    primary_key = table.primary_key.columns.values()[0]
+    chunk_size = chunk_size or BULK_CONFIG["chunk_size"]
+    connection = session.connection()
+    dialect_name = connection.dialect.name
+    if dialect_name not in ("mysql", "mariadb", "sqlite", "postgresql"):
+        raise ValueError(f"Upsert is not supported for the {dialect_name} dialect.")
+    keys = [table.c[key] for key in key_columns]
+    # A key is written, and counted, once: its last occurrence wins
+    rows = list({tuple(row[key] for key in key_columns): row for row in rows}.values())
+
+    inserted = updated = 0
+    for start in range(0, len(rows), chunk_size):
+        by_key = {tuple(row[key] for key in key_columns): row for row in rows[start:start + chunk_size]}
+        chunk = [
+            {column: value for column, value in row.items() if not (column == primary_key.name and value is None)}
+            for row in by_key.values()
+        ]
+        update_columns = [column for column in chunk[0] if column not in key_columns and column != primary_key.name]
+
+        existing = connection.execute(select(*keys).where(tuple_(*keys).in_(list(by_key)))).all()
+        updated += len(existing)
+        inserted += len(chunk) - len(existing)
+
+        if dialect_name in ("mysql", "mariadb"):
+            statement = mysql.insert(table).values(chunk)
+            # ON DUPLICATE KEY UPDATE needs at least one assignment
+            assignments = {column: statement.inserted[column] for column in update_columns} or {key_columns[0]: statement.inserted[key_columns[0]]}
+            statement = statement.on_duplicate_key_update(assignments)
+        else:
+            statement = (sqlite if dialect_name == "sqlite" else postgresql).insert(table).values(chunk)
+            if update_columns:
+                statement = statement.on_conflict_do_update(
+                    index_elements=keys,
+                    set_={column: statement.excluded[column] for column in update_columns},
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=keys)
+        connection.execute(statement)
+    return inserted, updated
+
@@ -1,5 +1,85 @@
+from sqlalchemy import and_, case, literal, or_
+from sqlalchemy.dialects.mysql import match
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..models import Client
+from ..search import prefix_upper_bound
+from .statements import select_page, update_by_pk, delete_by_pk, delete_by_pks, public_columns
+from .bulk import insert_many
+
+# Mots vides InnoDB par défaut : ignorés par l'index FULLTEXT, ils ne peuvent pas servir de filtre MATCH
+INNODB_STOPWORDS = frozenset(
+    "a about an are as at be by com de en for from how i in is it la of on or that the this to was what when where who will with und www".split()
+)
+# Longueur minimale d'un mot indexé par FULLTEXT (innodb_ft_min_token_size)
+FULLTEXT_MIN_TOKEN = 3
+
+
+def _starts_with(column, prefix: str):
+    """
+    Prefix condition written as an index range: column >= prefix AND column < upper bound.
+    """
+    upper = prefix_upper_bound(prefix)
+    if upper is None:
+        return column >= prefix
+    return and_(column >= prefix, column < upper)
+
+
+def _name_search(tokens: list[str], fulltext: bool):
+    """
+    Build the filter and the relevance of a search on the normalized name and first name.
+
+    A client matches when the whole query starts its name or its first name ("de la f"
+    finds "DE LA FONTAINE"), or when the query splits into a start of its first name
+    followed by a start of its name, or the reverse ("jean dup" and "dupont j" find Jean
+    DUPONT). Exact matches rank above prefix matches, and names above first names.
+    On MySQL, the words long enough to be indexed are also required through the FULLTEXT
+    index, which every match satisfies, to narrow the rows before the range conditions.
+    """
+    query = " ".join(tokens)
+    nom, prenom = Client.client_nom_norm, Client.client_prenom_norm
+    alternatives = [_starts_with(nom, query), _starts_with(prenom, query)]
+    for split in range(1, len(tokens)):
+        head, tail = " ".join(tokens[:split]), " ".join(tokens[split:])
+        alternatives.append(and_(_starts_with(prenom, head), _starts_with(nom, tail)))
+        alternatives.append(and_(_starts_with(nom, head), _starts_with(prenom, tail)))
+    condition = or_(*alternatives)
+    if fulltext:
+        words = [token for token in tokens if len(token) >= FULLTEXT_MIN_TOKEN and token not in INNODB_STOPWORDS]
+        if words:
+            against = " ".join(f"+{word}*" for word in words)
+            condition = and_(match(nom, prenom, against=against).in_boolean_mode(), condition)
+    relevance = case(
+        (nom == query, 4),
+        (prenom == query, 3),
+        (_starts_with(nom, query), 2),
+        (_starts_with(prenom, query), 1),
+        else_=0,
+    )
+    return condition, relevance
+
+
+def _search_clients(session: Session, tokens: list[str] | None, email: str | None, phone: str | None, limit: int) -> list[dict]:
+    """
+    Run a client search on the normalized columns and return the exposed columns of the matches.
+    """
+    if email is not None:
+        condition, relevance = Client.client_email_norm == email, literal(1)
+    elif phone is not None:
+        condition = or_(Client.client_telephone_fix_norm == phone, Client.client_telephone_portable_norm == phone)
+        relevance = literal(1)
+    else:
+        condition, relevance = _name_search(tokens, session.get_bind().dialect.name == "mysql")
+    columns = public_columns(Client.__table__)
+    statement = (
+        select(*columns)
+        .where(condition)
+        .order_by(relevance.desc(), Client.client_nom_norm, Client.client_prenom_norm, Client.client_id)
+        .limit(limit)
+    )
+    keys = [column.name for column in columns]
+    return [dict(zip(keys, row)) for row in session.exec(statement)]
+
 
 class ClientRepository:
     """
@@ -16,12 +96,18 @@ class ClientRepository:
         create_client(client: Client) -> Client:
             Adds a new Client to the database and returns the created instance.
 
+        bulk_create_clients(clients: list[dict]) -> list:
+            Inserts several Clients with multi-row INSERTs and returns their IDs.
+
         get_client(client_id: int) -> Client | None:
             Retrieves a Client by its ID. Returns None if not found.
 
-        get_all_clients(limit: int | None = None, offset: int | None = None) -> List[Client]:
+        get_all_clients(limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
             Fetches all Client records from the database.
 
+        search_clients(tokens: list[str] | None, email: str | None, phone: str | None, limit: int) -> list[dict]:
+            Searches Clients on their normalized name, first name, email or phone.
+
         update_client(client_id: int, client_update: dict) -> Client | None:
             Updates an existing Client with new values. Returns the updated instance
             or None if the Client was not found.
@@ -29,6 +115,9 @@ class ClientRepository:
         delete_client(client_id: int) -> bool:
             Deletes a Client by its ID. Returns True if the deletion was successful,
             or False if the Client was not found.
+
+        bulk_delete_clients(client_ids: list[int]) -> int:
+            Deletes several Clients by their IDs and returns the number of deleted rows.
     """   
     def __init__(self, session: Session):
         self.session = session
@@ -50,6 +139,22 @@ class ClientRepository:
         self.session.refresh(client)
         return client
 
+    def bulk_create_clients(self, clients: list[dict]) -> list:
+        """
+        Create several Clients at once.
+
+        This method inserts the rows with one multi-row INSERT per chunk and commits the transaction.
+
+        Parameters:
+            clients (list[dict]): The column values of each Client, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Clients, in input order.
+        """
+        ids = insert_many(self.session, Client, clients)
+        self.session.commit()
+        return ids
+
     def get_client(self, client_id: int) -> Client | None:
         """
         Retrieve a Client by its ID.
@@ -65,7 +170,7 @@ class ClientRepository:
         statement = select(Client).where(Client.client_id == client_id)
         return self.session.exec(statement).one_or_none()
 
-    def get_all_clients(self, limit: int | None = None, offset: int | None = None ) -> list[Client]:
+    def get_all_clients(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
         """
         Retrieve all Clients.
 
@@ -74,19 +179,38 @@ class ClientRepository:
         Parameters:
             limit (int) : an integer to specify the maximum number of results.
             offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
 
         Returns:
-            List[Client]: A list of all Client instances in the database.
+            list[dict]: The column values of each Client, in ID order.
+        """
+        return select_page(self.session, Client, limit, offset, after)
+
+    def search_clients(self, tokens: list[str] | None = None, email: str | None = None, phone: str | None = None, limit: int = 20) -> list[dict]:
         """
-        statement = select(Client).limit(limit).offset(offset)
-        return list(self.session.exec(statement).all())
+        Search Clients on their normalized columns (see src/search.py).
+
+        Exactly one criterion is used, in this order: the normalized email, the normalized
+        phone number (fixed or mobile), or the normalized words of the name. Every criterion
+        is served by the indexes of the *_norm columns.
+
+        Parameters:
+            tokens (list[str] | None): The normalized words of a name query.
+            email (str | None): A normalized email, matched exactly.
+            phone (str | None): A normalized phone number, matched exactly.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[dict]: The exposed column values of each matching Client, by decreasing relevance.
+        """
+        return _search_clients(self.session, tokens, email, phone, limit)
 
     def update_client(self, client_id: int, client_update: dict) -> Client | None:
         """
         Update an existing Client.
 
-        This method updates the fields of an existing Client in the database
-        with the values from the provided Client instance.
+        This method issues a single UPDATE statement on the Client primary key, reading the
+        updated row back with RETURNING when the database supports it.
 
         Parameters:
             client_id (int): The ID of the Client to update.
@@ -95,20 +219,149 @@ class ClientRepository:
         Returns:
             Client | None: The updated Client instance if found, otherwise None.
         """
-        existing_client = self.get_client(client_id)
-        if existing_client:
-            existing_client.sqlmodel_update(client_update)
-            self.session.add(existing_client)
-            self.session.commit()
-            self.session.refresh(existing_client)
-            return existing_client
-        return None
+        updated_client = update_by_pk(self.session, Client, client_id, client_update)
+        self.session.commit()
+        return updated_client
 
     def delete_client(self, client_id: int) -> bool:
         """
         Delete a Client by its ID.
 
-        This method removes a Client from the database using its unique identifier.
+        This method issues a single DELETE statement on the Client primary key, without loading
+        the row first.
+
+        Parameters:
+            client_id (int): The ID of the Client to delete.
+
+        Returns:
+            bool: True if the deletion was successful, otherwise False.
+        """
+        deleted = delete_by_pk(self.session, Client, client_id)
+        self.session.commit()
+        return deleted
+
+    def bulk_delete_clients(self, client_ids: list[int]) -> int:
+        """
+        Delete several Clients by their IDs.
+
+        This method issues one DELETE ... WHERE IN statement per chunk and commits the transaction.
+        IDs that do not exist are ignored.
+
+        Parameters:
+            client_ids (list[int]): The IDs of the Clients to delete.
+
+        Returns:
+            int: The number of deleted Clients.
+        """
+        deleted = delete_by_pks(self.session, Client, client_ids)
+        self.session.commit()
+        return deleted
+
+
+class AsyncClientRepository:
+    """
+    Asynchronous counterpart of ClientRepository.
+
+    Provides the same CRUD operations on the Client model as coroutines running on an
+    AsyncSession, so that endpoints do not hold a threadpool thread while waiting
+    on the database.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session used for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_client(self, client: Client) -> Client:
+        """
+        Create a new Client.
+
+        Parameters:
+            client (Client): The Client instance to be created.
+
+        Returns:
+            Client: The created Client instance with its ID populated.
+        """
+        self.session.add(client)
+        await self.session.commit()
+        await self.session.refresh(client)
+        return client
+
+    async def bulk_create_clients(self, clients: list[dict]) -> list:
+        """
+        Create several Clients at once, with one multi-row INSERT per chunk.
+
+        Parameters:
+            clients (list[dict]): The column values of each Client, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Clients, in input order.
+        """
+        ids = await self.session.run_sync(insert_many, Client, clients)
+        await self.session.commit()
+        return ids
+
+    async def get_client(self, client_id: int) -> Client | None:
+        """
+        Retrieve a Client by its ID.
+
+        Parameters:
+            client_id (int): The ID of the Client to retrieve.
+
+        Returns:
+            Client | None: The Client instance if found, otherwise None.
+        """
+        statement = select(Client).where(Client.client_id == client_id)
+        return (await self.session.exec(statement)).one_or_none()
+
+    async def get_all_clients(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
+        """
+        Retrieve all Clients.
+
+        Parameters:
+            limit (int) : an integer to specify the maximum number of results.
+            offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
+
+        Returns:
+            list[dict]: The column values of each Client, in ID order.
+        """
+        return await self.session.run_sync(select_page, Client, limit, offset, after)
+
+    async def search_clients(self, tokens: list[str] | None = None, email: str | None = None, phone: str | None = None, limit: int = 20) -> list[dict]:
+        """
+        Search Clients on their normalized name, first name, email or phone.
+
+        Parameters:
+            tokens (list[str] | None): The normalized words of a name query.
+            email (str | None): A normalized email, matched exactly.
+            phone (str | None): A normalized phone number, matched exactly.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[dict]: The exposed column values of each matching Client, by decreasing relevance.
+        """
+        return await self.session.run_sync(_search_clients, tokens, email, phone, limit)
+
+    async def update_client(self, client_id: int, client_update: dict) -> Client | None:
+        """
+        Update an existing Client.
+
+        Parameters:
+            client_id (int): The ID of the Client to update.
+            client_update (dict): The dictionary instance containing updated values.
+
+        Returns:
+            Client | None: The updated Client instance if found, otherwise None.
+        """
+        updated_client = await self.session.run_sync(update_by_pk, Client, client_id, client_update)
+        await self.session.commit()
+        return updated_client
+
+    async def delete_client(self, client_id: int) -> bool:
+        """
+        Delete a Client by its ID.
 
         Parameters:
             client_id (int): The ID of the Client to delete.
@@ -116,9 +369,20 @@ class ClientRepository:
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        existing_client = self.get_client(client_id)
-        if existing_client:
-            self.session.delete(existing_client)
-            self.session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = await self.session.run_sync(delete_by_pk, Client, client_id)
+        await self.session.commit()
+        return deleted
+
+    async def bulk_delete_clients(self, client_ids: list[int]) -> int:
+        """
+        Delete several Clients by their IDs, with one DELETE ... WHERE IN statement per chunk.
+
+        Parameters:
+            client_ids (list[int]): The IDs of the Clients to delete.
+
+        Returns:
+            int: The number of deleted Clients.
+        """
+        deleted = await self.session.run_sync(delete_by_pks, Client, client_ids)
+        await self.session.commit()
+        return deleted
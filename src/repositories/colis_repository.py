@@ -1,5 +1,8 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..models import Colis
+from .statements import select_page, update_by_pk, delete_by_pk, delete_by_pks
+from .bulk import insert_many
 
 class ColisRepository:
     """
@@ -16,10 +19,13 @@ class ColisRepository:
         create_colis(colis: Colis) -> Colis:
             Adds a new Colis to the database and returns the created instance.
 
+        bulk_create_colis(colis: list[dict]) -> list:
+            Inserts several Coliss with multi-row INSERTs and returns their IDs.
+
         get_colis(colis_id: int) -> Colis | None:
             Retrieves a Colis by its ID. Returns None if not found.
 
-        get_all_colis(limit: int | None = None, offset: int | None = None) -> List[Colis]:
+        get_all_colis(limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
             Fetches all Colis records from the database.
 
         update_colis(colis_id: int, colis_update: dict) -> Colis | None:
@@ -29,6 +35,9 @@ class ColisRepository:
         delete_colis(colis_id: int) -> bool:
             Deletes a Colis by its ID. Returns True if the deletion was successful,
             or False if the Colis was not found.
+
+        bulk_delete_colis(colis_ids: list[int]) -> int:
+            Deletes several Coliss by their IDs and returns the number of deleted rows.
     """
         
     def __init__(self, session: Session):
@@ -51,6 +60,22 @@ class ColisRepository:
         self.session.refresh(colis)
         return colis
 
+    def bulk_create_colis(self, colis: list[dict]) -> list:
+        """
+        Create several Coliss at once.
+
+        This method inserts the rows with one multi-row INSERT per chunk and commits the transaction.
+
+        Parameters:
+            colis (list[dict]): The column values of each Colis, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Coliss, in input order.
+        """
+        ids = insert_many(self.session, Colis, colis)
+        self.session.commit()
+        return ids
+
     def get_colis(self, colis_id: int) -> Colis | None:
         """
         Retrieve a Colis by its ID.
@@ -66,7 +91,7 @@ class ColisRepository:
         statement = select(Colis).where(Colis.colis_id == colis_id)
         return self.session.exec(statement).one_or_none()
 
-    def get_all_colis(self, limit: int | None = None, offset: int | None = None) -> list[Colis]:
+    def get_all_colis(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
         """
         Retrieve all Coliss.
 
@@ -75,19 +100,19 @@ class ColisRepository:
         Parameters:
             limit (int) : an integer to specify the maximum number of results.
             offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
 
         Returns:
-            List[Colis]: A list of all Colis instances in the database.
+            list[dict]: The column values of each Colis, in ID order.
         """
-        statement = select(Colis).limit(limit).offset(offset)
-        return list(self.session.exec(statement).all())
+        return select_page(self.session, Colis, limit, offset, after)
 
     def update_colis(self, colis_id: int, colis_update: dict) -> Colis | None:
         """
         Update an existing Colis.
 
-        This method updates the fields of an existing Colis in the database
-        with the values from the provided Colis instance.
+        This method issues a single UPDATE statement on the Colis primary key, reading the
+        updated row back with RETURNING when the database supports it.
 
         Parameters:
             colis_id (int): The ID of the Colis to update.
@@ -97,20 +122,16 @@ class ColisRepository:
             Colis | None: The updated Colis instance if found, otherwise None.
         """
 
-        existing_colis = self.get_colis(colis_id)
-        if existing_colis:
-            existing_colis.sqlmodel_update(colis_update)
-            self.session.add(existing_colis)
-            self.session.commit()
-            self.session.refresh(existing_colis)
-            return existing_colis
-        return None
+        updated_colis = update_by_pk(self.session, Colis, colis_id, colis_update)
+        self.session.commit()
+        return updated_colis
 
     def delete_colis(self, colis_id: int) -> bool:
         """
         Delete a Colis by its ID.
 
-        This method removes a Colis from the database using its unique identifier.
+        This method issues a single DELETE statement on the Colis primary key, without loading
+        the row first.
 
         Parameters:
             colis_id (int): The ID of the Colis to delete.
@@ -118,9 +139,138 @@ class ColisRepository:
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        existing_colis = self.get_colis(colis_id)
-        if existing_colis:
-            self.session.delete(existing_colis)
-            self.session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = delete_by_pk(self.session, Colis, colis_id)
+        self.session.commit()
+        return deleted
+
+    def bulk_delete_colis(self, colis_ids: list[int]) -> int:
+        """
+        Delete several Coliss by their IDs.
+
+        This method issues one DELETE ... WHERE IN statement per chunk and commits the transaction.
+        IDs that do not exist are ignored.
+
+        Parameters:
+            colis_ids (list[int]): The IDs of the Coliss to delete.
+
+        Returns:
+            int: The number of deleted Coliss.
+        """
+        deleted = delete_by_pks(self.session, Colis, colis_ids)
+        self.session.commit()
+        return deleted
+
+
+class AsyncColisRepository:
+    """
+    Asynchronous counterpart of ColisRepository.
+
+    Provides the same CRUD operations on the Colis model as coroutines running on an
+    AsyncSession, so that endpoints do not hold a threadpool thread while waiting
+    on the database.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session used for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_colis(self, colis: Colis) -> Colis:
+        """
+        Create a new Colis.
+
+        Parameters:
+            colis (Colis): The Colis instance to be created.
+
+        Returns:
+            Colis: The created Colis instance with its ID populated.
+        """
+        self.session.add(colis)
+        await self.session.commit()
+        await self.session.refresh(colis)
+        return colis
+
+    async def bulk_create_colis(self, colis: list[dict]) -> list:
+        """
+        Create several Coliss at once, with one multi-row INSERT per chunk.
+
+        Parameters:
+            colis (list[dict]): The column values of each Colis, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Coliss, in input order.
+        """
+        ids = await self.session.run_sync(insert_many, Colis, colis)
+        await self.session.commit()
+        return ids
+
+    async def get_colis(self, colis_id: int) -> Colis | None:
+        """
+        Retrieve a Colis by its ID.
+
+        Parameters:
+            colis_id (int): The ID of the Colis to retrieve.
+
+        Returns:
+            Colis | None: The Colis instance if found, otherwise None.
+        """
+        statement = select(Colis).where(Colis.colis_id == colis_id)
+        return (await self.session.exec(statement)).one_or_none()
+
+    async def get_all_colis(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
+        """
+        Retrieve all Coliss.
+
+        Parameters:
+            limit (int) : an integer to specify the maximum number of results.
+            offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
+
+        Returns:
+            list[dict]: The column values of each Colis, in ID order.
+        """
+        return await self.session.run_sync(select_page, Colis, limit, offset, after)
+
+    async def update_colis(self, colis_id: int, colis_update: dict) -> Colis | None:
+        """
+        Update an existing Colis.
+
+        Parameters:
+            colis_id (int): The ID of the Colis to update.
+            colis_update (dict): The dictionary instance containing updated values.
+
+        Returns:
+            Colis | None: The updated Colis instance if found, otherwise None.
+        """
+        updated_colis = await self.session.run_sync(update_by_pk, Colis, colis_id, colis_update)
+        await self.session.commit()
+        return updated_colis
+
+    async def delete_colis(self, colis_id: int) -> bool:
+        """
+        Delete a Colis by its ID.
+
+        Parameters:
+            colis_id (int): The ID of the Colis to delete.
+
+        Returns:
+            bool: True if the deletion was successful, otherwise False.
+        """
+        deleted = await self.session.run_sync(delete_by_pk, Colis, colis_id)
+        await self.session.commit()
+        return deleted
+
+    async def bulk_delete_colis(self, colis_ids: list[int]) -> int:
+        """
+        Delete several Coliss by their IDs, with one DELETE ... WHERE IN statement per chunk.
+
+        Parameters:
+            colis_ids (list[int]): The IDs of the Coliss to delete.
+
+        Returns:
+            int: The number of deleted Coliss.
+        """
+        deleted = await self.session.run_sync(delete_by_pks, Colis, colis_ids)
+        await self.session.commit()
+        return deleted
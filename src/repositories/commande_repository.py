@@ -1,5 +1,35 @@
+from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import Session, select
-from ..models import Commande
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..models import Client, Commande, Commune, DetailCommande, VariationObjet
+from .statements import select_page, update_by_pk, delete_by_pk, delete_by_pks
+from .bulk import insert_many
+
+def full_commandes_statement(commande_ids: list[int]):
+    """
+    Build the SELECT loading Commandes with everything needed to render them.
+
+    The client, its commune and its departement are joined to the Commande query
+    (many-to-one, LEFT OUTER JOIN); the lines are loaded by a second SELECT ... IN
+    that joins their variation and its objet. The Commandes are thus read in two
+    statements, whatever their number and their number of lines.
+
+    Parameters:
+        commande_ids (list[int]): The IDs of the Commandes to load.
+
+    Returns:
+        The SELECT statement, ordered by Commande ID.
+    """
+    return (
+        select(Commande)
+        .where(Commande.commande_id.in_(commande_ids))
+        .order_by(Commande.commande_id)
+        .options(
+            joinedload(Commande.client).joinedload(Client.commune).joinedload(Commune.departement),
+            selectinload(Commande.details_commande).joinedload(DetailCommande.variation_objet).joinedload(VariationObjet.objet),
+        )
+    )
+
 
 class CommandeRepository:
     """
@@ -16,10 +46,16 @@ class CommandeRepository:
         create_commande(commande: Commande) -> Commande:
             Adds a new Commande to the database and returns the created instance.
 
+        bulk_create_commandes(commandes: list[dict]) -> list:
+            Inserts several Commandes with multi-row INSERTs and returns their IDs.
+
         get_commande(commande_id: int) -> Commande | None:
             Retrieves a Commande by its ID. Returns None if not found.
 
-        get_all_commandes(limit: int | None = None, offset: int | None = None) -> List[Commande]:
+        get_full_commandes(commande_ids: list[int]) -> list[Commande]:
+            Retrieves Commandes with their lines, variations, objets, client, commune and departement.
+
+        get_all_commandes(limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
             Fetches all Commande records from the database.
 
         update_commande(commande_id: int, commande_update: dict) -> Commande | None:
@@ -29,6 +65,9 @@ class CommandeRepository:
         delete_commande(commande_id: int) -> bool:
             Deletes a Commande by its ID. Returns True if the deletion was successful,
             or False if the Commande was not found.
+
+        bulk_delete_commandes(commande_ids: list[int]) -> int:
+            Deletes several Commandes by their IDs and returns the number of deleted rows.
     """
         
     def __init__(self, session: Session):
@@ -51,6 +90,22 @@ class CommandeRepository:
         self.session.refresh(commande)
         return commande
 
+    def bulk_create_commandes(self, commandes: list[dict]) -> list:
+        """
+        Create several Commandes at once.
+
+        This method inserts the rows with one multi-row INSERT per chunk and commits the transaction.
+
+        Parameters:
+            commandes (list[dict]): The column values of each Commande, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Commandes, in input order.
+        """
+        ids = insert_many(self.session, Commande, commandes)
+        self.session.commit()
+        return ids
+
     def get_commande(self, commande_id: int) -> Commande | None:
         """
         Retrieve a Commande by its ID.
@@ -66,7 +121,26 @@ class CommandeRepository:
         statement = select(Commande).where(Commande.commande_id == commande_id)
         return self.session.exec(statement).one_or_none()
 
-    def get_all_commandes(self, limit: int | None = None, offset: int | None = None) -> list[Commande]:
+    def get_full_commandes(self, commande_ids: list[int]) -> list[Commande]:
+        """
+        Retrieve Commandes with everything needed to render them.
+
+        This method eager-loads the lines of each Commande with their VariationObjet and
+        Objet, and the Client with its Commune and Departement, in two SELECT statements
+        (see full_commandes_statement).
+
+        Parameters:
+            commande_ids (list[int]): The IDs of the Commandes to retrieve. Unknown IDs are ignored.
+
+        Returns:
+            list[Commande]: The Commande instances found, in ID order.
+        """
+        if not commande_ids:
+            return []
+        statement = full_commandes_statement(list(dict.fromkeys(commande_ids)))
+        return list(self.session.exec(statement).all())
+
+    def get_all_commandes(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
         """
         Retrieve all Commandes.
 
@@ -75,19 +149,19 @@ class CommandeRepository:
         Parameters:
             limit (int) : an integer to specify the maximum number of results.
             offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
 
         Returns:
-            List[Commande]: A list of all Commande instances in the database.
+            list[dict]: The column values of each Commande, in ID order.
         """
-        statement = select(Commande).limit(limit).offset(offset)
-        return list(self.session.exec(statement).all())
+        return select_page(self.session, Commande, limit, offset, after)
 
     def update_commande(self, commande_id: int, commande_update: dict) -> Commande | None:
         """
         Update an existing Commande.
 
-        This method updates the fields of an existing Commande in the database
-        with the values from the provided Commande instance.
+        This method issues a single UPDATE statement on the Commande primary key, reading the
+        updated row back with RETURNING when the database supports it.
 
         Parameters:
             commande_id (int): The ID of the Commande to update.
@@ -97,20 +171,149 @@ class CommandeRepository:
             Commande | None: The updated Commande instance if found, otherwise None.
         """
 
-        existing_commande = self.get_commande(commande_id)
-        if existing_commande:
-            existing_commande.sqlmodel_update(commande_update)
-            self.session.add(existing_commande)
-            self.session.commit()
-            self.session.refresh(existing_commande)
-            return existing_commande
-        return None
+        updated_commande = update_by_pk(self.session, Commande, commande_id, commande_update)
+        self.session.commit()
+        return updated_commande
 
     def delete_commande(self, commande_id: int) -> bool:
         """
         Delete a Commande by its ID.
 
-        This method removes a Commande from the database using its unique identifier.
+        This method issues a single DELETE statement on the Commande primary key, without loading
+        the row first.
+
+        Parameters:
+            commande_id (int): The ID of the Commande to delete.
+
+        Returns:
+            bool: True if the deletion was successful, otherwise False.
+        """
+        deleted = delete_by_pk(self.session, Commande, commande_id)
+        self.session.commit()
+        return deleted
+
+    def bulk_delete_commandes(self, commande_ids: list[int]) -> int:
+        """
+        Delete several Commandes by their IDs.
+
+        This method issues one DELETE ... WHERE IN statement per chunk and commits the transaction.
+        IDs that do not exist are ignored.
+
+        Parameters:
+            commande_ids (list[int]): The IDs of the Commandes to delete.
+
+        Returns:
+            int: The number of deleted Commandes.
+        """
+        deleted = delete_by_pks(self.session, Commande, commande_ids)
+        self.session.commit()
+        return deleted
+
+
+class AsyncCommandeRepository:
+    """
+    Asynchronous counterpart of CommandeRepository.
+
+    Provides the same CRUD operations on the Commande model as coroutines running on an
+    AsyncSession, so that endpoints do not hold a threadpool thread while waiting
+    on the database.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session used for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_commande(self, commande: Commande) -> Commande:
+        """
+        Create a new Commande.
+
+        Parameters:
+            commande (Commande): The Commande instance to be created.
+
+        Returns:
+            Commande: The created Commande instance with its ID populated.
+        """
+        self.session.add(commande)
+        await self.session.commit()
+        await self.session.refresh(commande)
+        return commande
+
+    async def bulk_create_commandes(self, commandes: list[dict]) -> list:
+        """
+        Create several Commandes at once, with one multi-row INSERT per chunk.
+
+        Parameters:
+            commandes (list[dict]): The column values of each Commande, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Commandes, in input order.
+        """
+        ids = await self.session.run_sync(insert_many, Commande, commandes)
+        await self.session.commit()
+        return ids
+
+    async def get_commande(self, commande_id: int) -> Commande | None:
+        """
+        Retrieve a Commande by its ID.
+
+        Parameters:
+            commande_id (int): The ID of the Commande to retrieve.
+
+        Returns:
+            Commande | None: The Commande instance if found, otherwise None.
+        """
+        statement = select(Commande).where(Commande.commande_id == commande_id)
+        return (await self.session.exec(statement)).one_or_none()
+
+    async def get_full_commandes(self, commande_ids: list[int]) -> list[Commande]:
+        """
+        Retrieve Commandes with their lines, variations, objets, client, commune and departement.
+
+        Parameters:
+            commande_ids (list[int]): The IDs of the Commandes to retrieve. Unknown IDs are ignored.
+
+        Returns:
+            list[Commande]: The Commande instances found, in ID order, with their relationships loaded.
+        """
+        if not commande_ids:
+            return []
+        statement = full_commandes_statement(list(dict.fromkeys(commande_ids)))
+        return list((await self.session.exec(statement)).all())
+
+    async def get_all_commandes(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
+        """
+        Retrieve all Commandes.
+
+        Parameters:
+            limit (int) : an integer to specify the maximum number of results.
+            offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
+
+        Returns:
+            list[dict]: The column values of each Commande, in ID order.
+        """
+        return await self.session.run_sync(select_page, Commande, limit, offset, after)
+
+    async def update_commande(self, commande_id: int, commande_update: dict) -> Commande | None:
+        """
+        Update an existing Commande.
+
+        Parameters:
+            commande_id (int): The ID of the Commande to update.
+            commande_update (dict): The dictionary instance containing updated values.
+
+        Returns:
+            Commande | None: The updated Commande instance if found, otherwise None.
+        """
+        updated_commande = await self.session.run_sync(update_by_pk, Commande, commande_id, commande_update)
+        await self.session.commit()
+        return updated_commande
+
+    async def delete_commande(self, commande_id: int) -> bool:
+        """
+        Delete a Commande by its ID.
 
         Parameters:
             commande_id (int): The ID of the Commande to delete.
@@ -118,9 +321,20 @@ class CommandeRepository:
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        existing_commande = self.get_commande(commande_id)
-        if existing_commande:
-            self.session.delete(existing_commande)
-            self.session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = await self.session.run_sync(delete_by_pk, Commande, commande_id)
+        await self.session.commit()
+        return deleted
+
+    async def bulk_delete_commandes(self, commande_ids: list[int]) -> int:
+        """
+        Delete several Commandes by their IDs, with one DELETE ... WHERE IN statement per chunk.
+
+        Parameters:
+            commande_ids (list[int]): The IDs of the Commandes to delete.
+
+        Returns:
+            int: The number of deleted Commandes.
+        """
+        deleted = await self.session.run_sync(delete_by_pks, Commande, commande_ids)
+        await self.session.commit()
+        return deleted
@@ -1,5 +1,44 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..models import Commune
+from ..cache import cache_for, cached_instance, fills_cache, row_values
+from ..autocomplete import commune_index, commune_keys
+from ..search import normalize_text
+from .statements import select_page, update_by_pk, delete_by_pk, delete_by_pks
+from .bulk import insert_many, upsert_many
+
+# Point lookups cache, kept consistent by the write methods below
+commune_cache = cache_for(Commune)
+
+
+def load_commune_index(session: Session) -> None:
+    """
+    Reload the in-memory autocomplete index of the communes from the table.
+    """
+    version = commune_index.version
+    rows = select_page(session, Commune)
+    commune_index.load([entry for row in rows for entry in commune_keys(row)], version)
+
+
+def refresh_commune_index(session: Session) -> None:
+    """
+    Reload the autocomplete index if it is stale, unless another request is already
+    reloading it: that request's callers keep reading the previous version meanwhile.
+    """
+    if commune_index.stale and commune_index.begin_reload():
+        try:
+            load_commune_index(session)
+        finally:
+            commune_index.end_reload()
+
+
+def _autocomplete(query: str, limit: int) -> list[dict]:
+    """
+    Look up the loaded autocomplete index: a query without letters is a postal code prefix,
+    any other query a prefix of the normalized city name.
+    """
+    prefix = normalize_text(query)
+    return commune_index.search(prefix, limit) if prefix else []
 
 class CommuneRepository:
     """
@@ -16,12 +55,21 @@ class CommuneRepository:
         create_commune(commune: Commune) -> Commune:
             Adds a new Commune to the database and returns the created instance.
 
+        bulk_create_communes(communes: list[dict]) -> list:
+            Inserts several Communes with multi-row INSERTs and returns their IDs.
+
+        upsert_communes(communes: list[dict]) -> tuple[int, int]:
+            Inserts or updates several Communes by natural key and returns the inserted and updated counts.
+
         get_commune(commune_id: int) -> Commune | None:
             Retrieves a Commune by its ID. Returns None if not found.
 
-        get_all_communes(limit: int | None = None, offset: int | None = None) -> List[Commune]:
+        get_all_communes(limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
             Fetches all Commune records from the database.
 
+        autocomplete_communes(query: str, limit: int) -> list[dict]:
+            Finds Communes by postal code or city name prefix, from the in-memory index.
+
         update_commune(commune_id: int, commune_update: dict) -> Commune | None:
             Updates an existing Commune with new values. Returns the updated instance
             or None if the Commune was not found.
@@ -29,6 +77,9 @@ class CommuneRepository:
         delete_commune(commune_id: int) -> bool:
             Deletes a Commune by its ID. Returns True if the deletion was successful,
             or False if the Commune was not found.
+
+        bulk_delete_communes(commune_ids: list[int]) -> int:
+            Deletes several Communes by their IDs and returns the number of deleted rows.
     """
         
     def __init__(self, session: Session):
@@ -49,13 +100,54 @@ class CommuneRepository:
         self.session.add(commune)
         self.session.commit()
         self.session.refresh(commune)
+        commune_cache.set(commune.commune_id, row_values(commune))
+        commune_index.invalidate()
         return commune
 
+    def bulk_create_communes(self, communes: list[dict]) -> list:
+        """
+        Create several Communes at once.
+
+        This method inserts the rows with one multi-row INSERT per chunk and commits the transaction.
+
+        Parameters:
+            communes (list[dict]): The column values of each Commune, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Communes, in input order.
+        """
+        ids = insert_many(self.session, Commune, communes)
+        self.session.commit()
+        commune_index.invalidate()
+        return ids
+
+    def upsert_communes(self, communes: list[dict]) -> tuple[int, int]:
+        """
+        Insert or update several Communes at once, identified by commune_codepostal and commune_ville.
+
+        This method relies on the dialect's native upsert and commits the transaction.
+
+        Parameters:
+            communes (list[dict]): The column values of each Commune, sharing the same keys.
+
+        Returns:
+            tuple[int, int]: The number of inserted and of updated Communes.
+
+        Raises:
+            ValueError: If a Commune has an empty natural key.
+        """
+        counts = upsert_many(self.session, Commune, communes, ["commune_codepostal", "commune_ville"])
+        self.session.commit()
+        commune_cache.clear()
+        commune_index.invalidate()
+        return counts
+
     def get_commune(self, commune_id: int) -> Commune | None:
         """
         Retrieve a Commune by its ID.
 
-        This method fetches a Commune from the database using its unique identifier.
+        This method fetches a Commune from the database using its unique identifier, going through
+        the in-process cache of Commune rows first.
 
         Parameters:
             commune_id (int): The ID of the Commune to retrieve.
@@ -63,10 +155,17 @@ class CommuneRepository:
         Returns:
             Commune | None: The Commune instance if found, otherwise None.
         """
+        values = commune_cache.get(commune_id)
+        if values is not None:
+            return self.session.merge(cached_instance(Commune, values), load=False)
+        generation = commune_cache.generation
         statement = select(Commune).where(Commune.commune_id == commune_id)
-        return self.session.exec(statement).one_or_none()
+        commune = self.session.exec(statement).one_or_none()
+        if commune and fills_cache(self.session):
+            commune_cache.set(commune_id, row_values(commune), generation)
+        return commune
 
-    def get_all_communes(self, limit: int | None = None, offset: int | None = None) -> list[Commune]:
+    def get_all_communes(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
         """
         Retrieve all Communes.
 
@@ -75,19 +174,38 @@ class CommuneRepository:
         Parameters:
             limit (int) : an integer to specify the maximum number of results.
             offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
 
         Returns:
-            List[Commune]: A list of all Commune instances in the database.
+            list[dict]: The column values of each Commune, in ID order.
         """
-        statement = select(Commune).limit(limit).offset(offset)
-        return list(self.session.exec(statement).all())
+        return select_page(self.session, Commune, limit, offset, after)
+
+    def autocomplete_communes(self, query: str, limit: int = 10) -> list[dict]:
+        """
+        Find Communes by postal code or city name prefix.
+
+        This method reads the in-memory prefix index of src/autocomplete.py, reloading it from
+        the table first if a write made it stale and no other request is reloading it.
+        Case, accents and punctuation are ignored.
+
+        Parameters:
+            query (str): The start of a postal code ("591") or of a city name ("wervicq s").
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[dict]: The column values of each matching Commune, by postal code or city name.
+        """
+        if commune_index.stale:
+            refresh_commune_index(self.session)
+        return _autocomplete(query, limit)
 
     def update_commune(self, commune_id: int, commune_update: dict) -> Commune | None:
         """
         Update an existing Commune.
 
-        This method updates the fields of an existing Commune in the database
-        with the values from the provided Commune instance.
+        This method issues a single UPDATE statement on the Commune primary key, reading the
+        updated row back with RETURNING when the database supports it.
 
         Parameters:
             commune_id (int): The ID of the Commune to update.
@@ -97,20 +215,186 @@ class CommuneRepository:
             Commune | None: The updated Commune instance if found, otherwise None.
         """
 
-        existing_commune = self.get_commune(commune_id)
-        if existing_commune:
-            existing_commune.sqlmodel_update(commune_update)
-            self.session.add(existing_commune)
-            self.session.commit()
-            self.session.refresh(existing_commune)
-            return existing_commune
-        return None
+        updated_commune = update_by_pk(self.session, Commune, commune_id, commune_update)
+        self.session.commit()
+        commune_cache.invalidate(commune_id)
+        commune_index.invalidate()
+        return updated_commune
 
     def delete_commune(self, commune_id: int) -> bool:
         """
         Delete a Commune by its ID.
 
-        This method removes a Commune from the database using its unique identifier.
+        This method issues a single DELETE statement on the Commune primary key, without loading
+        the row first.
+
+        Parameters:
+            commune_id (int): The ID of the Commune to delete.
+
+        Returns:
+            bool: True if the deletion was successful, otherwise False.
+        """
+        deleted = delete_by_pk(self.session, Commune, commune_id)
+        self.session.commit()
+        commune_cache.invalidate(commune_id)
+        commune_index.invalidate()
+        return deleted
+
+    def bulk_delete_communes(self, commune_ids: list[int]) -> int:
+        """
+        Delete several Communes by their IDs.
+
+        This method issues one DELETE ... WHERE IN statement per chunk and commits the transaction.
+        IDs that do not exist are ignored.
+
+        Parameters:
+            commune_ids (list[int]): The IDs of the Communes to delete.
+
+        Returns:
+            int: The number of deleted Communes.
+        """
+        deleted = delete_by_pks(self.session, Commune, commune_ids)
+        self.session.commit()
+        commune_cache.invalidate(*commune_ids)
+        commune_index.invalidate()
+        return deleted
+
+
+class AsyncCommuneRepository:
+    """
+    Asynchronous counterpart of CommuneRepository.
+
+    Provides the same CRUD operations on the Commune model as coroutines running on an
+    AsyncSession, so that endpoints do not hold a threadpool thread while waiting
+    on the database.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session used for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_commune(self, commune: Commune) -> Commune:
+        """
+        Create a new Commune.
+
+        Parameters:
+            commune (Commune): The Commune instance to be created.
+
+        Returns:
+            Commune: The created Commune instance with its ID populated.
+        """
+        self.session.add(commune)
+        await self.session.commit()
+        await self.session.refresh(commune)
+        commune_cache.set(commune.commune_id, row_values(commune))
+        commune_index.invalidate()
+        return commune
+
+    async def bulk_create_communes(self, communes: list[dict]) -> list:
+        """
+        Create several Communes at once, with one multi-row INSERT per chunk.
+
+        Parameters:
+            communes (list[dict]): The column values of each Commune, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Communes, in input order.
+        """
+        ids = await self.session.run_sync(insert_many, Commune, communes)
+        await self.session.commit()
+        commune_index.invalidate()
+        return ids
+
+    async def upsert_communes(self, communes: list[dict]) -> tuple[int, int]:
+        """
+        Insert or update several Communes at once, identified by commune_codepostal and commune_ville.
+
+        Parameters:
+            communes (list[dict]): The column values of each Commune, sharing the same keys.
+
+        Returns:
+            tuple[int, int]: The number of inserted and of updated Communes.
+
+        Raises:
+            ValueError: If a Commune has an empty natural key.
+        """
+        counts = await self.session.run_sync(upsert_many, Commune, communes, ["commune_codepostal", "commune_ville"])
+        await self.session.commit()
+        commune_cache.clear()
+        commune_index.invalidate()
+        return counts
+
+    async def get_commune(self, commune_id: int) -> Commune | None:
+        """
+        Retrieve a Commune by its ID.
+
+        Parameters:
+            commune_id (int): The ID of the Commune to retrieve.
+
+        Returns:
+            Commune | None: The Commune instance if found, otherwise None.
+        """
+        values = commune_cache.get(commune_id)
+        if values is not None:
+            return await self.session.merge(cached_instance(Commune, values), load=False)
+        generation = commune_cache.generation
+        statement = select(Commune).where(Commune.commune_id == commune_id)
+        commune = (await self.session.exec(statement)).one_or_none()
+        if commune and fills_cache(self.session):
+            commune_cache.set(commune_id, row_values(commune), generation)
+        return commune
+
+    async def get_all_communes(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
+        """
+        Retrieve all Communes.
+
+        Parameters:
+            limit (int) : an integer to specify the maximum number of results.
+            offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
+
+        Returns:
+            list[dict]: The column values of each Commune, in ID order.
+        """
+        return await self.session.run_sync(select_page, Commune, limit, offset, after)
+
+    async def autocomplete_communes(self, query: str, limit: int = 10) -> list[dict]:
+        """
+        Find Communes by postal code or city name prefix, from the in-memory index.
+
+        Parameters:
+            query (str): The start of a postal code ("591") or of a city name ("wervicq s").
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[dict]: The column values of each matching Commune, by postal code or city name.
+        """
+        if commune_index.stale:
+            await self.session.run_sync(refresh_commune_index)
+        return _autocomplete(query, limit)
+
+    async def update_commune(self, commune_id: int, commune_update: dict) -> Commune | None:
+        """
+        Update an existing Commune.
+
+        Parameters:
+            commune_id (int): The ID of the Commune to update.
+            commune_update (dict): The dictionary instance containing updated values.
+
+        Returns:
+            Commune | None: The updated Commune instance if found, otherwise None.
+        """
+        updated_commune = await self.session.run_sync(update_by_pk, Commune, commune_id, commune_update)
+        await self.session.commit()
+        commune_cache.invalidate(commune_id)
+        commune_index.invalidate()
+        return updated_commune
+
+    async def delete_commune(self, commune_id: int) -> bool:
+        """
+        Delete a Commune by its ID.
 
         Parameters:
             commune_id (int): The ID of the Commune to delete.
@@ -118,9 +402,24 @@ class CommuneRepository:
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        existing_commune = self.get_commune(commune_id)
-        if existing_commune:
-            self.session.delete(existing_commune)
-            self.session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = await self.session.run_sync(delete_by_pk, Commune, commune_id)
+        await self.session.commit()
+        commune_cache.invalidate(commune_id)
+        commune_index.invalidate()
+        return deleted
+
+    async def bulk_delete_communes(self, commune_ids: list[int]) -> int:
+        """
+        Delete several Communes by their IDs, with one DELETE ... WHERE IN statement per chunk.
+
+        Parameters:
+            commune_ids (list[int]): The IDs of the Communes to delete.
+
+        Returns:
+            int: The number of deleted Communes.
+        """
+        deleted = await self.session.run_sync(delete_by_pks, Commune, commune_ids)
+        await self.session.commit()
+        commune_cache.invalidate(*commune_ids)
+        commune_index.invalidate()
+        return deleted
@@ -1,5 +1,12 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..models import Departement
+from ..cache import cache_for, cached_instance, fills_cache, row_values
+from .statements import select_page, update_by_pk, delete_by_pk, delete_by_pks
+from .bulk import insert_many, upsert_many
+
+# Point lookups cache, kept consistent by the write methods below
+departement_cache = cache_for(Departement)
 
 class DepartementRepository:
     """
@@ -16,12 +23,21 @@ class DepartementRepository:
         create_departement(departement: Departement) -> Departement:
             Adds a new Departement to the database and returns the created instance.
 
+        bulk_create_departements(departements: list[dict]) -> list:
+            Inserts several Departements with multi-row INSERTs and returns their IDs.
+
+        upsert_departements(departements: list[dict]) -> tuple[int, int]:
+            Inserts or updates several Departements by natural key and returns the inserted and updated counts.
+
         get_departement(departement_code: int) -> Departement | None:
             Retrieves a Departement by its ID. Returns None if not found.
 
-        get_all_departement(limit: int | None = None, offset: int | None = None) -> List[Departement]:
+        get_all_departement(limit: int | None = None, offset: int | None = None, after: str | None = None) -> list[dict]:
             Fetches all Departement records from the database.
 
+        get_departement_codes() -> set[str]:
+            Fetches the codes of all Departements, without loading the records.
+
         update_departement(departement_code: int, departement_update: dict) -> Departement | None:
             Updates an existing Departement with new values. Returns the updated instance
             or None if the Departement was not found.
@@ -29,6 +45,9 @@ class DepartementRepository:
         delete_departement(departement_code: int) -> bool:
             Deletes a Departement by its ID. Returns True if the deletion was successful,
             or False if the Departement was not found.
+
+        bulk_delete_departements(departement_codes: list[str]) -> int:
+            Deletes several Departements by their IDs and returns the number of deleted rows.
     """      
     def __init__(self, session: Session):
         self.session = session
@@ -48,13 +67,51 @@ class DepartementRepository:
         self.session.add(departement)
         self.session.commit()
         self.session.refresh(departement)
+        departement_cache.set(departement.departement_code, row_values(departement))
         return departement
 
+    def bulk_create_departements(self, departements: list[dict]) -> list:
+        """
+        Create several Departements at once.
+
+        This method inserts the rows with one multi-row INSERT per chunk and commits the transaction.
+
+        Parameters:
+            departements (list[dict]): The column values of each Departement, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Departements, in input order.
+        """
+        ids = insert_many(self.session, Departement, departements)
+        self.session.commit()
+        return ids
+
+    def upsert_departements(self, departements: list[dict]) -> tuple[int, int]:
+        """
+        Insert or update several Departements at once, identified by departement_code.
+
+        This method relies on the dialect's native upsert and commits the transaction.
+
+        Parameters:
+            departements (list[dict]): The column values of each Departement, sharing the same keys.
+
+        Returns:
+            tuple[int, int]: The number of inserted and of updated Departements.
+
+        Raises:
+            ValueError: If a Departement has an empty natural key.
+        """
+        counts = upsert_many(self.session, Departement, departements, ["departement_code"])
+        self.session.commit()
+        departement_cache.invalidate(*(row.get("departement_code") for row in departements))
+        return counts
+
     def get_departement(self, departement_code: int) -> Departement | None:
         """
         Retrieve a Departement by its ID.
 
-        This method fetches a Departement from the database using its unique identifier.
+        This method fetches a Departement from the database using its unique identifier, going through
+        the in-process cache of Departement rows first.
 
         Parameters:
             departement_code (int): The ID of the Departement to retrieve.
@@ -62,10 +119,17 @@ class DepartementRepository:
         Returns:
             Departement | None: The Departement instance if found, otherwise None.
         """
+        values = departement_cache.get(departement_code)
+        if values is not None:
+            return self.session.merge(cached_instance(Departement, values), load=False)
+        generation = departement_cache.generation
         statement = select(Departement).where(Departement.departement_code == departement_code)
-        return self.session.exec(statement).one_or_none()
+        departement = self.session.exec(statement).one_or_none()
+        if departement and fills_cache(self.session):
+            departement_cache.set(departement_code, row_values(departement), generation)
+        return departement
 
-    def get_all_departement(self, limit: int | None = None, offset: int | None = None) -> list[Departement]:
+    def get_all_departement(self, limit: int | None = None, offset: int | None = None, after: str | None = None) -> list[dict]:
         """
         Retrieve all Departements.
 
@@ -74,20 +138,32 @@ class DepartementRepository:
         Parameters:
             limit (int) : an integer to specify the maximum number of results.
             offset (int) : an integer to specify the number of lines to ignore.
+            after (str) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
 
         Returns:
-            List[Departement]: A list of all Departement instances in the database.
+            list[dict]: The column values of each Departement, in departement code order.
         """
     
-        statement = select(Departement).limit(limit).offset(offset)
-        return list(self.session.exec(statement).all())
+        return select_page(self.session, Departement, limit, offset, after)
+
+    def get_departement_codes(self) -> set[str]:
+        """
+        Retrieve the codes of all Departements.
+
+        This method selects the primary key column only, so that the codes can be
+        kept in memory to resolve foreign keys without loading the Departements.
+
+        Returns:
+            set[str]: The codes of all Departements.
+        """
+        return set(self.session.exec(select(Departement.departement_code)).all())
 
     def update_departement(self, departement_code: int, departement_update: dict) -> Departement | None:
         """
         Update an existing Departement.
 
-        This method updates the fields of an existing Departement in the database
-        with the values from the provided Departement instance.
+        This method issues a single UPDATE statement on the Departement primary key, reading the
+        updated row back with RETURNING when the database supports it.
 
         Parameters:
             departement_code (int): The ID of the Departement to update.
@@ -96,20 +172,17 @@ class DepartementRepository:
         Returns:
             Departement | None: The updated Departement instance if found, otherwise None.
         """
-        existing_departement = self.get_departement(departement_code)
-        if existing_departement:
-            existing_departement.sqlmodel_update(departement_update)
-            self.session.add(existing_departement)
-            self.session.commit()
-            self.session.refresh(existing_departement)
-            return existing_departement
-        return None
+        updated_departement = update_by_pk(self.session, Departement, departement_code, departement_update)
+        self.session.commit()
+        departement_cache.invalidate(departement_code)
+        return updated_departement
 
     def delete_departement(self, departement_code: int) -> bool:
         """
         Delete a Departement by its ID.
 
-        This method removes a Departement from the database using its unique identifier.
+        This method issues a single DELETE statement on the Departement primary key, without loading
+        the row first.
 
         Parameters:
             departement_code (int): The ID of the Departement to delete.
@@ -117,9 +190,178 @@ class DepartementRepository:
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        existing_departement = self.get_departement(departement_code)
-        if existing_departement:
-            self.session.delete(existing_departement)
-            self.session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = delete_by_pk(self.session, Departement, departement_code)
+        self.session.commit()
+        departement_cache.invalidate(departement_code)
+        return deleted
+
+    def bulk_delete_departements(self, departement_codes: list[str]) -> int:
+        """
+        Delete several Departements by their IDs.
+
+        This method issues one DELETE ... WHERE IN statement per chunk and commits the transaction.
+        IDs that do not exist are ignored.
+
+        Parameters:
+            departement_codes (list[str]): The IDs of the Departements to delete.
+
+        Returns:
+            int: The number of deleted Departements.
+        """
+        deleted = delete_by_pks(self.session, Departement, departement_codes)
+        self.session.commit()
+        departement_cache.invalidate(*departement_codes)
+        return deleted
+
+
+class AsyncDepartementRepository:
+    """
+    Asynchronous counterpart of DepartementRepository.
+
+    Provides the same CRUD operations on the Departement model as coroutines running on an
+    AsyncSession, so that endpoints do not hold a threadpool thread while waiting
+    on the database.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session used for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_departement(self, departement: Departement) -> Departement:
+        """
+        Create a new Departement.
+
+        Parameters:
+            departement (Departement): The Departement instance to be created.
+
+        Returns:
+            Departement: The created Departement instance with its ID populated.
+        """
+        self.session.add(departement)
+        await self.session.commit()
+        await self.session.refresh(departement)
+        departement_cache.set(departement.departement_code, row_values(departement))
+        return departement
+
+    async def bulk_create_departements(self, departements: list[dict]) -> list:
+        """
+        Create several Departements at once, with one multi-row INSERT per chunk.
+
+        Parameters:
+            departements (list[dict]): The column values of each Departement, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Departements, in input order.
+        """
+        ids = await self.session.run_sync(insert_many, Departement, departements)
+        await self.session.commit()
+        return ids
+
+    async def upsert_departements(self, departements: list[dict]) -> tuple[int, int]:
+        """
+        Insert or update several Departements at once, identified by departement_code.
+
+        Parameters:
+            departements (list[dict]): The column values of each Departement, sharing the same keys.
+
+        Returns:
+            tuple[int, int]: The number of inserted and of updated Departements.
+
+        Raises:
+            ValueError: If a Departement has an empty natural key.
+        """
+        counts = await self.session.run_sync(upsert_many, Departement, departements, ["departement_code"])
+        await self.session.commit()
+        departement_cache.invalidate(*(row.get("departement_code") for row in departements))
+        return counts
+
+    async def get_departement(self, departement_code: int) -> Departement | None:
+        """
+        Retrieve a Departement by its ID.
+
+        Parameters:
+            departement_code (int): The ID of the Departement to retrieve.
+
+        Returns:
+            Departement | None: The Departement instance if found, otherwise None.
+        """
+        values = departement_cache.get(departement_code)
+        if values is not None:
+            return await self.session.merge(cached_instance(Departement, values), load=False)
+        generation = departement_cache.generation
+        statement = select(Departement).where(Departement.departement_code == departement_code)
+        departement = (await self.session.exec(statement)).one_or_none()
+        if departement and fills_cache(self.session):
+            departement_cache.set(departement_code, row_values(departement), generation)
+        return departement
+
+    async def get_all_departement(self, limit: int | None = None, offset: int | None = None, after: str | None = None) -> list[dict]:
+        """
+        Retrieve all Departements.
+
+        Parameters:
+            limit (int) : an integer to specify the maximum number of results.
+            offset (int) : an integer to specify the number of lines to ignore.
+            after (str) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
+
+        Returns:
+            list[dict]: The column values of each Departement, in departement code order.
+        """
+        return await self.session.run_sync(select_page, Departement, limit, offset, after)
+
+    async def get_departement_codes(self) -> set[str]:
+        """
+        Retrieve the codes of all Departements, selecting the primary key column only.
+
+        Returns:
+            set[str]: The codes of all Departements.
+        """
+        return set((await self.session.exec(select(Departement.departement_code))).all())
+
+    async def update_departement(self, departement_code: int, departement_update: dict) -> Departement | None:
+        """
+        Update an existing Departement.
+
+        Parameters:
+            departement_code (int): The ID of the Departement to update.
+            departement_update (dict): The dictionary instance containing updated values.
+
+        Returns:
+            Departement | None: The updated Departement instance if found, otherwise None.
+        """
+        updated_departement = await self.session.run_sync(update_by_pk, Departement, departement_code, departement_update)
+        await self.session.commit()
+        departement_cache.invalidate(departement_code)
+        return updated_departement
+
+    async def delete_departement(self, departement_code: int) -> bool:
+        """
+        Delete a Departement by its ID.
+
+        Parameters:
+            departement_code (int): The ID of the Departement to delete.
+
+        Returns:
+            bool: True if the deletion was successful, otherwise False.
+        """
+        deleted = await self.session.run_sync(delete_by_pk, Departement, departement_code)
+        await self.session.commit()
+        departement_cache.invalidate(departement_code)
+        return deleted
+
+    async def bulk_delete_departements(self, departement_codes: list[str]) -> int:
+        """
+        Delete several Departements by their IDs, with one DELETE ... WHERE IN statement per chunk.
+
+        Parameters:
+            departement_codes (list[str]): The IDs of the Departements to delete.
+
+        Returns:
+            int: The number of deleted Departements.
+        """
+        deleted = await self.session.run_sync(delete_by_pks, Departement, departement_codes)
+        await self.session.commit()
+        departement_cache.invalidate(*departement_codes)
+        return deleted
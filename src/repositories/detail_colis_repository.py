@@ -1,5 +1,8 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..models import DetailColis
+from .statements import select_page, update_by_pk, delete_by_pk, delete_by_pks
+from .bulk import insert_many
 
 class DetailColisRepository:
     """
@@ -16,10 +19,13 @@ class DetailColisRepository:
         create_detail_colis(detail_colis: DetailColis) -> DetailColis:
             Adds a new DetailColis to the database and returns the created instance.
 
+        bulk_create_detail_colis(detail_colis: list[dict]) -> list:
+            Inserts several DetailColiss with multi-row INSERTs and returns their IDs.
+
         get_detail_colis(detail_colis_id: int) -> DetailColis | None:
             Retrieves a DetailColis by its ID. Returns None if not found.
 
-        get_all_detail_colis(imit: int | None = None, offset: int | None = None) -> List[DetailColis]:
+        get_all_detail_colis(limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
             Fetches all DetailColis records from the database.
 
         update_detail_colis(ddetail_colis_id: int, detail_colis_update: dict) -> DetailColis | None:
@@ -29,6 +35,9 @@ class DetailColisRepository:
         delete_detail_colis(detail_colis_id: int) -> bool:
             Deletes a DetailColis by its ID. Returns True if the deletion was successful,
             or False if the DetailColis was not found.
+
+        bulk_delete_detail_colis(detail_colis_ids: list[int]) -> int:
+            Deletes several DetailColiss by their IDs and returns the number of deleted rows.
     """
         
     def __init__(self, session: Session):
@@ -51,6 +60,22 @@ class DetailColisRepository:
         self.session.refresh(detail_colis)
         return detail_colis
 
+    def bulk_create_detail_colis(self, detail_colis: list[dict]) -> list:
+        """
+        Create several DetailColiss at once.
+
+        This method inserts the rows with one multi-row INSERT per chunk and commits the transaction.
+
+        Parameters:
+            detail_colis (list[dict]): The column values of each DetailColis, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created DetailColiss, in input order.
+        """
+        ids = insert_many(self.session, DetailColis, detail_colis)
+        self.session.commit()
+        return ids
+
     def get_detail_colis(self, detail_colis_id: int) -> DetailColis | None:
         """
         Retrieve a DetailColis by its ID.
@@ -66,7 +91,7 @@ class DetailColisRepository:
         statement = select(DetailColis).where(DetailColis.detail_colis_id == detail_colis_id)
         return self.session.exec(statement).one_or_none()
 
-    def get_all_detail_colis(self, limit: int | None = None, offset: int | None = None) -> list[DetailColis]:
+    def get_all_detail_colis(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
         """
         Retrieve all DetailColiss.
 
@@ -75,20 +100,20 @@ class DetailColisRepository:
         Parameters:
             limit (int) : an integer to specify the maximum number of results.
             offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
 
 
         Returns:
-            List[DetailColis]: A list of all DetailColis instances in the database.
+            list[dict]: The column values of each DetailColis, in ID order.
         """
-        statement = select(DetailColis).limit(limit).offset(offset)
-        return list(self.session.exec(statement).all())
+        return select_page(self.session, DetailColis, limit, offset, after)
 
     def update_detail_colis(self, detail_colis_id: int, detail_colis_update: dict) -> DetailColis | None:
         """
         Update an existing DetailColis.
 
-        This method updates the fields of an existing DetailColis in the database
-        with the values from the provided DetailColis instance.
+        This method issues a single UPDATE statement on the DetailColis primary key, reading the
+        updated row back with RETURNING when the database supports it.
 
         Parameters:
             detail_colis_id (int): The ID of the DetailColis to update.
@@ -98,20 +123,16 @@ class DetailColisRepository:
             DetailColis | None: The updated DetailColis instance if found, otherwise None.
         """
 
-        existing_detail_colis = self.get_detail_colis(detail_colis_id)
-        if existing_detail_colis:
-            existing_detail_colis.sqlmodel_update(detail_colis_update)
-            self.session.add(existing_detail_colis)
-            self.session.commit()
-            self.session.refresh(existing_detail_colis)
-            return existing_detail_colis
-        return None
+        updated_detail_colis = update_by_pk(self.session, DetailColis, detail_colis_id, detail_colis_update)
+        self.session.commit()
+        return updated_detail_colis
 
     def delete_detail_colis(self, detail_colis_id: int) -> bool:
         """
         Delete a DetailColis by its ID.
 
-        This method removes a DetailColis from the database using its unique identifier.
+        This method issues a single DELETE statement on the DetailColis primary key, without loading
+        the row first.
 
         Parameters:
             detail_colis_id (int): The ID of the DetailColis to delete.
@@ -119,9 +140,138 @@ class DetailColisRepository:
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        existing_detail_colis = self.get_detail_colis(detail_colis_id)
-        if existing_detail_colis:
-            self.session.delete(existing_detail_colis)
-            self.session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = delete_by_pk(self.session, DetailColis, detail_colis_id)
+        self.session.commit()
+        return deleted
+
+    def bulk_delete_detail_colis(self, detail_colis_ids: list[int]) -> int:
+        """
+        Delete several DetailColiss by their IDs.
+
+        This method issues one DELETE ... WHERE IN statement per chunk and commits the transaction.
+        IDs that do not exist are ignored.
+
+        Parameters:
+            detail_colis_ids (list[int]): The IDs of the DetailColiss to delete.
+
+        Returns:
+            int: The number of deleted DetailColiss.
+        """
+        deleted = delete_by_pks(self.session, DetailColis, detail_colis_ids)
+        self.session.commit()
+        return deleted
+
+
+class AsyncDetailColisRepository:
+    """
+    Asynchronous counterpart of DetailColisRepository.
+
+    Provides the same CRUD operations on the DetailColis model as coroutines running on an
+    AsyncSession, so that endpoints do not hold a threadpool thread while waiting
+    on the database.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session used for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_detail_colis(self, detail_colis: DetailColis) -> DetailColis:
+        """
+        Create a new DetailColis.
+
+        Parameters:
+            detail_colis (DetailColis): The DetailColis instance to be created.
+
+        Returns:
+            DetailColis: The created DetailColis instance with its ID populated.
+        """
+        self.session.add(detail_colis)
+        await self.session.commit()
+        await self.session.refresh(detail_colis)
+        return detail_colis
+
+    async def bulk_create_detail_colis(self, detail_colis: list[dict]) -> list:
+        """
+        Create several DetailColiss at once, with one multi-row INSERT per chunk.
+
+        Parameters:
+            detail_colis (list[dict]): The column values of each DetailColis, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created DetailColiss, in input order.
+        """
+        ids = await self.session.run_sync(insert_many, DetailColis, detail_colis)
+        await self.session.commit()
+        return ids
+
+    async def get_detail_colis(self, detail_colis_id: int) -> DetailColis | None:
+        """
+        Retrieve a DetailColis by its ID.
+
+        Parameters:
+            detail_colis_id (int): The ID of the DetailColis to retrieve.
+
+        Returns:
+            DetailColis | None: The DetailColis instance if found, otherwise None.
+        """
+        statement = select(DetailColis).where(DetailColis.detail_colis_id == detail_colis_id)
+        return (await self.session.exec(statement)).one_or_none()
+
+    async def get_all_detail_colis(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
+        """
+        Retrieve all DetailColiss.
+
+        Parameters:
+            limit (int) : an integer to specify the maximum number of results.
+            offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
+
+        Returns:
+            list[dict]: The column values of each DetailColis, in ID order.
+        """
+        return await self.session.run_sync(select_page, DetailColis, limit, offset, after)
+
+    async def update_detail_colis(self, detail_colis_id: int, detail_colis_update: dict) -> DetailColis | None:
+        """
+        Update an existing DetailColis.
+
+        Parameters:
+            detail_colis_id (int): The ID of the DetailColis to update.
+            detail_colis_update (dict): The dictionary instance containing updated values.
+
+        Returns:
+            DetailColis | None: The updated DetailColis instance if found, otherwise None.
+        """
+        updated_detail_colis = await self.session.run_sync(update_by_pk, DetailColis, detail_colis_id, detail_colis_update)
+        await self.session.commit()
+        return updated_detail_colis
+
+    async def delete_detail_colis(self, detail_colis_id: int) -> bool:
+        """
+        Delete a DetailColis by its ID.
+
+        Parameters:
+            detail_colis_id (int): The ID of the DetailColis to delete.
+
+        Returns:
+            bool: True if the deletion was successful, otherwise False.
+        """
+        deleted = await self.session.run_sync(delete_by_pk, DetailColis, detail_colis_id)
+        await self.session.commit()
+        return deleted
+
+    async def bulk_delete_detail_colis(self, detail_colis_ids: list[int]) -> int:
+        """
+        Delete several DetailColiss by their IDs, with one DELETE ... WHERE IN statement per chunk.
+
+        Parameters:
+            detail_colis_ids (list[int]): The IDs of the DetailColiss to delete.
+
+        Returns:
+            int: The number of deleted DetailColiss.
+        """
+        deleted = await self.session.run_sync(delete_by_pks, DetailColis, detail_colis_ids)
+        await self.session.commit()
+        return deleted
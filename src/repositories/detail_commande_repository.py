@@ -1,5 +1,8 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..models import DetailCommande
+from .statements import select_page, update_by_pk, delete_by_pk, delete_by_pks
+from .bulk import insert_many
 
 class DetailCommandeRepository:
     """
@@ -16,10 +19,13 @@ class DetailCommandeRepository:
         create_detail_commande(detail_commande: DetailCommande) -> DetailCommande:
             Adds a new DetailCommande to the database and returns the created instance.
 
+        bulk_create_detail_commandes(detail_commandes: list[dict]) -> list:
+            Inserts several DetailCommandes with multi-row INSERTs and returns their IDs.
+
         get_detail_commande(detail_commande_id: int) -> DetailCommande | None:
             Retrieves a DetailCommande by its ID. Returns None if not found.
 
-        get_all_detail_commandes(limit: int | None = None, offset: int | None = None) -> List[DetailCommande]:
+        get_all_detail_commandes(limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
             Fetches all DetailCommande records from the database.
 
         update_detail_commande(detail_commande_id: int, detail_commande_update: dict) -> DetailCommande | None:
@@ -29,6 +35,9 @@ class DetailCommandeRepository:
         delete_detail_commande(detail_commande_id: int) -> bool:
             Deletes a DetailCommande by its ID. Returns True if the deletion was successful,
             or False if the DetailCommande was not found.
+
+        bulk_delete_detail_commandes(detail_commande_ids: list[int]) -> int:
+            Deletes several DetailCommandes by their IDs and returns the number of deleted rows.
     """
         
     def __init__(self, session: Session):
@@ -51,6 +60,22 @@ class DetailCommandeRepository:
         self.session.refresh(detail_commande)
         return detail_commande
 
+    def bulk_create_detail_commandes(self, detail_commandes: list[dict]) -> list:
+        """
+        Create several DetailCommandes at once.
+
+        This method inserts the rows with one multi-row INSERT per chunk and commits the transaction.
+
+        Parameters:
+            detail_commandes (list[dict]): The column values of each DetailCommande, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created DetailCommandes, in input order.
+        """
+        ids = insert_many(self.session, DetailCommande, detail_commandes)
+        self.session.commit()
+        return ids
+
     def get_detail_commande(self, detail_commande_id: int) -> DetailCommande | None:
         """
         Retrieve a DetailCommande by its ID.
@@ -66,7 +91,7 @@ class DetailCommandeRepository:
         statement = select(DetailCommande).where(DetailCommande.detail_commande_id == detail_commande_id)
         return self.session.exec(statement).one_or_none()
 
-    def get_all_detail_commandes(self, limit: int | None = None, offset: int | None = None) -> list[DetailCommande]:
+    def get_all_detail_commandes(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
         """
         Retrieve all DetailCommandes.
 
@@ -75,19 +100,19 @@ class DetailCommandeRepository:
         Parameters:
             limit (int) : an integer to specify the maximum number of results.
             offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
 
         Returns:
-            List[DetailCommande]: A list of all DetailCommande instances in the database.
+            list[dict]: The column values of each DetailCommande, in ID order.
         """
-        statement = select(DetailCommande).limit(limit).offset(offset)
-        return list(self.session.exec(statement).all())
+        return select_page(self.session, DetailCommande, limit, offset, after)
 
     def update_detail_commande(self, detail_commande_id: int, detail_commande_update: dict) -> DetailCommande | None:
         """
         Update an existing DetailCommande.
 
-        This method updates the fields of an existing DetailCommande in the database
-        with the values from the provided DetailCommande instance.
+        This method issues a single UPDATE statement on the DetailCommande primary key, reading the
+        updated row back with RETURNING when the database supports it.
 
         Parameters:
             detail_commande_id (int): The ID of the DetailCommande to update.
@@ -97,20 +122,16 @@ class DetailCommandeRepository:
             DetailCommande | None: The updated DetailCommande instance if found, otherwise None.
         """
 
-        existing_detail_commande = self.get_detail_commande(detail_commande_id)
-        if existing_detail_commande:
-            existing_detail_commande.sqlmodel_update(detail_commande_update)
-            self.session.add(existing_detail_commande)
-            self.session.commit()
-            self.session.refresh(existing_detail_commande)
-            return existing_detail_commande
-        return None
+        updated_detail_commande = update_by_pk(self.session, DetailCommande, detail_commande_id, detail_commande_update)
+        self.session.commit()
+        return updated_detail_commande
 
     def delete_detail_commande(self, detail_commande_id: int) -> bool:
         """
         Delete a DetailCommande by its ID.
 
-        This method removes a DetailCommande from the database using its unique identifier.
+        This method issues a single DELETE statement on the DetailCommande primary key, without loading
+        the row first.
 
         Parameters:
             detail_commande_id (int): The ID of the DetailCommande to delete.
@@ -118,9 +139,138 @@ class DetailCommandeRepository:
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        existing_detail_commande = self.get_detail_commande(detail_commande_id)
-        if existing_detail_commande:
-            self.session.delete(existing_detail_commande)
-            self.session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = delete_by_pk(self.session, DetailCommande, detail_commande_id)
+        self.session.commit()
+        return deleted
+
+    def bulk_delete_detail_commandes(self, detail_commande_ids: list[int]) -> int:
+        """
+        Delete several DetailCommandes by their IDs.
+
+        This method issues one DELETE ... WHERE IN statement per chunk and commits the transaction.
+        IDs that do not exist are ignored.
+
+        Parameters:
+            detail_commande_ids (list[int]): The IDs of the DetailCommandes to delete.
+
+        Returns:
+            int: The number of deleted DetailCommandes.
+        """
+        deleted = delete_by_pks(self.session, DetailCommande, detail_commande_ids)
+        self.session.commit()
+        return deleted
+
+
+class AsyncDetailCommandeRepository:
+    """
+    Asynchronous counterpart of DetailCommandeRepository.
+
+    Provides the same CRUD operations on the DetailCommande model as coroutines running on an
+    AsyncSession, so that endpoints do not hold a threadpool thread while waiting
+    on the database.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session used for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_detail_commande(self, detail_commande: DetailCommande) -> DetailCommande:
+        """
+        Create a new DetailCommande.
+
+        Parameters:
+            detail_commande (DetailCommande): The DetailCommande instance to be created.
+
+        Returns:
+            DetailCommande: The created DetailCommande instance with its ID populated.
+        """
+        self.session.add(detail_commande)
+        await self.session.commit()
+        await self.session.refresh(detail_commande)
+        return detail_commande
+
+    async def bulk_create_detail_commandes(self, detail_commandes: list[dict]) -> list:
+        """
+        Create several DetailCommandes at once, with one multi-row INSERT per chunk.
+
+        Parameters:
+            detail_commandes (list[dict]): The column values of each DetailCommande, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created DetailCommandes, in input order.
+        """
+        ids = await self.session.run_sync(insert_many, DetailCommande, detail_commandes)
+        await self.session.commit()
+        return ids
+
+    async def get_detail_commande(self, detail_commande_id: int) -> DetailCommande | None:
+        """
+        Retrieve a DetailCommande by its ID.
+
+        Parameters:
+            detail_commande_id (int): The ID of the DetailCommande to retrieve.
+
+        Returns:
+            DetailCommande | None: The DetailCommande instance if found, otherwise None.
+        """
+        statement = select(DetailCommande).where(DetailCommande.detail_commande_id == detail_commande_id)
+        return (await self.session.exec(statement)).one_or_none()
+
+    async def get_all_detail_commandes(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
+        """
+        Retrieve all DetailCommandes.
+
+        Parameters:
+            limit (int) : an integer to specify the maximum number of results.
+            offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
+
+        Returns:
+            list[dict]: The column values of each DetailCommande, in ID order.
+        """
+        return await self.session.run_sync(select_page, DetailCommande, limit, offset, after)
+
+    async def update_detail_commande(self, detail_commande_id: int, detail_commande_update: dict) -> DetailCommande | None:
+        """
+        Update an existing DetailCommande.
+
+        Parameters:
+            detail_commande_id (int): The ID of the DetailCommande to update.
+            detail_commande_update (dict): The dictionary instance containing updated values.
+
+        Returns:
+            DetailCommande | None: The updated DetailCommande instance if found, otherwise None.
+        """
+        updated_detail_commande = await self.session.run_sync(update_by_pk, DetailCommande, detail_commande_id, detail_commande_update)
+        await self.session.commit()
+        return updated_detail_commande
+
+    async def delete_detail_commande(self, detail_commande_id: int) -> bool:
+        """
+        Delete a DetailCommande by its ID.
+
+        Parameters:
+            detail_commande_id (int): The ID of the DetailCommande to delete.
+
+        Returns:
+            bool: True if the deletion was successful, otherwise False.
+        """
+        deleted = await self.session.run_sync(delete_by_pk, DetailCommande, detail_commande_id)
+        await self.session.commit()
+        return deleted
+
+    async def bulk_delete_detail_commandes(self, detail_commande_ids: list[int]) -> int:
+        """
+        Delete several DetailCommandes by their IDs, with one DELETE ... WHERE IN statement per chunk.
+
+        Parameters:
+            detail_commande_ids (list[int]): The IDs of the DetailCommandes to delete.
+
+        Returns:
+            int: The number of deleted DetailCommandes.
+        """
+        deleted = await self.session.run_sync(delete_by_pks, DetailCommande, detail_commande_ids)
+        await self.session.commit()
+        return deleted
@@ -1,5 +1,12 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..models import Objet
+from ..cache import cache_for, cached_instance, fills_cache, row_values
+from .statements import select_page, update_by_pk, delete_by_pk, delete_by_pks
+from .bulk import insert_many, upsert_many
+
+# Point lookups cache, kept consistent by the write methods below
+objet_cache = cache_for(Objet)
 
 class ObjetRepository:
     """
@@ -16,10 +23,16 @@ class ObjetRepository:
         create_objet(objet: Objet) -> Objet:
             Adds a new Objet to the database and returns the created instance.
 
+        bulk_create_objets(objets: list[dict]) -> list:
+            Inserts several Objets with multi-row INSERTs and returns their IDs.
+
+        upsert_objets(objets: list[dict]) -> tuple[int, int]:
+            Inserts or updates several Objets by natural key and returns the inserted and updated counts.
+
         get_objet(objet_id: int) -> Objet | None:
             Retrieves a Objet by its ID. Returns None if not found.
 
-        get_all_objets(limit: int | None = None, offset: int | None = Non) -> List[Objet]:
+        get_all_objets(limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
             Fetches all Objet records from the database.
 
         update_objet(objet_id: int, objet_update: dict) -> Objet | None:
@@ -29,6 +42,9 @@ class ObjetRepository:
         delete_objet(objet_id: int) -> bool:
             Deletes a Objet by its ID. Returns True if the deletion was successful,
             or False if the Objet was not found.
+
+        bulk_delete_objets(objet_ids: list[int]) -> int:
+            Deletes several Objets by their IDs and returns the number of deleted rows.
     """
         
     def __init__(self, session: Session):
@@ -49,13 +65,51 @@ class ObjetRepository:
         self.session.add(objet)
         self.session.commit()
         self.session.refresh(objet)
+        objet_cache.set(objet.objet_id, row_values(objet))
         return objet
 
+    def bulk_create_objets(self, objets: list[dict]) -> list:
+        """
+        Create several Objets at once.
+
+        This method inserts the rows with one multi-row INSERT per chunk and commits the transaction.
+
+        Parameters:
+            objets (list[dict]): The column values of each Objet, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Objets, in input order.
+        """
+        ids = insert_many(self.session, Objet, objets)
+        self.session.commit()
+        return ids
+
+    def upsert_objets(self, objets: list[dict]) -> tuple[int, int]:
+        """
+        Insert or update several Objets at once, identified by objet_id.
+
+        This method relies on the dialect's native upsert and commits the transaction.
+
+        Parameters:
+            objets (list[dict]): The column values of each Objet, sharing the same keys.
+
+        Returns:
+            tuple[int, int]: The number of inserted and of updated Objets.
+
+        Raises:
+            ValueError: If a Objet has an empty natural key.
+        """
+        counts = upsert_many(self.session, Objet, objets, ["objet_id"])
+        self.session.commit()
+        objet_cache.invalidate(*(row.get("objet_id") for row in objets))
+        return counts
+
     def get_objet(self, objet_id: int) -> Objet | None:
         """
         Retrieve a Objet by its ID.
 
-        This method fetches a Objet from the database using its unique identifier.
+        This method fetches a Objet from the database using its unique identifier, going through
+        the in-process cache of Objet rows first.
 
         Parameters:
             objet_id (int): The ID of the Objet to retrieve.
@@ -63,10 +117,17 @@ class ObjetRepository:
         Returns:
             Objet | None: The Objet instance if found, otherwise None.
         """
+        values = objet_cache.get(objet_id)
+        if values is not None:
+            return self.session.merge(cached_instance(Objet, values), load=False)
+        generation = objet_cache.generation
         statement = select(Objet).where(Objet.objet_id == objet_id)
-        return self.session.exec(statement).one_or_none()
+        objet = self.session.exec(statement).one_or_none()
+        if objet and fills_cache(self.session):
+            objet_cache.set(objet_id, row_values(objet), generation)
+        return objet
 
-    def get_all_objets(self, limit: int | None = None, offset: int | None = None) -> list[Objet]:
+    def get_all_objets(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
         """
         Retrieve all Objets.
 
@@ -75,19 +136,19 @@ class ObjetRepository:
         Parameters:
             limit (int) : an integer to specify the maximum number of results.
             offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
 
         Returns:
-            List[Objet]: A list of all Objet instances in the database.
+            list[dict]: The column values of each Objet, in ID order.
         """
-        statement = select(Objet).limit(limit).offset(offset)
-        return list(self.session.exec(statement).all())
+        return select_page(self.session, Objet, limit, offset, after)
 
     def update_objet(self, objet_id: int, objet_update: dict) -> Objet | None:
         """
         Update an existing Objet.
 
-        This method updates the fields of an existing Objet in the database
-        with the values from the provided Objet instance.
+        This method issues a single UPDATE statement on the Objet primary key, reading the
+        updated row back with RETURNING when the database supports it.
 
         Parameters:
             objet_id (int): The ID of the Objet to update.
@@ -97,20 +158,17 @@ class ObjetRepository:
             Objet | None: The updated Objet instance if found, otherwise None.
         """
 
-        existing_objet = self.get_objet(objet_id)
-        if existing_objet:
-            existing_objet.sqlmodel_update(objet_update)
-            self.session.add(existing_objet)
-            self.session.commit()
-            self.session.refresh(existing_objet)
-            return existing_objet
-        return None
+        updated_objet = update_by_pk(self.session, Objet, objet_id, objet_update)
+        self.session.commit()
+        objet_cache.invalidate(objet_id)
+        return updated_objet
 
     def delete_objet(self, objet_id: int) -> bool:
         """
         Delete a Objet by its ID.
 
-        This method removes a Objet from the database using its unique identifier.
+        This method issues a single DELETE statement on the Objet primary key, without loading
+        the row first.
 
         Parameters:
             objet_id (int): The ID of the Objet to delete.
@@ -118,9 +176,169 @@ class ObjetRepository:
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        existing_objet = self.get_objet(objet_id)
-        if existing_objet:
-            self.session.delete(existing_objet)
-            self.session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = delete_by_pk(self.session, Objet, objet_id)
+        self.session.commit()
+        objet_cache.invalidate(objet_id)
+        return deleted
+
+    def bulk_delete_objets(self, objet_ids: list[int]) -> int:
+        """
+        Delete several Objets by their IDs.
+
+        This method issues one DELETE ... WHERE IN statement per chunk and commits the transaction.
+        IDs that do not exist are ignored.
+
+        Parameters:
+            objet_ids (list[int]): The IDs of the Objets to delete.
+
+        Returns:
+            int: The number of deleted Objets.
+        """
+        deleted = delete_by_pks(self.session, Objet, objet_ids)
+        self.session.commit()
+        objet_cache.invalidate(*objet_ids)
+        return deleted
+
+
+class AsyncObjetRepository:
+    """
+    Asynchronous counterpart of ObjetRepository.
+
+    Provides the same CRUD operations on the Objet model as coroutines running on an
+    AsyncSession, so that endpoints do not hold a threadpool thread while waiting
+    on the database.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session used for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_objet(self, objet: Objet) -> Objet:
+        """
+        Create a new Objet.
+
+        Parameters:
+            objet (Objet): The Objet instance to be created.
+
+        Returns:
+            Objet: The created Objet instance with its ID populated.
+        """
+        self.session.add(objet)
+        await self.session.commit()
+        await self.session.refresh(objet)
+        objet_cache.set(objet.objet_id, row_values(objet))
+        return objet
+
+    async def bulk_create_objets(self, objets: list[dict]) -> list:
+        """
+        Create several Objets at once, with one multi-row INSERT per chunk.
+
+        Parameters:
+            objets (list[dict]): The column values of each Objet, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created Objets, in input order.
+        """
+        ids = await self.session.run_sync(insert_many, Objet, objets)
+        await self.session.commit()
+        return ids
+
+    async def upsert_objets(self, objets: list[dict]) -> tuple[int, int]:
+        """
+        Insert or update several Objets at once, identified by objet_id.
+
+        Parameters:
+            objets (list[dict]): The column values of each Objet, sharing the same keys.
+
+        Returns:
+            tuple[int, int]: The number of inserted and of updated Objets.
+
+        Raises:
+            ValueError: If a Objet has an empty natural key.
+        """
+        counts = await self.session.run_sync(upsert_many, Objet, objets, ["objet_id"])
+        await self.session.commit()
+        objet_cache.invalidate(*(row.get("objet_id") for row in objets))
+        return counts
+
+    async def get_objet(self, objet_id: int) -> Objet | None:
+        """
+        Retrieve a Objet by its ID.
+
+        Parameters:
+            objet_id (int): The ID of the Objet to retrieve.
+
+        Returns:
+            Objet | None: The Objet instance if found, otherwise None.
+        """
+        values = objet_cache.get(objet_id)
+        if values is not None:
+            return await self.session.merge(cached_instance(Objet, values), load=False)
+        generation = objet_cache.generation
+        statement = select(Objet).where(Objet.objet_id == objet_id)
+        objet = (await self.session.exec(statement)).one_or_none()
+        if objet and fills_cache(self.session):
+            objet_cache.set(objet_id, row_values(objet), generation)
+        return objet
+
+    async def get_all_objets(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
+        """
+        Retrieve all Objets.
+
+        Parameters:
+            limit (int) : an integer to specify the maximum number of results.
+            offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
+
+        Returns:
+            list[dict]: The column values of each Objet, in ID order.
+        """
+        return await self.session.run_sync(select_page, Objet, limit, offset, after)
+
+    async def update_objet(self, objet_id: int, objet_update: dict) -> Objet | None:
+        """
+        Update an existing Objet.
+
+        Parameters:
+            objet_id (int): The ID of the Objet to update.
+            objet_update (dict): The dictionary instance containing updated values.
+
+        Returns:
+            Objet | None: The updated Objet instance if found, otherwise None.
+        """
+        updated_objet = await self.session.run_sync(update_by_pk, Objet, objet_id, objet_update)
+        await self.session.commit()
+        objet_cache.invalidate(objet_id)
+        return updated_objet
+
+    async def delete_objet(self, objet_id: int) -> bool:
+        """
+        Delete a Objet by its ID.
+
+        Parameters:
+            objet_id (int): The ID of the Objet to delete.
+
+        Returns:
+            bool: True if the deletion was successful, otherwise False.
+        """
+        deleted = await self.session.run_sync(delete_by_pk, Objet, objet_id)
+        await self.session.commit()
+        objet_cache.invalidate(objet_id)
+        return deleted
+
+    async def bulk_delete_objets(self, objet_ids: list[int]) -> int:
+        """
+        Delete several Objets by their IDs, with one DELETE ... WHERE IN statement per chunk.
+
+        Parameters:
+            objet_ids (list[int]): The IDs of the Objets to delete.
+
+        Returns:
+            int: The number of deleted Objets.
+        """
+        deleted = await self.session.run_sync(delete_by_pks, Objet, objet_ids)
+        await self.session.commit()
+        objet_cache.invalidate(*objet_ids)
+        return deleted
@@ -0,0 +1,169 @@
+from sqlalchemy import delete, select, update
+from sqlmodel import Session, SQLModel
+from ..database import BULK_CONFIG
+
+
+def update_by_pk(session: Session, model: type[SQLModel], pk_value, values: dict):
+    """
+    Update one row of a table model with a single UPDATE ... WHERE pk = ... statement.
+
+    On dialects supporting UPDATE ... RETURNING (SQLite, MariaDB), the updated row is
+    read back by the UPDATE itself. Otherwise (MySQL), the matched row count decides
+    whether the row exists, and only then is the row loaded. Keys that are not columns
+    of the table are ignored. The transaction is left open: the caller decides when to commit.
+
+    Parameters:
+        session (Session): The SQLModel session used for database operations.
+        model (type[SQLModel]): The table model to update.
+        pk_value: The primary key of the row to update.
+        values (dict): The new column values.
+
+    Returns:
+        The updated model instance, or None if no row has this primary key.
+    """
+    table = model.__table__
+    primary_key = table.primary_key.columns.values()[0]
+    values = {column: value for column, value in values.items() if column in table.c}
+    if not values:
+        return session.get(model, pk_value)
+
+    statement = (
+        update(model)
+        .where(primary_key == pk_value)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if session.get_bind().dialect.update_returning:
+        return session.exec(statement.returning(model)).scalar_one_or_none()
+
+    if session.exec(statement).rowcount == 0:
+        return None
+    return session.get(model, pk_value, populate_existing=True)
+
+
+def public_columns(table) -> list:
+    """
+    Return the columns of a table that are exposed by the API.
+
+    Columns flagged with info={"internal": True} (such as the normalized search
+    columns of t_clients) are maintained by the application and left out of the
+    list endpoints and exports.
+
+    Parameters:
+        table: The Table of a model (model.__table__).
+
+    Returns:
+        list: The exposed columns, in table order.
+    """
+    return [column for column in table.columns if not column.info.get("internal")]
+
+
+def select_page(session: Session, model: type[SQLModel], limit: int | None = None, offset: int | None = None, after=None) -> list[dict]:
+    """
+    Read one page of a table model, ordered by primary key, as plain column dictionaries.
+
+    The exposed columns (see public_columns) are selected with a Core SELECT: no ORM
+    instance is built, tracked by the session or validated, the rows only have to be
+    serialized. The dictionary keys follow the table column order, like the fields of
+    the Read schemas.
+
+    Parameters:
+        session (Session): The SQLModel session used for database operations.
+        model (type[SQLModel]): The table model to read.
+        limit (int | None): Maximum number of rows.
+        offset (int | None): Number of rows to skip (ignored when after is given).
+        after: Primary key of the last row of the previous page, for keyset pagination.
+
+    Returns:
+        list[dict]: The column values of each row.
+    """
+    table = model.__table__
+    primary_key = table.primary_key.columns.values()[0]
+    statement = select(*public_columns(table)).order_by(primary_key)
+    if after is not None:
+        statement = statement.where(primary_key > after)
+    else:
+        statement = statement.offset(offset)
+    result = session.exec(statement.limit(limit))
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def detach_references(session: Session, model: type[SQLModel], pk_values: list) -> None:
+    """
+    Set to NULL the nullable foreign keys referencing rows of a table model, with one
+    UPDATE ... WHERE fk IN (...) per referencing column.
+
+    This is what session.delete() did through the relationships before the direct DELETE
+    statements: children of a deleted client, commande or colis are kept, detached from it.
+    NOT NULL foreign keys (a commune's departement, a variation's objet) are not touched, so
+    deleting a row they still reference fails on the database constraint.
+
+    Parameters:
+        session (Session): The SQLModel session used for database operations.
+        model (type[SQLModel]): The table model whose rows are about to be deleted.
+        pk_values (list): The primary keys of those rows.
+    """
+    table = model.__table__
+    for referencing_table in table.metadata.tables.values():
+        for foreign_key in referencing_table.foreign_keys:
+            column = foreign_key.parent
+            if column.nullable and foreign_key.references(table) and foreign_key.column.primary_key:
+                statement = update(referencing_table).where(column.in_(pk_values)).values({column.name: None})
+                session.exec(statement)
+
+
+def delete_by_pk(session: Session, model: type[SQLModel], pk_value) -> bool:
+    """
+    Delete one row of a table model with a single DELETE ... WHERE pk = ... statement.
+
+    The row is not loaded first: the matched row count tells whether it existed.
+    Nullable foreign keys referencing the row are set to NULL first, as session.delete()
+    did through the relationships; NOT NULL ones are left to the database constraints.
+    The transaction is left open: the caller decides when to commit.
+
+    Parameters:
+        session (Session): The SQLModel session used for database operations.
+        model (type[SQLModel]): The table model to delete from.
+        pk_value: The primary key of the row to delete.
+
+    Returns:
+        bool: True if a row was deleted, otherwise False.
+    """
+    primary_key = model.__table__.primary_key.columns.values()[0]
+    detach_references(session, model, [pk_value])
+    statement = delete(model).where(primary_key == pk_value).execution_options(synchronize_session=False)
+    return session.exec(statement).rowcount > 0
+
+
+def delete_by_pks(session: Session, model: type[SQLModel], pk_values: list, chunk_size: int | None = None) -> int:
+    """
+    Delete several rows of a table model with one DELETE ... WHERE pk IN (...) per chunk.
+
+    Primary keys that do not exist are ignored. Referencing foreign keys are handled as in
+    delete_by_pk. The transaction is left open: the caller decides when to commit.
+
+    Parameters:
+        session (Session): The SQLModel session used for database operations.
+        model (type[SQLModel]): The table model to delete from.
+        pk_values (list): The primary keys of the rows to delete.
+        chunk_size (int | None): Maximum number of keys per DELETE (defaults to DB_BULK_CHUNK_SIZE).
+
+    Returns:
+        int: The number of deleted rows.
+    """
+    primary_key = model.__table__.primary_key.columns.values()[0]
+    pk_values = list(dict.fromkeys(pk_values))
+    chunk_size = chunk_size or BULK_CONFIG["chunk_size"]
+
+    deleted = 0
+    for start in range(0, len(pk_values), chunk_size):
+        chunk = pk_values[start:start + chunk_size]
+        detach_references(session, model, chunk)
+        statement = (
+            delete(model)
+            .where(primary_key.in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+        deleted += session.exec(statement).rowcount
+    return deleted
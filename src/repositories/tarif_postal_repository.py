@@ -0,0 +1,124 @@
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..models import TarifPostal
+from ..cache import cache_for, fills_cache, row_values
+from .bulk import insert_many
+
+# Whole tariff grid cache, under a single key: it is small, read on every postage computation and seldom written
+tarif_postal_cache = cache_for(TarifPostal)
+GRID_KEY = "grid"
+
+
+def _load_grid(session: Session) -> list[dict]:
+    """
+    Read the tariff grid, ordered by increasing maximum weight.
+    """
+    statement = select(TarifPostal).order_by(TarifPostal.tarif_poids_max)
+    return [row_values(tarif) for tarif in session.exec(statement).all()]
+
+
+def _replace_grid(session: Session, tarifs: list[dict]) -> int:
+    """
+    Replace the tariff grid with one DELETE and one multi-row INSERT, without committing.
+    """
+    session.exec(delete(TarifPostal).execution_options(synchronize_session=False))
+    return len(insert_many(session, TarifPostal, tarifs))
+
+
+class TarifPostalRepository:
+    """
+    Repository class for the postage tariff grid.
+
+    The grid is read as a whole, from the in-process cache when possible, and
+    replaced as a whole.
+
+    Attributes:
+        session (Session): The SQLModel session used for database operations.
+
+    Methods:
+        get_tarifs() -> list[dict]:
+            Retrieves the tariff brackets, by increasing maximum weight.
+
+        replace_tarifs(tarifs: list[dict]) -> int:
+            Replaces the whole grid and returns the number of brackets.
+    """
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_tarifs(self) -> list[dict]:
+        """
+        Retrieve the tariff grid.
+
+        This method reads the in-process cache first, and the table on a miss.
+
+        Returns:
+            list[dict]: The column values of each TarifPostal, by increasing maximum weight.
+        """
+        cached = tarif_postal_cache.get(GRID_KEY)
+        if cached is not None:
+            return cached["tarifs"]
+        generation = tarif_postal_cache.generation
+        tarifs = _load_grid(self.session)
+        if fills_cache(self.session):
+            tarif_postal_cache.set(GRID_KEY, {"tarifs": tarifs}, generation)
+        return tarifs
+
+    def replace_tarifs(self, tarifs: list[dict]) -> int:
+        """
+        Replace the tariff grid.
+
+        This method deletes every bracket, inserts the new ones and commits the transaction.
+
+        Parameters:
+            tarifs (list[dict]): The column values of each TarifPostal, sharing the same keys.
+
+        Returns:
+            int: The number of brackets of the new grid.
+        """
+        count = _replace_grid(self.session, tarifs)
+        self.session.commit()
+        tarif_postal_cache.invalidate(GRID_KEY)
+        return count
+
+
+class AsyncTarifPostalRepository:
+    """
+    Asynchronous repository class for the postage tariff grid.
+
+    Attributes:
+        session (AsyncSession): The async SQLModel session used for database operations.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_tarifs(self) -> list[dict]:
+        """
+        Retrieve the tariff grid, from the in-process cache when possible.
+
+        Returns:
+            list[dict]: The column values of each TarifPostal, by increasing maximum weight.
+        """
+        cached = tarif_postal_cache.get(GRID_KEY)
+        if cached is not None:
+            return cached["tarifs"]
+        generation = tarif_postal_cache.generation
+        tarifs = await self.session.run_sync(_load_grid)
+        if fills_cache(self.session):
+            tarif_postal_cache.set(GRID_KEY, {"tarifs": tarifs}, generation)
+        return tarifs
+
+    async def replace_tarifs(self, tarifs: list[dict]) -> int:
+        """
+        Replace the tariff grid and commit the transaction.
+
+        Parameters:
+            tarifs (list[dict]): The column values of each TarifPostal, sharing the same keys.
+
+        Returns:
+            int: The number of brackets of the new grid.
+        """
+        count = await self.session.run_sync(_replace_grid, tarifs)
+        await self.session.commit()
+        tarif_postal_cache.invalidate(GRID_KEY)
+        return count
@@ -1,5 +1,12 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..models import VariationObjet
+from ..cache import cache_for, cached_instance, fills_cache, row_values
+from .statements import select_page, update_by_pk, delete_by_pk, delete_by_pks
+from .bulk import insert_many
+
+# Point lookups cache, kept consistent by the write methods below
+variation_objet_cache = cache_for(VariationObjet)
 
 class VariationObjetRepository:
     """
@@ -16,10 +23,13 @@ class VariationObjetRepository:
         create_variation_objet(client: VariationObjet) -> VariationObjet:
             Adds a new VariationObjet to the database and returns the created instance.
 
+        bulk_create_variation_objets(variation_objets: list[dict]) -> list:
+            Inserts several VariationObjets with multi-row INSERTs and returns their IDs.
+
         get_variation_objet(variation_objet_id: int) -> VariationObjet | None:
             Retrieves a VariationObjet by its ID. Returns None if not found.
 
-        get_all_variation_objets(limit: int | None = None, offset: int | None = None) -> List[VariationObjet]:
+        get_all_variation_objets(limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
             Fetches all VariationObjet records from the database.
 
         update_variation_objet(variation_objet_id: int, variation_objet_update: dict) -> VariationObjet | None:
@@ -29,6 +39,9 @@ class VariationObjetRepository:
         delete_variation_objet(variation_objet_id: int) -> bool:
             Deletes a VariationObjet by its ID. Returns True if the deletion was successful,
             or False if the VariationObjet was not found.
+
+        bulk_delete_variation_objets(variation_objet_ids: list[int]) -> int:
+            Deletes several VariationObjets by their IDs and returns the number of deleted rows.
     """     
     def __init__(self, session: Session):
         self.session = session
@@ -48,13 +61,31 @@ class VariationObjetRepository:
         self.session.add(variation_objet)
         self.session.commit()
         self.session.refresh(variation_objet)
+        variation_objet_cache.set(variation_objet.variation_objet_id, row_values(variation_objet))
         return variation_objet
 
+    def bulk_create_variation_objets(self, variation_objets: list[dict]) -> list:
+        """
+        Create several VariationObjets at once.
+
+        This method inserts the rows with one multi-row INSERT per chunk and commits the transaction.
+
+        Parameters:
+            variation_objets (list[dict]): The column values of each VariationObjet, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created VariationObjets, in input order.
+        """
+        ids = insert_many(self.session, VariationObjet, variation_objets)
+        self.session.commit()
+        return ids
+
     def get_variation_objet(self, variation_objet_id: int) -> VariationObjet | None:
         """
         Retrieve a VariationObjet by its ID.
 
-        This method fetches a VariationObjet from the database using its unique identifier.
+        This method fetches a VariationObjet from the database using its unique identifier, going through
+        the in-process cache of VariationObjet rows first.
 
         Parameters:
             variation_objet_id (int): The ID of the VariationObjet to retrieve.
@@ -62,10 +93,17 @@ class VariationObjetRepository:
         Returns:
             VariationObjet | None: The VariationObjet instance if found, otherwise None.
         """
+        values = variation_objet_cache.get(variation_objet_id)
+        if values is not None:
+            return self.session.merge(cached_instance(VariationObjet, values), load=False)
+        generation = variation_objet_cache.generation
         statement = select(VariationObjet).where(VariationObjet.variation_objet_id == variation_objet_id)
-        return self.session.exec(statement).one_or_none()
+        variation_objet = self.session.exec(statement).one_or_none()
+        if variation_objet and fills_cache(self.session):
+            variation_objet_cache.set(variation_objet_id, row_values(variation_objet), generation)
+        return variation_objet
 
-    def get_all_variation_objets(self, limit: int | None = None, offset: int | None = None) -> list[VariationObjet]:
+    def get_all_variation_objets(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
         """
         Retrieve all VariationObjets.
 
@@ -74,19 +112,19 @@ class VariationObjetRepository:
         Parameters:
             limit (int) : an integer to specify the maximum number of results.
             offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
 
         Returns:
-            List[VariationObjet]: A list of all VariationObjet instances in the database.
+            list[dict]: The column values of each VariationObjet, in ID order.
         """
-        statement = select(VariationObjet).limit(limit).offset(offset)
-        return list(self.session.exec(statement).all())
+        return select_page(self.session, VariationObjet, limit, offset, after)
 
     def update_variation_objet(self, variation_objet_id: int, variation_objet_update: dict) -> VariationObjet | None:
         """
         Update an existing VariationObjet.
 
-        This method updates the fields of an existing VariationObjet in the database
-        with the values from the provided VariationObjet instance.
+        This method issues a single UPDATE statement on the VariationObjet primary key, reading the
+        updated row back with RETURNING when the database supports it.
 
         Parameters:
             variation_objet_id (int): The ID of the VariationObjet to update.
@@ -95,20 +133,146 @@ class VariationObjetRepository:
         Returns:
             VariationObjet | None: The updated VariationObjet instance if found, otherwise None.
         """
-        existing_variation_objet = self.get_variation_objet(variation_objet_id)
-        if existing_variation_objet:
-            existing_variation_objet.sqlmodel_update(variation_objet_update)
-            self.session.add(existing_variation_objet)
-            self.session.commit()
-            self.session.refresh(existing_variation_objet)
-            return existing_variation_objet
-        return None
+        updated_variation_objet = update_by_pk(self.session, VariationObjet, variation_objet_id, variation_objet_update)
+        self.session.commit()
+        variation_objet_cache.invalidate(variation_objet_id)
+        return updated_variation_objet
 
     def delete_variation_objet(self, variation_objet_id: int) -> bool:
         """
         Delete a VariationObjet by its ID.
 
-        This method removes a VariationObjet from the database using its unique identifier.
+        This method issues a single DELETE statement on the VariationObjet primary key, without loading
+        the row first.
+
+        Parameters:
+            variation_objet_id (int): The ID of the VariationObjet to delete.
+
+        Returns:
+            bool: True if the deletion was successful, otherwise False.
+        """
+        deleted = delete_by_pk(self.session, VariationObjet, variation_objet_id)
+        self.session.commit()
+        variation_objet_cache.invalidate(variation_objet_id)
+        return deleted
+
+    def bulk_delete_variation_objets(self, variation_objet_ids: list[int]) -> int:
+        """
+        Delete several VariationObjets by their IDs.
+
+        This method issues one DELETE ... WHERE IN statement per chunk and commits the transaction.
+        IDs that do not exist are ignored.
+
+        Parameters:
+            variation_objet_ids (list[int]): The IDs of the VariationObjets to delete.
+
+        Returns:
+            int: The number of deleted VariationObjets.
+        """
+        deleted = delete_by_pks(self.session, VariationObjet, variation_objet_ids)
+        self.session.commit()
+        variation_objet_cache.invalidate(*variation_objet_ids)
+        return deleted
+
+
+class AsyncVariationObjetRepository:
+    """
+    Asynchronous counterpart of VariationObjetRepository.
+
+    Provides the same CRUD operations on the VariationObjet model as coroutines running on an
+    AsyncSession, so that endpoints do not hold a threadpool thread while waiting
+    on the database.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session used for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_variation_objet(self, variation_objet: VariationObjet) -> VariationObjet:
+        """
+        Create a new VariationObjet.
+
+        Parameters:
+            variation_objet (VariationObjet): The VariationObjet instance to be created.
+
+        Returns:
+            VariationObjet: The created VariationObjet instance with its ID populated.
+        """
+        self.session.add(variation_objet)
+        await self.session.commit()
+        await self.session.refresh(variation_objet)
+        variation_objet_cache.set(variation_objet.variation_objet_id, row_values(variation_objet))
+        return variation_objet
+
+    async def bulk_create_variation_objets(self, variation_objets: list[dict]) -> list:
+        """
+        Create several VariationObjets at once, with one multi-row INSERT per chunk.
+
+        Parameters:
+            variation_objets (list[dict]): The column values of each VariationObjet, sharing the same keys.
+
+        Returns:
+            list: The IDs of the created VariationObjets, in input order.
+        """
+        ids = await self.session.run_sync(insert_many, VariationObjet, variation_objets)
+        await self.session.commit()
+        return ids
+
+    async def get_variation_objet(self, variation_objet_id: int) -> VariationObjet | None:
+        """
+        Retrieve a VariationObjet by its ID.
+
+        Parameters:
+            variation_objet_id (int): The ID of the VariationObjet to retrieve.
+
+        Returns:
+            VariationObjet | None: The VariationObjet instance if found, otherwise None.
+        """
+        values = variation_objet_cache.get(variation_objet_id)
+        if values is not None:
+            return await self.session.merge(cached_instance(VariationObjet, values), load=False)
+        generation = variation_objet_cache.generation
+        statement = select(VariationObjet).where(VariationObjet.variation_objet_id == variation_objet_id)
+        variation_objet = (await self.session.exec(statement)).one_or_none()
+        if variation_objet and fills_cache(self.session):
+            variation_objet_cache.set(variation_objet_id, row_values(variation_objet), generation)
+        return variation_objet
+
+    async def get_all_variation_objets(self, limit: int | None = None, offset: int | None = None, after: int | None = None) -> list[dict]:
+        """
+        Retrieve all VariationObjets.
+
+        Parameters:
+            limit (int) : an integer to specify the maximum number of results.
+            offset (int) : an integer to specify the number of lines to ignore.
+            after (int) : primary key of the last row of the previous page, for keyset pagination (takes precedence over offset).
+
+        Returns:
+            list[dict]: The column values of each VariationObjet, in ID order.
+        """
+        return await self.session.run_sync(select_page, VariationObjet, limit, offset, after)
+
+    async def update_variation_objet(self, variation_objet_id: int, variation_objet_update: dict) -> VariationObjet | None:
+        """
+        Update an existing VariationObjet.
+
+        Parameters:
+            variation_objet_id (int): The ID of the VariationObjet to update.
+            variation_objet_update (dict): The dictionary instance containing updated values.
+
+        Returns:
+            VariationObjet | None: The updated VariationObjet instance if found, otherwise None.
+        """
+        updated_variation_objet = await self.session.run_sync(update_by_pk, VariationObjet, variation_objet_id, variation_objet_update)
+        await self.session.commit()
+        variation_objet_cache.invalidate(variation_objet_id)
+        return updated_variation_objet
+
+    async def delete_variation_objet(self, variation_objet_id: int) -> bool:
+        """
+        Delete a VariationObjet by its ID.
 
         Parameters:
             variation_objet_id (int): The ID of the VariationObjet to delete.
@@ -116,9 +280,22 @@ class VariationObjetRepository:
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        existing_variation_objet = self.get_variation_objet(variation_objet_id)
-        if existing_variation_objet:
-            self.session.delete(existing_variation_objet)
-            self.session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = await self.session.run_sync(delete_by_pk, VariationObjet, variation_objet_id)
+        await self.session.commit()
+        variation_objet_cache.invalidate(variation_objet_id)
+        return deleted
+
+    async def bulk_delete_variation_objets(self, variation_objet_ids: list[int]) -> int:
+        """
+        Delete several VariationObjets by their IDs, with one DELETE ... WHERE IN statement per chunk.
+
+        Parameters:
+            variation_objet_ids (list[int]): The IDs of the VariationObjets to delete.
+
+        Returns:
+            int: The number of deleted VariationObjets.
+        """
+        deleted = await self.session.run_sync(delete_by_pks, VariationObjet, variation_objet_ids)
+        await self.session.commit()
+        variation_objet_cache.invalidate(*variation_objet_ids)
+        return deleted
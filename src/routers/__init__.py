@@ -7,6 +7,8 @@ from .detail_colis_router import router as router_detail_colis
 from .detail_commande_router import router as router_detail_commande
 from .objet_router import router as router_objet
 from .variation_objet_router import router as router_variation_objet
+from .monitoring_router import router as router_monitoring
+from .metrics_router import router as router_metrics
 
 """
 API Router Aggregation Module
@@ -1,59 +1,107 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlmodel import Session
-from ..database import get_db
-from ..models import Client, ClientCreate, ClientUpdate, ClientRead
-from ..services import ClientService
+from fastapi import APIRouter, Depends, Query, HTTPException, status, Request, Response, Body
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_db, get_async_read_db, get_async_read_session_factory, BULK_CONFIG
+from ..pagination import cursor_param, set_next_cursor
+from ..etag import not_modified
+from ..serialization import json_response
+from ..export import ExportFormat, export_response
+from ..models import Client, ClientCreate, ClientUpdate, ClientRead, BulkCreateRead, BulkDeleteRead
+from ..services import AsyncClientService
 
 # Create an APIRouter instance for client-related endpoints
 router = APIRouter(prefix="/client", tags=['Client'])
 
 @router.get("/", response_model=list[ClientRead])
-def get_all_clients(offset: int = 0, limit: int = Query(default=100, le=100), session: Session = Depends(get_db)) -> list[ClientRead]:
+async def get_all_clients(request: Request, response: Response, offset: int = 0, limit: int = Query(default=100, le=100), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)) -> list[ClientRead]:
     """
     Retrieve all clients with pagination support.
     
     Parameters:
     - offset: int - Number of items to skip (for pagination)
     - limit: int - Maximum number of items to return (max 100)
-    - session: Session - Database session dependency
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page (takes precedence over offset)
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - list[ClientRead]: List of client objects
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     """
-    return ClientService(session).get_all(limit, offset)
+    items = await AsyncClientService(session).get_all(limit, offset, after)
+    set_next_cursor(response, items, "client_id", limit)
+    return not_modified(request, response, items) or json_response(response, items)
+
+@router.get("/export", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "Export complet de la table"}
+})
+async def export_clients(format: ExportFormat = "ndjson", session_factory = Depends(get_async_read_session_factory)):
+    """
+    Export all clients, streamed from a server-side cursor.
+    
+    Parameters:
+    - format: str - Export format, ndjson (one JSON object per line) or csv (with a header line)
+    - session_factory: async_sessionmaker - Read session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: Every client row, in ID order
+    """
+    return export_response(session_factory, Client, format)
+
+@router.get("/search", response_model=list[ClientRead])
+async def search_clients(request: Request, response: Response, q: str = Query(min_length=1, max_length=100), limit: int = Query(default=20, ge=1, le=100), session: AsyncSession = Depends(get_async_read_db)) -> list[ClientRead]:
+    """
+    Search clients by name, first name, email or phone number.
+    
+    Case, accents and punctuation are ignored. A query containing "@" matches an email exactly,
+    a phone number (fixed or mobile) matches in any common French format, and any other query
+    matches the names and first names by word prefix ("dup je" finds Jean DUPONT).
+    
+    Parameters:
+    - q: str - Search text
+    - limit: int - Maximum number of items to return (max 100)
+    - session: AsyncSession - Read database session dependency
+    
+    Returns:
+    - list[ClientRead]: Matching clients, exact matches first
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
+    """
+    items = await AsyncClientService(session).search(q, limit)
+    return not_modified(request, response, items) or json_response(response, items)
 
 @router.get("/{id}", response_model=ClientRead, responses={
     404:{"description":"Client id non trouvé"}
 })
-def get_client(id: int, session: Session = Depends(get_db)):
+async def get_client(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific client by ID.
     
     Parameters:
     - id: int - ID of the client to retrieve
-    - session: Session - Database session dependency
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - ClientRead: The requested client object
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     
     Raises:
     - HTTPException 404: If client is not found
     """
-    client = ClientService(session).get_by_id(id)
+    client = await AsyncClientService(session).get_by_id(id)
     if not client:
         raise HTTPException(status_code=404, detail=f"client :{id} non trouvé")
-    return client
+    return not_modified(request, response, client) or client
 
 @router.post("/", response_model=ClientRead, status_code=status.HTTP_201_CREATED, responses={
     400:{"description":["'nom' et 'prenom' sont requis","'email' mal formé"]},
 })
-def post_client(client: ClientCreate, session: Session = Depends(get_db)):
+async def post_client(client: ClientCreate, session: AsyncSession = Depends(get_async_db)):
     """
     Create a new client.
     
     Parameters:
     - client: ClientCreate - Client data for creation
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - ClientRead: The created client object
@@ -62,23 +110,48 @@ def post_client(client: ClientCreate, session: Session = Depends(get_db)):
     - HTTPException 400: If there's a validation error
     """
     try:
-        created_client = ClientService(session).create(client)
+        created_client = await AsyncClientService(session).create(client)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     return created_client
 
+@router.post("/bulk", response_model=BulkCreateRead, status_code=status.HTTP_201_CREATED, responses={
+    400:{"description":["'nom' et 'prenom' sont requis","'email' mal formé"]},
+})
+async def post_clients_bulk(clients: list[ClientCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create several clients at once.
+    
+    All clients are validated before anything is written: one invalid client rejects the whole batch.
+    
+    Parameters:
+    - clients: list[ClientCreate] - Data of each client to create (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkCreateRead: Number of created clients and their IDs, in request order
+    
+    Raises:
+    - HTTPException 400: If any client has a validation error
+    """
+    try:
+        ids = await AsyncClientService(session).create_many(clients)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return BulkCreateRead(created=len(ids), ids=ids)
+
 @router.patch("/{id}", response_model=ClientRead, responses={
     400:{"description":"'email' mal formé"},
     404:{"description":"Client id non trouvé"}
 })
-def patch_client(id: int, client: ClientUpdate, session: Session = Depends(get_db)):
+async def patch_client(id: int, client: ClientUpdate, session: AsyncSession = Depends(get_async_db)):
     """
     Partially update a client's information.
     
     Parameters:
     - id: int - ID of the client to update
     - client: ClientUpdate - Client data for partial update
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - ClientRead: The updated client object
@@ -88,23 +161,38 @@ def patch_client(id: int, client: ClientUpdate, session: Session = Depends(get_d
     - HTTPException 404: If client is not found
     """
     try:
-        created_client = ClientService(session).patch(id, client)
+        created_client = await AsyncClientService(session).patch(id, client)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     if not created_client:
         raise HTTPException(status_code=404, detail=f"client :{id} non trouvé")
     return created_client
 
+@router.delete("/", response_model=BulkDeleteRead)
+async def delete_clients_bulk(ids: list[int] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Delete several clients at once.
+    
+    Parameters:
+    - ids: list[int] - IDs of the clients to delete, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkDeleteRead: Number of deleted clients (unknown IDs are ignored)
+    """
+    deleted = await AsyncClientService(session).delete_many(ids)
+    return BulkDeleteRead(deleted=deleted)
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT,responses={
     404:{'description': "Client id non trouvé"}
 })
-def delete_client(id: int, session: Session = Depends(get_db)):
+async def delete_client(id: int, session: AsyncSession = Depends(get_async_db)):
     """
     Delete a client by ID.
     
     Parameters:
     - id: int - ID of the client to delete
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - None: Empty response with status code 204
@@ -112,7 +200,7 @@ def delete_client(id: int, session: Session = Depends(get_db)):
     Raises:
     - HTTPException 404: If client is not found
     """
-    client = ClientService(session).delete(id)
+    client = await AsyncClientService(session).delete(id)
     if not client:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"client:{id} non trouvé")
     return client
\ No newline at end of file
@@ -1,76 +1,191 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlmodel import Session
-from ..database import get_db
-from ..models import Colis, ColisCreate, ColisRead, ColisUpdate
-from ..repositories import ColisRepository
+from fastapi import APIRouter, Depends, Query, HTTPException, status, Request, Response, Body
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_db, get_async_read_db, get_async_read_session_factory, BULK_CONFIG
+from ..pagination import cursor_param, set_next_cursor
+from ..etag import not_modified
+from ..serialization import json_response
+from ..export import ExportFormat, export_response
+from ..models import Colis, ColisCreate, ColisRead, ColisUpdate, BulkCreateRead, BulkDeleteRead, TarifPostalCreate, TarifPostalRead, ColisPostageRead, PostageRecomputeRead
+from ..repositories import AsyncColisRepository, AsyncTarifPostalRepository
+from ..services import AsyncColisPostageService
 
 # Create an APIRouter instance for package (colis) related endpoints
 router = APIRouter(prefix="/colis", tags=['Colis'])
 
 @router.get("/", response_model=list[ColisRead])
-def get_all_colis(offset: int = 0, limit: int = Query(default=100, le=100), session: Session = Depends(get_db)) -> list[Colis]:
+async def get_all_colis(request: Request, response: Response, offset: int = 0, limit: int = Query(default=100, le=100), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)) -> list[Colis]:
     """
     Retrieve all packages (colis) with pagination support.
     
     Parameters:
     - offset: int - Number of items to skip (for pagination)
     - limit: int - Maximum number of items to return (max 100)
-    - session: Session - Database session dependency
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page (takes precedence over offset)
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - list[ColisRead]: List of package objects
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     """
-    return ColisRepository(session).get_all_colis(limit, offset)
+    items = await AsyncColisRepository(session).get_all_colis(limit, offset, after)
+    set_next_cursor(response, items, "colis_id", limit)
+    return not_modified(request, response, items) or json_response(response, items)
+
+@router.get("/export", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "Export complet de la table"}
+})
+async def export_colis(format: ExportFormat = "ndjson", session_factory = Depends(get_async_read_session_factory)):
+    """
+    Export all packages, streamed from a server-side cursor.
+    
+    Parameters:
+    - format: str - Export format, ndjson (one JSON object per line) or csv (with a header line)
+    - session_factory: async_sessionmaker - Read session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: Every package row, in ID order
+    """
+    return export_response(session_factory, Colis, format)
+
+@router.get("/tarifs", response_model=list[TarifPostalRead])
+async def get_tarifs(session: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve the postage tariff grid.
+    
+    Parameters:
+    - session: AsyncSession - Read database session dependency
+    
+    Returns:
+    - list[TarifPostalRead]: The tariff brackets, by increasing maximum weight
+    """
+    return await AsyncTarifPostalRepository(session).get_tarifs()
+
+@router.put("/tarifs", response_model=list[TarifPostalRead], responses={
+    400: {"description":"Poids maximal en double"}
+})
+async def put_tarifs(tarifs: list[TarifPostalCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Replace the whole postage tariff grid.
+    
+    Parameters:
+    - tarifs: list[TarifPostalCreate] - Every bracket of the new grid: maximum weight (kg) and postage amount
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - list[TarifPostalRead]: The new tariff brackets, by increasing maximum weight
+    
+    Raises:
+    - HTTPException 400: If two brackets have the same maximum weight
+    """
+    if len({tarif.tarif_poids_max for tarif in tarifs}) != len(tarifs):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="tarif_poids_max en double")
+    repository = AsyncTarifPostalRepository(session)
+    await repository.replace_tarifs([tarif.model_dump() for tarif in tarifs])
+    return await repository.get_tarifs()
+
+@router.post("/postage", response_model=PostageRecomputeRead)
+async def post_colis_postage(ids: list[int] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Recompute the postage (colis_timbre) of several packages from their weight and the tariff grid.
+    
+    Parameters:
+    - ids: list[int] - IDs of the packages to recompute (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - PostageRecomputeRead: Number of updated packages, and the packages left unchanged because the grid does not cover their weight (unknown IDs are ignored)
+    """
+    return await AsyncColisPostageService(session).recompute(ids)
 
 @router.get("/{id}", response_model=ColisRead, responses={
     404: {"description":"Colis id non trouvé"}
 })
-def get_colis(id: int, session: Session = Depends(get_db)):
+async def get_colis(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific package (colis) by ID.
     
     Parameters:
     - id: int - ID of the package to retrieve
-    - session: Session - Database session dependency
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - ColisRead: The requested package object
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     
     Raises:
     - HTTPException 404: If package is not found
     """
-    colis = ColisRepository(session).get_colis(id)
+    colis = await AsyncColisRepository(session).get_colis(id)
     if not colis:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"colis :{id} non trouvé")
-    return colis
+    return not_modified(request, response, colis) or colis
+
+@router.get("/{id}/postage", response_model=ColisPostageRead, responses={
+    404: {"description":"Colis id non trouvé"}
+})
+async def get_colis_postage(id: int, session: AsyncSession = Depends(get_async_read_db)):
+    """
+    Compute the weight and postage of a package, without storing them.
+    
+    Parameters:
+    - id: int - ID of the package
+    - session: AsyncSession - Read database session dependency
+    
+    Returns:
+    - ColisPostageRead: Weight of the package (sum of quantity times variation weight) and postage of its bracket (null above the grid)
+    
+    Raises:
+    - HTTPException 404: If package is not found
+    """
+    postage = await AsyncColisPostageService(session).get_postage(id)
+    if not postage:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"colis :{id} non trouvé")
+    return postage
 
 @router.post("/", response_model=ColisRead, status_code=status.HTTP_201_CREATED)
-def post_colis(colis: ColisCreate, session: Session = Depends(get_db)):
+async def post_colis(colis: ColisCreate, session: AsyncSession = Depends(get_async_db)):
     """
     Create a new package (colis).
     
     Parameters:
     - colis: ColisCreate - Package data for creation
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - ColisRead: The created package object
     """
     colis_instance = Colis.model_validate(colis)
-    created_colis = ColisRepository(session).create_colis(colis_instance)
+    created_colis = await AsyncColisRepository(session).create_colis(colis_instance)
     return created_colis
 
+@router.post("/bulk", response_model=BulkCreateRead, status_code=status.HTTP_201_CREATED)
+async def post_colis_bulk(colis: list[ColisCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create several packages (colis) at once.
+    
+    Parameters:
+    - colis: list[ColisCreate] - Data of each colis to create (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkCreateRead: Number of created packages (colis) and their IDs, in request order
+    """
+    ids = await AsyncColisRepository(session).bulk_create_colis([colis.model_dump() for colis in colis])
+    return BulkCreateRead(created=len(ids), ids=ids)
+
 @router.patch("/{id}", response_model=ColisRead,responses={
     404:{"description":"Colis id non trouvé"}
 })
-def patch_colis(id: int, colis: ColisUpdate, session: Session = Depends(get_db)):
+async def patch_colis(id: int, colis: ColisUpdate, session: AsyncSession = Depends(get_async_db)):
     """
     Partially update a package's (colis) information.
     
     Parameters:
     - id: int - ID of the package to update
     - colis: ColisUpdate - Package data for partial update
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - ColisRead: The updated package object
@@ -78,21 +193,36 @@ def patch_colis(id: int, colis: ColisUpdate, session: Session = Depends(get_db))
     Raises:
     - HTTPException 404: If package is not found
     """
-    created_colis = ColisRepository(session).update_colis(id, colis.model_dump(exclude_unset=True))
+    created_colis = await AsyncColisRepository(session).update_colis(id, colis.model_dump(exclude_unset=True))
     if not created_colis:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"colis :{id} non trouvé")
     return created_colis
 
+@router.delete("/", response_model=BulkDeleteRead)
+async def delete_colis_bulk(ids: list[int] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Delete several packages at once.
+    
+    Parameters:
+    - ids: list[int] - IDs of the packages to delete, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkDeleteRead: Number of deleted packages (unknown IDs are ignored)
+    """
+    deleted = await AsyncColisRepository(session).bulk_delete_colis(ids)
+    return BulkDeleteRead(deleted=deleted)
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT, responses={
     404: {"description": "package is not found"},
 })
-def delete_colis(id: int, session: Session = Depends(get_db)):
+async def delete_colis(id: int, session: AsyncSession = Depends(get_async_db)):
     """
     Delete a package (colis) by ID.
     
     Parameters:
     - id: int - ID of the package to delete
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - None: Empty response with status code 204
@@ -101,7 +231,6 @@ def delete_colis(id: int, session: Session = Depends(get_db)):
     - HTTPException 404: If package is not found
     
     """
-    colis = ColisRepository(session).delete_colis(id)
+    colis = await AsyncColisRepository(session).delete_colis(id)
     if not colis:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"colis:{id} non trouvé")
-    return ColisRepository(session).delete_colis(id)
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"colis:{id} non trouvé")
\ No newline at end of file
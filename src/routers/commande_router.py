@@ -1,76 +1,205 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlmodel import Session
-from ..database import get_db
-from ..models import Commande, CommandeCreate, CommandeRead, CommandeUpdate
-from ..repositories import CommandeRepository
+import datetime
+from fastapi import APIRouter, Depends, Query, HTTPException, status, Request, Response, Body
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_db, get_async_read_db, get_async_read_session_factory, BULK_CONFIG
+from ..pagination import cursor_param, set_next_cursor
+from ..etag import not_modified
+from ..serialization import json_response
+from ..export import ExportFormat, export_response
+from ..models import Commande, CommandeCreate, CommandeRead, CommandeUpdate, CommandeFullRead, CommandeValuationRead, CommandeValuationDetailRead, BulkCreateRead, BulkDeleteRead
+from ..repositories import AsyncCommandeRepository
+from ..services import AsyncCommandeValuationService
 
 # Create an APIRouter instance for order (commande) related endpoints
 router = APIRouter(prefix="/commande", tags=['Commande'])
 
 @router.get("/", response_model=list[CommandeRead])
-def get_all_commande(offset: int = 0, limit: int = Query(default=100, le=100), session: Session = Depends(get_db)) -> list[Commande]:
+async def get_all_commande(request: Request, response: Response, offset: int = 0, limit: int = Query(default=100, le=100), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)) -> list[Commande]:
     """
     Retrieve all orders with pagination support.
     
     Parameters:
     - offset: int - Number of items to skip (for pagination)
     - limit: int - Maximum number of items to return (max 100)
-    - session: Session - Database session dependency
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page (takes precedence over offset)
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - list[CommandeRead]: List of order objects
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     """
-    return CommandeRepository(session).get_all_commandes(limit, offset)
+    items = await AsyncCommandeRepository(session).get_all_commandes(limit, offset, after)
+    set_next_cursor(response, items, "commande_id", limit)
+    return not_modified(request, response, items) or json_response(response, items)
+
+@router.get("/export", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "Export complet de la table"}
+})
+async def export_commandes(format: ExportFormat = "ndjson", session_factory = Depends(get_async_read_session_factory)):
+    """
+    Export all orders, streamed from a server-side cursor.
+    
+    Parameters:
+    - format: str - Export format, ndjson (one JSON object per line) or csv (with a header line)
+    - session_factory: async_sessionmaker - Read session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: Every order row, in ID order
+    """
+    return export_response(session_factory, Commande, format)
+
+@router.get("/full", response_model=list[CommandeFullRead])
+async def get_commandes_full(request: Request, response: Response, ids: list[int] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve several complete orders at once, in a fixed number of queries.
+    
+    Parameters:
+    - ids: list[int] - IDs of the orders to retrieve, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Read database session dependency
+    
+    Returns:
+    - list[CommandeFullRead]: The orders found, in ID order, each with its lines (variation and objet) and its client (commune and departement); unknown IDs are ignored
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
+    """
+    commandes = await AsyncCommandeRepository(session).get_full_commandes(ids)
+    items = [CommandeFullRead.model_validate(commande) for commande in commandes]
+    return not_modified(request, response, items) or items
+
+@router.get("/valuation", response_model=list[CommandeValuationRead])
+async def get_commandes_valuation(request: Request, response: Response, date_from: datetime.date | None = None, date_to: datetime.date | None = None, limit: int = Query(default=100, le=1000), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)):
+    """
+    Value the orders of a date range in points, computed by the database in one grouped query.
+    
+    Parameters:
+    - date_from: date - First order date included (optional)
+    - date_to: date - Last order date included (optional)
+    - limit: int - Maximum number of orders to return (max 1000)
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page
+    - session: AsyncSession - Read database session dependency
+    
+    Returns:
+    - list[CommandeValuationRead]: Line count, total quantity and total points of each order, in ID order
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
+    """
+    items = await AsyncCommandeValuationService(session).value_commandes(date_from, date_to, limit, after)
+    set_next_cursor(response, items, "commande_id", limit)
+    return not_modified(request, response, items) or items
 
 @router.get("/{id}", response_model=CommandeRead,responses={
     "404":{"description":"Commande id non trouvé"}
 })
-def get_commande(id: int, session: Session = Depends(get_db)):
+async def get_commande(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific order by ID.
     
     Parameters:
     - id: int - ID of the order to retrieve
-    - session: Session - Database session dependency
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - CommandeRead: The requested order object
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     
     Raises:
     - HTTPException 404: If order is not found
     """
-    commande = CommandeRepository(session).get_commande(id)
+    commande = await AsyncCommandeRepository(session).get_commande(id)
     if not commande:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"commande :{id} non trouvé")
-    return commande
+    return not_modified(request, response, commande) or commande
+
+@router.get("/{id}/full", response_model=CommandeFullRead, responses={
+    404:{"description":"Commande id non trouvé"}
+})
+async def get_commande_full(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve a complete order: the order, its lines with their variation and objet, and its client with their commune and departement.
+    
+    Parameters:
+    - id: int - ID of the order to retrieve
+    - session: AsyncSession - Read database session dependency
+    
+    Returns:
+    - CommandeFullRead: The order document, loaded in two queries whatever its number of lines
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
+    
+    Raises:
+    - HTTPException 404: If order is not found
+    """
+    commandes = await AsyncCommandeRepository(session).get_full_commandes([id])
+    if not commandes:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"commande :{id} non trouvé")
+    commande = CommandeFullRead.model_validate(commandes[0])
+    return not_modified(request, response, commande) or commande
+
+@router.get("/{id}/valuation", response_model=CommandeValuationDetailRead, responses={
+    404:{"description":"Commande id non trouvé"}
+})
+async def get_commande_valuation(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
+    """
+    Value an order in points: quantity times objet points for each line, and the order totals.
+    
+    Parameters:
+    - id: int - ID of the order to value
+    - session: AsyncSession - Read database session dependency
+    
+    Returns:
+    - CommandeValuationDetailRead: The order totals with the value of each line
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
+    
+    Raises:
+    - HTTPException 404: If order is not found
+    """
+    valuation = await AsyncCommandeValuationService(session).value_commande(id)
+    if not valuation:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"commande :{id} non trouvé")
+    return not_modified(request, response, valuation) or valuation
 
 @router.post("/", response_model=CommandeRead, status_code=status.HTTP_201_CREATED)
-def post_commande(commande: CommandeCreate, session: Session = Depends(get_db)):
+async def post_commande(commande: CommandeCreate, session: AsyncSession = Depends(get_async_db)):
     """
     Create a new order.
     
     Parameters:
     - commande: CommandeCreate - Order data for creation
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - CommandeRead: The created order object
     """
     commande_instance = Commande.model_validate(commande)
-    created_commande = CommandeRepository(session).create_commande(commande_instance)
+    created_commande = await AsyncCommandeRepository(session).create_commande(commande_instance)
     return created_commande
 
+@router.post("/bulk", response_model=BulkCreateRead, status_code=status.HTTP_201_CREATED)
+async def post_commandes_bulk(commandes: list[CommandeCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create several orders at once.
+    
+    Parameters:
+    - commandes: list[CommandeCreate] - Data of each commande to create (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkCreateRead: Number of created orders and their IDs, in request order
+    """
+    ids = await AsyncCommandeRepository(session).bulk_create_commandes([commande.model_dump() for commande in commandes])
+    return BulkCreateRead(created=len(ids), ids=ids)
+
 @router.patch("/{id}", response_model=CommandeRead,responses={
     404:{"description":"Commande id non trouvé"}
 })
-def patch_commande(id: int, commande: CommandeUpdate, session: Session = Depends(get_db)):
+async def patch_commande(id: int, commande: CommandeUpdate, session: AsyncSession = Depends(get_async_db)):
     """
     Partially update an order's information.
     
     Parameters:
     - id: int - ID of the order to update
     - commande: CommandeUpdate - Order data for partial update
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - CommandeRead: The updated order object
@@ -78,21 +207,36 @@ def patch_commande(id: int, commande: CommandeUpdate, session: Session = Depends
     Raises:
     - HTTPException 404: If order is not found
     """
-    created_commande = CommandeRepository(session).update_commande(id, commande.model_dump(exclude_unset=True))
+    created_commande = await AsyncCommandeRepository(session).update_commande(id, commande.model_dump(exclude_unset=True))
     if not created_commande:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"commande :{id} non trouvé")
     return created_commande
 
+@router.delete("/", response_model=BulkDeleteRead)
+async def delete_commandes_bulk(ids: list[int] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Delete several orders at once.
+    
+    Parameters:
+    - ids: list[int] - IDs of the orders to delete, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkDeleteRead: Number of deleted orders (unknown IDs are ignored)
+    """
+    deleted = await AsyncCommandeRepository(session).bulk_delete_commandes(ids)
+    return BulkDeleteRead(deleted=deleted)
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT,responses={
     404:{"description":"Commande id non trouvé"}
 })
-def delete_commande(id: int, session: Session = Depends(get_db)):
+async def delete_commande(id: int, session: AsyncSession = Depends(get_async_db)):
     """
     Delete an order by ID.
     
     Parameters:
     - id: int - ID of the order to delete
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - None: Empty response with status code 204
@@ -100,7 +244,7 @@ def delete_commande(id: int, session: Session = Depends(get_db)):
     Raises:
     - HTTPException 404: If order is not found
     """
-    commande = CommandeRepository(session).delete_commande(id)
+    commande = await AsyncCommandeRepository(session).delete_commande(id)
     if not commande:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"commande:{id} non trouvé")
     return commande
\ No newline at end of file
@@ -1,76 +1,230 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlmodel import Session
-from ..database import get_db
-from ..models import Commune, CommuneCreate, CommuneRead, CommuneUpdate
-from ..repositories import CommuneRepository
+import io
+import json
+import tempfile
+from fastapi import APIRouter, Depends, Query, HTTPException, status, Request, Response, Body
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_db, get_async_read_db, get_async_session_factory, get_async_read_session_factory, BULK_CONFIG
+from ..pagination import cursor_param, set_next_cursor
+from ..etag import not_modified
+from ..serialization import json_response
+from ..export import ExportFormat, export_response
+from ..models import Commune, CommuneCreate, CommuneRead, CommuneUpdate, BulkCreateRead, UpsertRead, BulkDeleteRead
+from ..repositories import AsyncCommuneRepository
+from ..services import AsyncCommuneImportService
 
 # Create an APIRouter instance for commune-related endpoints
 router = APIRouter(prefix="/commune", tags=['Commune'])
 
+# Size above which an uploaded CSV file is spooled to disk instead of memory
+IMPORT_SPOOL_SIZE = 1024 * 1024
+
 @router.get("/", response_model=list[CommuneRead])
-def get_all_commune(offset: int = 0, limit: int = Query(default=100, le=100), session: Session = Depends(get_db)) -> list[Commune]:
+async def get_all_commune(request: Request, response: Response, offset: int = 0, limit: int = Query(default=100, le=100), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)) -> list[Commune]:
     """
     Retrieve all communes with pagination support.
     
     Parameters:
     - offset: int - Number of items to skip (for pagination)
     - limit: int - Maximum number of items to return (max 100)
-    - session: Session - Database session dependency
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page (takes precedence over offset)
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - list[CommuneRead]: List of commune objects
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
+    """
+    items = await AsyncCommuneRepository(session).get_all_communes(limit, offset, after)
+    set_next_cursor(response, items, "commune_id", limit)
+    return not_modified(request, response, items) or json_response(response, items)
+
+@router.get("/export", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "Export complet de la table"}
+})
+async def export_communes(format: ExportFormat = "ndjson", session_factory = Depends(get_async_read_session_factory)):
+    """
+    Export all communes, streamed from a server-side cursor.
+    
+    Parameters:
+    - format: str - Export format, ndjson (one JSON object per line) or csv (with a header line)
+    - session_factory: async_sessionmaker - Read session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: Every commune row, in ID order
     """
-    return CommuneRepository(session).get_all_communes(limit, offset)
+    return export_response(session_factory, Commune, format)
+
+@router.get("/autocomplete", response_model=list[CommuneRead])
+async def autocomplete_communes(response: Response, q: str = Query(min_length=1, max_length=50), limit: int = Query(default=10, ge=1, le=50), session: AsyncSession = Depends(get_async_read_db)) -> list[CommuneRead]:
+    """
+    Suggest communes from the start of a postal code or of a city name.
+    
+    Served from an in-memory prefix index, loaded at startup and reloaded after each commune write:
+    the database is only queried when the index is stale. Case, accents and punctuation are ignored.
+    
+    Parameters:
+    - q: str - Start of a postal code ("591") or of a city name ("wervicq s")
+    - limit: int - Maximum number of items to return (max 50)
+    - session: AsyncSession - Read database session dependency (used to reload a stale index)
+    
+    Returns:
+    - list[CommuneRead]: Matching communes, by postal code or city name
+    """
+    items = await AsyncCommuneRepository(session).autocomplete_communes(q, limit)
+    return json_response(response, items)
 
 @router.get("/{id}", response_model=CommuneRead,responses={
     404:{"description":"Commune id non trouvé"}
 })
-def get_commune(id: int, session: Session = Depends(get_db)):
+async def get_commune(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific commune by ID.
     
     Parameters:
     - id: int - ID of the commune to retrieve
-    - session: Session - Database session dependency
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - CommuneRead: The requested commune object
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     
     Raises:
     - HTTPException 404: If commune is not found
     """
-    commune = CommuneRepository(session).get_commune(id)
+    commune = await AsyncCommuneRepository(session).get_commune(id)
     if not commune:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"commune :{id} non trouvé")
-    return commune
+    return not_modified(request, response, commune) or commune
 
 @router.post("/", response_model=CommuneRead, status_code=status.HTTP_201_CREATED)
-def post_commune(commune: CommuneCreate, session: Session = Depends(get_db)):
+async def post_commune(commune: CommuneCreate, session: AsyncSession = Depends(get_async_db)):
     """
     Create a new commune.
     
     Parameters:
     - commune: CommuneCreate - Commune data for creation
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - CommuneRead: The created commune object
     """
     commune_instance = Commune.model_validate(commune)
-    created_commune = CommuneRepository(session).create_commune(commune_instance)
+    created_commune = await AsyncCommuneRepository(session).create_commune(commune_instance)
     return created_commune
 
+@router.post("/bulk", response_model=BulkCreateRead, status_code=status.HTTP_201_CREATED)
+async def post_communes_bulk(communes: list[CommuneCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create several communes at once.
+    
+    Parameters:
+    - communes: list[CommuneCreate] - Data of each commune to create (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkCreateRead: Number of created communes and their IDs, in request order
+    """
+    ids = await AsyncCommuneRepository(session).bulk_create_communes([commune.model_dump() for commune in communes])
+    return BulkCreateRead(created=len(ids), ids=ids)
+
+@router.put("/bulk", response_model=UpsertRead, responses={
+    400:{"description":"Clé naturelle manquante"}
+})
+async def put_communes_bulk(communes: list[CommuneCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create or update several communes at once, identified by commune_codepostal and commune_ville.
+    
+    Parameters:
+    - communes: list[CommuneCreate] - Data of each commune to create or update (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - UpsertRead: Number of inserted and of updated communes
+    
+    Raises:
+    - HTTPException 400: If a commune has an empty natural key, or if the database has no native upsert
+    """
+    try:
+        inserted, updated = await AsyncCommuneRepository(session).upsert_communes([commune.model_dump() for commune in communes])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return UpsertRead(inserted=inserted, updated=updated)
+
+@router.post("/import", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}}, "description": "Avancement de l'import, une ligne JSON par lot"},
+    400:{"description":"En-tête CSV invalide"}
+})
+async def import_communes(
+    request: Request,
+    chunk_size: int | None = Query(default=None, ge=1, le=BULK_CONFIG["max_items"]),
+    create_departements: bool = False,
+    encoding: str = "utf-8",
+    session_factory = Depends(get_async_session_factory),
+):
+    """
+    Import communes from a CSV file sent as the request body (INSEE style: code postal, ville, département).
+    
+    Parameters:
+    - request: Request - The CSV file as raw request body, header line first
+    - chunk_size: int - Number of rows written per transaction (defaults to DB_BULK_CHUNK_SIZE)
+    - create_departements: bool - Create unknown departements instead of rejecting their rows
+    - encoding: str - Character encoding of the file
+    - session_factory: async_sessionmaker - Database session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: One JSON line per committed chunk (running totals and rejected rows of the chunk), then a summary line with "done": true
+    
+    Raises:
+    - HTTPException 400: If the CSV header lacks a required column, or the file cannot be decoded
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE)
+    async for data in request.stream():
+        body.write(data)
+    body.seek(0)
+    try:
+        lines = io.TextIOWrapper(body, encoding=encoding, newline="")
+    except LookupError as e:
+        body.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    session = session_factory()
+    progress = AsyncCommuneImportService(session, chunk_size, create_departements).import_csv(lines)
+    try:
+        first = await anext(progress)
+    except BaseException as e:
+        await session.close()
+        lines.close()
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        raise
+
+    async def stream():
+        try:
+            yield json.dumps(first) + "\n"
+            async for event in progress:
+                yield json.dumps(event) + "\n"
+        except ValueError as e:
+            # Already committed chunks are kept: report where the import stopped
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            await progress.aclose()
+            await session.close()
+            lines.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 @router.patch("/{id}", response_model=CommuneRead,responses={
     404:{"description":"Commune id non trouvé"}
 })
-def patch_commune(id: int, commune: CommuneUpdate, session: Session = Depends(get_db)):
+async def patch_commune(id: int, commune: CommuneUpdate, session: AsyncSession = Depends(get_async_db)):
     """
     Partially update a commune's information.
     
     Parameters:
     - id: int - ID of the commune to update
     - commune: CommuneUpdate - Commune data for partial update
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - CommuneRead: The updated commune object
@@ -78,21 +232,36 @@ def patch_commune(id: int, commune: CommuneUpdate, session: Session = Depends(ge
     Raises:
     - HTTPException 404: If commune is not found
     """
-    created_commune = CommuneRepository(session).update_commune(id, commune.model_dump(exclude_unset=True))
+    created_commune = await AsyncCommuneRepository(session).update_commune(id, commune.model_dump(exclude_unset=True))
     if not created_commune:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"commune :{id} non trouvé")
     return created_commune
 
+@router.delete("/", response_model=BulkDeleteRead)
+async def delete_communes_bulk(ids: list[int] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Delete several communes at once.
+    
+    Parameters:
+    - ids: list[int] - IDs of the communes to delete, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkDeleteRead: Number of deleted communes (unknown IDs are ignored)
+    """
+    deleted = await AsyncCommuneRepository(session).bulk_delete_communes(ids)
+    return BulkDeleteRead(deleted=deleted)
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT,responses={
     404:{"description":"Commune id non trouvé"}
 })
-def delete_commune(id: int, session: Session = Depends(get_db)):
+async def delete_commune(id: int, session: AsyncSession = Depends(get_async_db)):
     """
     Delete a commune by ID.
     
     Parameters:
     - id: int - ID of the commune to delete
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - None: Empty response with status code 204
@@ -100,7 +269,7 @@ def delete_commune(id: int, session: Session = Depends(get_db)):
     Raises:
     - HTTPException 404: If commune is not found
     """
-    commune = CommuneRepository(session).delete_commune(id)
+    commune = await AsyncCommuneRepository(session).delete_commune(id)
     if not commune:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"commune:{id} non trouvé")
     return commune
\ No newline at end of file
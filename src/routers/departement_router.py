@@ -1,78 +1,143 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlmodel import Session
-from ..database import get_db
-from ..models import Departement, DepartementCreate, DepartementRead, DepartementUpdate
-from ..repositories import DepartementRepository
+from fastapi import APIRouter, Depends, Query, HTTPException, status, Request, Response, Body
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_db, get_async_read_db, get_async_read_session_factory, BULK_CONFIG
+from ..pagination import cursor_param, set_next_cursor
+from ..etag import not_modified
+from ..serialization import json_response
+from ..export import ExportFormat, export_response
+from ..models import Departement, DepartementCreate, DepartementRead, DepartementUpdate, BulkCreateRead, UpsertRead, BulkDeleteRead
+from ..repositories import AsyncDepartementRepository
 
 # Create an APIRouter instance for department-related endpoints
 router = APIRouter(prefix="/departement", tags=['Departement'])
 
 @router.get("/", response_model=list[DepartementRead])
-def get_all_departements(offset: int = 0, limit: int = Query(default=100, le=100), session: Session = Depends(get_db)) -> list[Departement]:
+async def get_all_departements(request: Request, response: Response, offset: int = 0, limit: int = Query(default=100, le=100), after: str | None = Depends(cursor_param(str)), session: AsyncSession = Depends(get_async_read_db)) -> list[Departement]:
     """
     Retrieve all departments with pagination support.
     
     Parameters:
     - offset: int - Number of items to skip (for pagination)
     - limit: int - Maximum number of items to return (max 100)
-    - session: Session - Database session dependency
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page (takes precedence over offset)
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - list[DepartementRead]: List of department objects
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     """
-    return DepartementRepository(session).get_all_departement(limit, offset)
+    items = await AsyncDepartementRepository(session).get_all_departement(limit, offset, after)
+    set_next_cursor(response, items, "departement_code", limit)
+    return not_modified(request, response, items) or json_response(response, items)
+
+@router.get("/export", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "Export complet de la table"}
+})
+async def export_departements(format: ExportFormat = "ndjson", session_factory = Depends(get_async_read_session_factory)):
+    """
+    Export all departments, streamed from a server-side cursor.
+    
+    Parameters:
+    - format: str - Export format, ndjson (one JSON object per line) or csv (with a header line)
+    - session_factory: async_sessionmaker - Read session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: Every department row, in ID order
+    """
+    return export_response(session_factory, Departement, format)
 
 @router.get("/{id}", response_model=DepartementRead,responses={
     404:{"description":"Departement id non trouvé"}
 })
-def get_departement(id: int, session: Session = Depends(get_db)):
+async def get_departement(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific department by ID.
     
     Parameters:
     - id: int - ID of the department to retrieve
-    - session: Session - Database session dependency
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - DepartementRead: The requested department object
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     
     Raises:
     - HTTPException 404: If department is not found
     
     """
-    departement = DepartementRepository(session).get_departement(id)
+    departement = await AsyncDepartementRepository(session).get_departement(id)
     if not departement:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"departement :{id} non trouvé")
-    return departement
+    return not_modified(request, response, departement) or departement
 
 @router.post("/", response_model=DepartementRead, status_code=status.HTTP_201_CREATED)
-def post_departement(departement: DepartementCreate, session: Session = Depends(get_db)):
+async def post_departement(departement: DepartementCreate, session: AsyncSession = Depends(get_async_db)):
     """
     Create a new department.
     
     Parameters:
     - departement: DepartementUpdate - Department data for creation
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - DepartementRead: The created department object
     
     """
     departement_instance = Departement.model_validate(departement)
-    created_departement = DepartementRepository(session).create_departement(departement_instance)
+    created_departement = await AsyncDepartementRepository(session).create_departement(departement_instance)
     return created_departement
 
+@router.post("/bulk", response_model=BulkCreateRead, status_code=status.HTTP_201_CREATED)
+async def post_departements_bulk(departements: list[DepartementCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create several departments at once.
+    
+    Parameters:
+    - departements: list[DepartementCreate] - Data of each departement to create (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkCreateRead: Number of created departments and their IDs, in request order
+    """
+    ids = await AsyncDepartementRepository(session).bulk_create_departements([departement.model_dump() for departement in departements])
+    return BulkCreateRead(created=len(ids), ids=ids)
+
+@router.put("/bulk", response_model=UpsertRead, responses={
+    400:{"description":"Clé naturelle manquante"}
+})
+async def put_departements_bulk(departements: list[DepartementCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create or update several departments at once, identified by departement_code.
+    
+    Parameters:
+    - departements: list[DepartementCreate] - Data of each department to create or update (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - UpsertRead: Number of inserted and of updated departments
+    
+    Raises:
+    - HTTPException 400: If a department has an empty natural key, or if the database has no native upsert
+    """
+    try:
+        inserted, updated = await AsyncDepartementRepository(session).upsert_departements([departement.model_dump() for departement in departements])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return UpsertRead(inserted=inserted, updated=updated)
+
 @router.patch("/{id}", response_model=DepartementRead,responses={
     404:{"description":"Departement id non trouvé"}
 })
-def patch_departement(id: int, departement : DepartementUpdate, session: Session = Depends(get_db)):
+async def patch_departement(id: int, departement : DepartementUpdate, session: AsyncSession = Depends(get_async_db)):
     """
     Partially update a department's information.
     
     Parameters:
     - id: int - ID of the department to update
     - departement: DepartementUpdate - Department data for partial update
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - DepartementRead: The updated department object
@@ -81,21 +146,36 @@ def patch_departement(id: int, departement : DepartementUpdate, session: Session
     - HTTPException 404: If department is not found
     
     """
-    created_departement = DepartementRepository(session).update_departement(id, departement.model_dump(exclude_unset=True))
+    created_departement = await AsyncDepartementRepository(session).update_departement(id, departement.model_dump(exclude_unset=True))
     if not created_departement:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"departement :{id} non trouvé")
     return created_departement
 
+@router.delete("/", response_model=BulkDeleteRead)
+async def delete_departements_bulk(ids: list[str] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Delete several departments at once.
+    
+    Parameters:
+    - ids: list[str] - IDs of the departments to delete, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkDeleteRead: Number of deleted departments (unknown IDs are ignored)
+    """
+    deleted = await AsyncDepartementRepository(session).bulk_delete_departements(ids)
+    return BulkDeleteRead(deleted=deleted)
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT,responses={
     404:{"description":"Departement id non trouvé"}
 })
-def delete_departement(id: int, session: Session = Depends(get_db)):
+async def delete_departement(id: int, session: AsyncSession = Depends(get_async_db)):
     """
     Delete a department by ID.
     
     Parameters:
     - id: int - ID of the department to delete
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - None: Empty response with status code 204
@@ -104,7 +184,7 @@ def delete_departement(id: int, session: Session = Depends(get_db)):
     - HTTPException 404: If department is not found
     
     """
-    departement = DepartementRepository(session).delete_departement(id)
+    departement = await AsyncDepartementRepository(session).delete_departement(id)
     if not departement:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"departement:{id} non trouvé")
-    return DepartementRepository(session).delete_departement(id)
\ No newline at end of file
+    return departement
\ No newline at end of file
@@ -1,78 +1,120 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlmodel import Session
-from ..database import get_db
-from ..models import DetailColis, DetailColisCreate, DetailColisRead, DetailColisUpdate
-from ..repositories import DetailColisRepository
+from fastapi import APIRouter, Depends, Query, HTTPException, status, Request, Response, Body
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_db, get_async_read_db, get_async_read_session_factory, BULK_CONFIG
+from ..pagination import cursor_param, set_next_cursor
+from ..etag import not_modified
+from ..serialization import json_response
+from ..export import ExportFormat, export_response
+from ..models import DetailColis, DetailColisCreate, DetailColisRead, DetailColisUpdate, BulkCreateRead, BulkDeleteRead
+from ..repositories import AsyncDetailColisRepository
 
 # Create an APIRouter instance for package detail (DetailColis) endpoints
 router = APIRouter(prefix="/detail_colis", tags=['DetailColis'])
 
 @router.get("/", response_model=list[DetailColisRead])
-def get_all_detail_colis(offset: int = 0, limit: int = Query(default=100, le=100), session: Session = Depends(get_db)) -> list[DetailColis]:
+async def get_all_detail_colis(request: Request, response: Response, offset: int = 0, limit: int = Query(default=100, le=100), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)) -> list[DetailColis]:
     """
     Retrieve all package details with pagination support.
     
     Parameters:
     - offset: int - Number of items to skip (pagination offset)
     - limit: int - Maximum number of items to return (max 100)
-    - session: Session - Database session dependency
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page (takes precedence over offset)
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - list[DetailColisRead]: List of package detail objects
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     """
-    return DetailColisRepository(session).get_all_detail_colis(limit, offset)
+    items = await AsyncDetailColisRepository(session).get_all_detail_colis(limit, offset, after)
+    set_next_cursor(response, items, "detail_colis_id", limit)
+    return not_modified(request, response, items) or json_response(response, items)
+
+@router.get("/export", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "Export complet de la table"}
+})
+async def export_detail_colis(format: ExportFormat = "ndjson", session_factory = Depends(get_async_read_session_factory)):
+    """
+    Export all package details, streamed from a server-side cursor.
+    
+    Parameters:
+    - format: str - Export format, ndjson (one JSON object per line) or csv (with a header line)
+    - session_factory: async_sessionmaker - Read session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: Every package detail row, in ID order
+    """
+    return export_response(session_factory, DetailColis, format)
 
 @router.get("/{id}", response_model=DetailColisRead,responses={
     404:{"description":"Colis detail id non trouvé"}
 })
-def get_detail_colis(id: int, session: Session = Depends(get_db)):
+async def get_detail_colis(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific package detail by ID.
     
     Parameters:
     - id: int - ID of the package detail to retrieve
-    - session: Session - Database session dependency
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - DetailColisRead: The requested package detail object
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     
     Raises:
     - HTTPException 404: If package detail is not found
     """
-    detail_colis = DetailColisRepository(session).get_detail_colis(id)
+    detail_colis = await AsyncDetailColisRepository(session).get_detail_colis(id)
     if not detail_colis:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Detail Colis: {id} non trouvé")
-    return detail_colis
+    return not_modified(request, response, detail_colis) or detail_colis
 
 @router.post("/", response_model=DetailColisRead, status_code=status.HTTP_201_CREATED,responses={
     404:{"description":"Colis detail id non trouvé"}
 })
-def post_detail_colis(detail_colis: DetailColisCreate, session: Session = Depends(get_db)):
+async def post_detail_colis(detail_colis: DetailColisCreate, session: AsyncSession = Depends(get_async_db)):
     """
     Create a new package detail.
     
     Parameters:
     - detail_colis: DetailColisCreate - Package detail data for creation
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - DetailColisRead: The created package detail object
     """
     detail_colis_instance = DetailColis.model_validate(detail_colis)
-    created_detail_colis = DetailColisRepository(session).create_detail_colis(detail_colis_instance)
+    created_detail_colis = await AsyncDetailColisRepository(session).create_detail_colis(detail_colis_instance)
     return created_detail_colis
 
+@router.post("/bulk", response_model=BulkCreateRead, status_code=status.HTTP_201_CREATED)
+async def post_detail_colis_bulk(detail_colis: list[DetailColisCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create several package details at once.
+    
+    Parameters:
+    - detail_colis: list[DetailColisCreate] - Data of each detail_colis to create (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkCreateRead: Number of created package details and their IDs, in request order
+    """
+    ids = await AsyncDetailColisRepository(session).bulk_create_detail_colis([detail_colis.model_dump() for detail_colis in detail_colis])
+    return BulkCreateRead(created=len(ids), ids=ids)
+
 @router.patch("/{id}", response_model=DetailColisRead,responses={
     404:{"description":"Colis detail id non trouvé"}
 })
-def patch_detail_colis(id: int, detail_colis: DetailColisUpdate, session: Session = Depends(get_db)):
+async def patch_detail_colis(id: int, detail_colis: DetailColisUpdate, session: AsyncSession = Depends(get_async_db)):
     """
     Partially update a package detail's information.
     
     Parameters:
     - id: int - ID of the package detail to update
     - detail_colis: DetailColisUpdate - Package detail data for partial update
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - The updated package detail object
@@ -81,21 +123,36 @@ def patch_detail_colis(id: int, detail_colis: DetailColisUpdate, session: Sessio
     - HTTPException 404: If package detail is not found
     
     """
-    created_detail_colis = DetailColisRepository(session).update_detail_colis(id, detail_colis.model_dump(exclude_unset=True))
+    created_detail_colis = await AsyncDetailColisRepository(session).update_detail_colis(id, detail_colis.model_dump(exclude_unset=True))
     if not created_detail_colis:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Detail Colis: {id} non trouvé")
     return created_detail_colis
 
+@router.delete("/", response_model=BulkDeleteRead)
+async def delete_detail_colis_bulk(ids: list[int] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Delete several package details at once.
+    
+    Parameters:
+    - ids: list[int] - IDs of the package details to delete, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkDeleteRead: Number of deleted package details (unknown IDs are ignored)
+    """
+    deleted = await AsyncDetailColisRepository(session).bulk_delete_detail_colis(ids)
+    return BulkDeleteRead(deleted=deleted)
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT,responses={
     404:{"description":"Colis detail id non trouvé"}
 })
-def delete_detail_colis(id: int, session: Session = Depends(get_db)):
+async def delete_detail_colis(id: int, session: AsyncSession = Depends(get_async_db)):
     """
     Delete a package detail by ID.
     
     Parameters:
     - id: int - ID of the package detail to delete
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - dict: {"ok": True} if successful (though 204 No Content typically returns nothing)
@@ -104,7 +161,7 @@ def delete_detail_colis(id: int, session: Session = Depends(get_db)):
     - HTTPException 404: If package detail is not found
     
     """
-    result: bool = DetailColisRepository(session).delete_detail_colis(id)
+    result: bool = await AsyncDetailColisRepository(session).delete_detail_colis(id)
     if not result:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Detail Colis: {id} non trouvé")
     return {"ok": True}
\ No newline at end of file
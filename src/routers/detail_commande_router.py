@@ -1,76 +1,140 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlmodel import Session
-from ..database import get_db
-from ..models import DetailCommande, DetailCommandeCreate, DetailCommandeRead, DetailCommandeUpdate
-from ..repositories import DetailCommandeRepository
+from fastapi import APIRouter, Depends, Query, HTTPException, status, Request, Response, Body
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_db, get_async_read_db, get_async_read_session_factory, BULK_CONFIG
+from ..pagination import cursor_param, set_next_cursor
+from ..etag import not_modified
+from ..serialization import json_response
+from ..export import ExportFormat, export_response
+from ..models import DetailCommande, DetailCommandeCreate, DetailCommandeRead, DetailCommandeUpdate, DetailCommandeBacklogRead, BulkCreateRead, BulkDeleteRead
+from ..repositories import AsyncDetailCommandeRepository
+from ..services import AsyncFulfilmentBacklogService
 
 # Create an APIRouter instance for order detail (DetailCommande) endpoints
 router = APIRouter(prefix="/detail_commande", tags=['DetailCommande'])
 
 @router.get("/", response_model=list[DetailCommandeRead])
-def get_all_detail_commande(offset: int = 0, limit: int = Query(default=100, le=100), session: Session = Depends(get_db)) -> list[DetailCommande]:
+async def get_all_detail_commande(request: Request, response: Response, offset: int = 0, limit: int = Query(default=100, le=100), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)) -> list[DetailCommande]:
     """
     Retrieve all order details with pagination support.
     
     Parameters:
     - offset: int - Number of items to skip (pagination offset)
     - limit: int - Maximum number of items to return (max 100)
-    - session: Session - Database session dependency
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page (takes precedence over offset)
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - list[DetailCommandeRead]: List of order detail objects
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     """
-    return DetailCommandeRepository(session).get_all_detail_commandes(limit, offset)
+    items = await AsyncDetailCommandeRepository(session).get_all_detail_commandes(limit, offset, after)
+    set_next_cursor(response, items, "detail_commande_id", limit)
+    return not_modified(request, response, items) or json_response(response, items)
+
+@router.get("/export", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "Export complet de la table"}
+})
+async def export_detail_commandes(format: ExportFormat = "ndjson", session_factory = Depends(get_async_read_session_factory)):
+    """
+    Export all order details, streamed from a server-side cursor.
+    
+    Parameters:
+    - format: str - Export format, ndjson (one JSON object per line) or csv (with a header line)
+    - session_factory: async_sessionmaker - Read session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: Every order detail row, in ID order
+    """
+    return export_response(session_factory, DetailCommande, format)
+
+@router.get("/backlog", response_model=list[DetailCommandeBacklogRead])
+async def get_detail_commandes_backlog(request: Request, response: Response, commande_id: int | None = None, client_id: int | None = None, limit: int = Query(default=100, le=1000), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve the fulfilment backlog: the order lines with a quantity not yet put in a colis.
+    
+    Parameters:
+    - commande_id: int - Restrict the backlog to the lines of this order (optional)
+    - client_id: int - Restrict the backlog to the orders of this client (optional)
+    - limit: int - Maximum number of lines to return (max 1000)
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page
+    - session: AsyncSession - Read database session dependency
+    
+    Returns:
+    - list[DetailCommandeBacklogRead]: Ordered, shipped and remaining quantity of each open line, in ID order
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
+    """
+    items = await AsyncFulfilmentBacklogService(session).get_backlog(commande_id, client_id, limit, after)
+    set_next_cursor(response, items, "detail_commande_id", limit)
+    return not_modified(request, response, items) or items
 
 @router.get("/{id}", response_model=DetailCommandeRead,responses={
     404:{"description":"Commande detail id non trouvé"}
 })
-def get_detail_commande(id: int, session: Session = Depends(get_db)):
+async def get_detail_commande(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific order detail by ID.
     
     Parameters:
     - id: int - ID of the order detail to retrieve
-    - session: Session - Database session dependency
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - DetailCommandeRead: The requested order detail object
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     
     Raises:
     - HTTPException 404: If order detail is not found
     """
-    detail_commande = DetailCommandeRepository(session).get_detail_commande(id)
+    detail_commande = await AsyncDetailCommandeRepository(session).get_detail_commande(id)
     if not detail_commande:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Detail Commande: {id} non trouvé")
-    return detail_commande
+    return not_modified(request, response, detail_commande) or detail_commande
 
 @router.post("/", response_model=DetailCommandeRead, status_code=status.HTTP_201_CREATED)
-def post_detail_commande(detail_commande: DetailCommandeCreate, session: Session = Depends(get_db)):
+async def post_detail_commande(detail_commande: DetailCommandeCreate, session: AsyncSession = Depends(get_async_db)):
     """
     Create a new order detail.
     
     Parameters:
     - detail_commande: DetailCommandeCreate - Order detail data for creation
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - DetailCommandeRead: The created order detail object
     """
     detail_commande_instance = DetailCommande.model_validate(detail_commande)
-    created_detail_commande = DetailCommandeRepository(session).create_detail_commande(detail_commande_instance)
+    created_detail_commande = await AsyncDetailCommandeRepository(session).create_detail_commande(detail_commande_instance)
     return created_detail_commande
 
+@router.post("/bulk", response_model=BulkCreateRead, status_code=status.HTTP_201_CREATED)
+async def post_detail_commandes_bulk(detail_commandes: list[DetailCommandeCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create several order details at once.
+    
+    Parameters:
+    - detail_commandes: list[DetailCommandeCreate] - Data of each detail_commande to create (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkCreateRead: Number of created order details and their IDs, in request order
+    """
+    ids = await AsyncDetailCommandeRepository(session).bulk_create_detail_commandes([detail_commande.model_dump() for detail_commande in detail_commandes])
+    return BulkCreateRead(created=len(ids), ids=ids)
+
 @router.patch("/{id}", response_model=DetailCommandeRead,responses={
     404:{"description":"Commande detail id non trouvé"}
 })
-def patch_detail_commande(id: int, detail_commande: DetailCommandeUpdate, session: Session = Depends(get_db)):
+async def patch_detail_commande(id: int, detail_commande: DetailCommandeUpdate, session: AsyncSession = Depends(get_async_db)):
     """
     Partially update an order detail's information.
     
     Parameters:
     - id: int - ID of the order detail to update
     - detail_commande: DetailCommandeUpdate - Order detail data for partial update
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - DetailCommandeRead: The updated order detail object
@@ -78,21 +142,36 @@ def patch_detail_commande(id: int, detail_commande: DetailCommandeUpdate, sessio
     Raises:
     - HTTPException 404: If order detail is not found
     """
-    created_detail_commande = DetailCommandeRepository(session).update_detail_commande(id, detail_commande.model_dump(exclude_unset=True))
+    created_detail_commande = await AsyncDetailCommandeRepository(session).update_detail_commande(id, detail_commande.model_dump(exclude_unset=True))
     if not created_detail_commande:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Detail Commande: {id} non trouvé")
     return created_detail_commande
 
+@router.delete("/", response_model=BulkDeleteRead)
+async def delete_detail_commandes_bulk(ids: list[int] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Delete several order details at once.
+    
+    Parameters:
+    - ids: list[int] - IDs of the order details to delete, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkDeleteRead: Number of deleted order details (unknown IDs are ignored)
+    """
+    deleted = await AsyncDetailCommandeRepository(session).bulk_delete_detail_commandes(ids)
+    return BulkDeleteRead(deleted=deleted)
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT,responses={
     404:{"description":"Commande detail id non trouvé"}
 })
-def delete_detail_commande(id: int, session: Session = Depends(get_db)):
+async def delete_detail_commande(id: int, session: AsyncSession = Depends(get_async_db)):
     """
     Delete an order detail by ID.
     
     Parameters:
     - id: int - ID of the order detail to delete
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - dict: {"ok": True} if successful (though 204 No Content typically returns nothing)
@@ -101,7 +180,7 @@ def delete_detail_commande(id: int, session: Session = Depends(get_db)):
     - HTTPException 404: If order detail is not found
     
     """
-    detail_commande = DetailCommandeRepository(session).delete_detail_commande(id)
+    detail_commande = await AsyncDetailCommandeRepository(session).delete_detail_commande(id)
     if not detail_commande:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Detail Commande: {id} non trouvé")
     return {"ok": True}
\ No newline at end of file
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..metrics import http_metrics
+
+# Create an APIRouter instance for the Prometheus scrape endpoint
+router = APIRouter(tags=['Monitoring'])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Retrieve the HTTP metrics of this worker in Prometheus text format.
+    
+    Returns:
+    - text/plain: Request count by route and status, and per-route histograms of latency,
+      SQL statement count and database time
+    """
+    return PlainTextResponse(http_metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, status
+from ..database import get_pool_status, slow_query_log
+from ..cache import get_cache_stats
+from ..autocomplete import commune_index
+
+# Create an APIRouter instance for monitoring endpoints
+router = APIRouter(prefix="/monitoring", tags=['Monitoring'])
+
+@router.get("/pool")
+async def get_pool():
+    """
+    Retrieve the live state of the database connection pool.
+
+    Returns:
+    - dict: Checked-out, idle and overflow connections, plus checkout wait time statistics
+    """
+    return get_pool_status()
+
+@router.get("/cache")
+async def get_cache():
+    """
+    Retrieve the counters of the in-process reference data caches.
+
+    Returns:
+    - dict: Size, hits, misses, hit ratio, evictions and invalidations of each cache, by table name
+    """
+    return get_cache_stats()
+
+@router.get("/autocomplete")
+async def get_autocomplete():
+    """
+    Retrieve the state of the in-memory commune autocomplete index.
+
+    Returns:
+    - dict: Number of keys, age in seconds, refresh period and whether the next lookup reloads it
+    """
+    return commune_index.snapshot()
+
+@router.get("/slow-queries")
+async def get_slow_queries():
+    """
+    Retrieve the slow-query log of this worker (enabled with SLOW_QUERY_LOG).
+
+    Returns:
+    - dict: Log settings, number of statements recorded since startup, and the kept entries, newest first.
+      Each entry has its duration, issuing method and route, statement, parameter types (values are
+      never recorded) and EXPLAIN output
+    """
+    return slow_query_log.snapshot()
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_slow_queries():
+    """
+    Empty the slow-query log of this worker.
+    """
+    slow_query_log.clear()
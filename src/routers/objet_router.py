@@ -1,76 +1,141 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session
-from ..database import get_db
-from ..models import Objet, ObjetCreate, ObjetRead, ObjetUpdate
-from ..repositories import ObjetRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response, Body
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_db, get_async_read_db, get_async_read_session_factory, BULK_CONFIG
+from ..pagination import cursor_param, set_next_cursor
+from ..etag import not_modified
+from ..serialization import json_response
+from ..export import ExportFormat, export_response
+from ..models import Objet, ObjetCreate, ObjetRead, ObjetUpdate, BulkCreateRead, UpsertRead, ObjetUpsert, BulkDeleteRead
+from ..repositories import AsyncObjetRepository
 
 # Create an APIRouter instance for object (Objet) endpoints
 router = APIRouter(prefix="/objet", tags=['Objet'])
 
 @router.get("/", response_model=list[ObjetRead])
-def get_all_objet(offset: int = 0, limit: int = Query(default=100, le=100), session: Session = Depends(get_db)) -> list[Objet]:
+async def get_all_objet(request: Request, response: Response, offset: int = 0, limit: int = Query(default=100, le=100), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)) -> list[Objet]:
     """
     Retrieve all objects with pagination support.
     
     Parameters:
     - offset: int - Number of items to skip (pagination offset)
     - limit: int - Maximum number of items to return (max 100)
-    - session: Session - Database session dependency
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page (takes precedence over offset)
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - list[ObjetRead]: List of object records
+    - X-Next-Cursor header: cursor of the next page, when the page is full
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     """
-    return ObjetRepository(session).get_all_objets(limit, offset)
+    items = await AsyncObjetRepository(session).get_all_objets(limit, offset, after)
+    set_next_cursor(response, items, "objet_id", limit)
+    return not_modified(request, response, items) or json_response(response, items)
+
+@router.get("/export", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "Export complet de la table"}
+})
+async def export_objets(format: ExportFormat = "ndjson", session_factory = Depends(get_async_read_session_factory)):
+    """
+    Export all objects, streamed from a server-side cursor.
+    
+    Parameters:
+    - format: str - Export format, ndjson (one JSON object per line) or csv (with a header line)
+    - session_factory: async_sessionmaker - Read session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: Every object row, in ID order
+    """
+    return export_response(session_factory, Objet, format)
 
 @router.get("/{id}", response_model=ObjetRead,responses={
     404:{"description":"Commande detail id non trouvé"}
 })
-def get_objet(id: int, session: Session = Depends(get_db)):
+async def get_objet(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific object by ID.
     
     Parameters:
     - id: int - ID of the object to retrieve
-    - session: Session - Database session dependency
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - ObjetRead: The requested object record
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     
     Raises:
     - HTTPException 404: If object is not found
     """
-    objet = ObjetRepository(session).get_objet(id)
+    objet = await AsyncObjetRepository(session).get_objet(id)
     if not objet:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"objet: {id} non trouvé")
-    return objet
+    return not_modified(request, response, objet) or objet
 
 @router.post("/", response_model=ObjetRead, status_code=status.HTTP_201_CREATED)
-def post_objet(objet: ObjetCreate, session: Session = Depends(get_db)):
+async def post_objet(objet: ObjetCreate, session: AsyncSession = Depends(get_async_db)):
     """
     Create a new object.
     
     Parameters:
     - objet: ObjetCreate - Object data for creation
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - ObjetRead: The created object record
     """
     objet_instance = Objet.model_validate(objet)
-    created_objet = ObjetRepository(session).create_objet(objet_instance)
+    created_objet = await AsyncObjetRepository(session).create_objet(objet_instance)
     return created_objet
 
+@router.post("/bulk", response_model=BulkCreateRead, status_code=status.HTTP_201_CREATED)
+async def post_objets_bulk(objets: list[ObjetCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create several objects at once.
+    
+    Parameters:
+    - objets: list[ObjetCreate] - Data of each objet to create (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkCreateRead: Number of created objects and their IDs, in request order
+    """
+    ids = await AsyncObjetRepository(session).bulk_create_objets([objet.model_dump() for objet in objets])
+    return BulkCreateRead(created=len(ids), ids=ids)
+
+@router.put("/bulk", response_model=UpsertRead, responses={
+    400:{"description":"Clé naturelle manquante"}
+})
+async def put_objets_bulk(objets: list[ObjetUpsert] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create or update several objects at once, identified by objet_id.
+    
+    Parameters:
+    - objets: list[ObjetUpsert] - Data of each object to create or update (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - UpsertRead: Number of inserted and of updated objects
+    
+    Raises:
+    - HTTPException 400: If a object has an empty natural key, or if the database has no native upsert
+    """
+    try:
+        inserted, updated = await AsyncObjetRepository(session).upsert_objets([objet.model_dump() for objet in objets])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return UpsertRead(inserted=inserted, updated=updated)
+
 @router.patch("/{id}", response_model=ObjetRead,responses={
     404:{"description":"Commande detail id non trouvé"}
 })
-def patch_objet(id: int, objet: ObjetUpdate, session: Session = Depends(get_db)):
+async def patch_objet(id: int, objet: ObjetUpdate, session: AsyncSession = Depends(get_async_db)):
     """
     Partially update an object's information.
     
     Parameters:
     - id: int - ID of the object to update
     - objet: ObjetUpdate - Object data for partial update
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - ObjetRead: The updated object record
@@ -78,21 +143,36 @@ def patch_objet(id: int, objet: ObjetUpdate, session: Session = Depends(get_db))
     Raises:
     - HTTPException 404: If object is not found
     """
-    created_objet = ObjetRepository(session).update_objet(id, objet.model_dump(exclude_unset=True))
+    created_objet = await AsyncObjetRepository(session).update_objet(id, objet.model_dump(exclude_unset=True))
     if not created_objet:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Objet: {id} non trouvé")
     return created_objet
 
+@router.delete("/", response_model=BulkDeleteRead)
+async def delete_objets_bulk(ids: list[int] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Delete several objects at once.
+    
+    Parameters:
+    - ids: list[int] - IDs of the objects to delete, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkDeleteRead: Number of deleted objects (unknown IDs are ignored)
+    """
+    deleted = await AsyncObjetRepository(session).bulk_delete_objets(ids)
+    return BulkDeleteRead(deleted=deleted)
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT,responses={
     404:{"description":"Objet id non trouvé"}
 })
-def delete_objet(id: int, session: Session = Depends(get_db)):
+async def delete_objet(id: int, session: AsyncSession = Depends(get_async_db)):
     """
     Delete an object by ID.
     
     Parameters:
     - id: int - ID of the object to delete
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - dict: {"ok": True} if successful (though 204 No Content typically returns nothing)
@@ -101,6 +181,6 @@ def delete_objet(id: int, session: Session = Depends(get_db)):
     - HTTPException 404: If object is not found
 
     """
-    if not ObjetRepository(session).delete_objet(id):
+    if not await AsyncObjetRepository(session).delete_objet(id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Objet: {id} non trouvé")
     return {"ok": True}
\ No newline at end of file
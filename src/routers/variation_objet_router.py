@@ -1,77 +1,119 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session
-from ..database import get_db
-from ..models import VariationObjet, VariationObjetCreate, VariationObjetRead, VariationObjetUpdate
-from ..repositories import VariationObjetRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response, Body
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_db, get_async_read_db, get_async_read_session_factory, BULK_CONFIG
+from ..pagination import cursor_param, set_next_cursor
+from ..etag import not_modified
+from ..serialization import json_response
+from ..export import ExportFormat, export_response
+from ..models import VariationObjet, VariationObjetCreate, VariationObjetRead, VariationObjetUpdate, BulkCreateRead, BulkDeleteRead
+from ..repositories import AsyncVariationObjetRepository
 
 # Create an APIRouter instance for object variation endpoints
 router = APIRouter(prefix="/variation_objet", tags=['VariationObjet'])
 
 @router.get("/", response_model=list[VariationObjetRead])
-def get_all_variation_objets(offset: int = 0, limit: int = Query(default=100, le=100), session: Session = Depends(get_db)) -> list[VariationObjet]:
+async def get_all_variation_objets(request: Request, response: Response, offset: int = 0, limit: int = Query(default=100, le=100), after: int | None = Depends(cursor_param(int)), session: AsyncSession = Depends(get_async_read_db)) -> list[VariationObjet]:
     """
     Retrieve all object variations with pagination support.
     
     Parameters:
     - offset: int - Number of items to skip (pagination offset)
     - limit: int - Maximum number of items to return (max 100)
-    - session: Session - Database session dependency
+    - cursor: str - Opaque cursor from the X-Next-Cursor header of the previous page (takes precedence over offset)
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - list[VariationObjetRead]: List of object variation records
+    - X-Next-Cursor header: cursor of the next page, when the page is full
     
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     """
-    return VariationObjetRepository(session).get_all_variation_objets(limit, offset)
+    items = await AsyncVariationObjetRepository(session).get_all_variation_objets(limit, offset, after)
+    set_next_cursor(response, items, "variation_objet_id", limit)
+    return not_modified(request, response, items) or json_response(response, items)
+
+@router.get("/export", response_class=StreamingResponse, responses={
+    200:{"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "Export complet de la table"}
+})
+async def export_variation_objets(format: ExportFormat = "ndjson", session_factory = Depends(get_async_read_session_factory)):
+    """
+    Export all object variations, streamed from a server-side cursor.
+    
+    Parameters:
+    - format: str - Export format, ndjson (one JSON object per line) or csv (with a header line)
+    - session_factory: async_sessionmaker - Read session factory dependency (the stream opens its own session)
+    
+    Returns:
+    - StreamingResponse: Every object variation row, in ID order
+    """
+    return export_response(session_factory, VariationObjet, format)
 
 @router.get("/{id}", response_model=VariationObjetRead,responses={
     404: {"description": "Variation objet id non trouvé"}})
-def get_variation_objet(id: int, session: Session = Depends(get_db)):
+async def get_variation_objet(id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific object variation by ID.
     
     Parameters:
     - id: int - ID of the object variation to retrieve
-    - session: Session - Database session dependency
+    - session: AsyncSession - Read database session dependency
     
     Returns:
     - VariationObjetRead: The requested object variation record
+    - ETag header: strong validator of the response; 304 Not Modified without body when it matches If-None-Match
     
     Raises:
     - HTTPException 404: If object variation is not found
     
     """
-    variation_objet = VariationObjetRepository(session).get_variation_objet(id)
+    variation_objet = await AsyncVariationObjetRepository(session).get_variation_objet(id)
     if not variation_objet:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Variation objet: {id} non trouvé")
-    return variation_objet
+    return not_modified(request, response, variation_objet) or variation_objet
 
 @router.post("/", response_model=VariationObjetRead, status_code=status.HTTP_201_CREATED)
-def post_variation_objet(variation_objet: VariationObjetCreate, session: Session = Depends(get_db)):
+async def post_variation_objet(variation_objet: VariationObjetCreate, session: AsyncSession = Depends(get_async_db)):
     """
     Create a new object variation.
     
     Parameters:
     - variation_objet: VariationObjetCreate - Object variation data for creation
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - VariationObjetRead: The created object variation record
     
     """
     variation_objet_instance = VariationObjet.model_validate(variation_objet)
-    created_variation_objet = VariationObjetRepository(session).create_variation_objet(variation_objet_instance)
+    created_variation_objet = await AsyncVariationObjetRepository(session).create_variation_objet(variation_objet_instance)
     return created_variation_objet
 
+@router.post("/bulk", response_model=BulkCreateRead, status_code=status.HTTP_201_CREATED)
+async def post_variation_objets_bulk(variation_objets: list[VariationObjetCreate] = Body(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Create several object variations at once.
+    
+    Parameters:
+    - variation_objets: list[VariationObjetCreate] - Data of each variation_objet to create (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkCreateRead: Number of created object variations and their IDs, in request order
+    """
+    ids = await AsyncVariationObjetRepository(session).bulk_create_variation_objets([variation_objet.model_dump() for variation_objet in variation_objets])
+    return BulkCreateRead(created=len(ids), ids=ids)
+
 @router.patch("/{id}", response_model=VariationObjetRead, responses={
     404: {"description": "Variation id non trouvé"}})
-def patch_variation_objet(id: int, variation_objet: VariationObjetUpdate, session: Session = Depends(get_db)):
+async def patch_variation_objet(id: int, variation_objet: VariationObjetUpdate, session: AsyncSession = Depends(get_async_db)):
     """
     Partially update an object variation's information.
     
     Parameters:
     - id: int - ID of the object variation to update
     - variation_objet: VariationObjetUpdate - Object variation data for partial update
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - VariationObjetRead: The updated object variation record
@@ -80,20 +122,35 @@ def patch_variation_objet(id: int, variation_objet: VariationObjetUpdate, sessio
     - HTTPException 404: If object variation is not found
     
     """
-    created_variation_objet = VariationObjetRepository(session).update_variation_objet(id, variation_objet.model_dump(exclude_unset=True))
+    created_variation_objet = await AsyncVariationObjetRepository(session).update_variation_objet(id, variation_objet.model_dump(exclude_unset=True))
     if not created_variation_objet:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Variation objet: {id} non trouvé")
     return created_variation_objet
 
+@router.delete("/", response_model=BulkDeleteRead)
+async def delete_variation_objets_bulk(ids: list[int] = Query(max_length=BULK_CONFIG["max_items"]), session: AsyncSession = Depends(get_async_db)):
+    """
+    Delete several object variations at once.
+    
+    Parameters:
+    - ids: list[int] - IDs of the object variations to delete, repeated in the query string (max DB_BULK_MAX_ITEMS)
+    - session: AsyncSession - Database session dependency
+    
+    Returns:
+    - BulkDeleteRead: Number of deleted object variations (unknown IDs are ignored)
+    """
+    deleted = await AsyncVariationObjetRepository(session).bulk_delete_variation_objets(ids)
+    return BulkDeleteRead(deleted=deleted)
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT,responses={
     404: {"description": "Variation objet id non trouvé"}})
-def delete_variation_objet(id: int, session: Session = Depends(get_db)):
+async def delete_variation_objet(id: int, session: AsyncSession = Depends(get_async_db)):
     """
     Delete an object variation by ID.
     
     Parameters:
     - id: int - ID of the object variation to delete
-    - session: Session - Database session dependency
+    - session: AsyncSession - Database session dependency
     
     Returns:
     - None: Empty response with status code 204
@@ -102,6 +159,6 @@ def delete_variation_objet(id: int, session: Session = Depends(get_db)):
     - HTTPException 404: If object variation is not found
     
     """
-    if not VariationObjetRepository(session).delete_variation_objet(id):
+    if not await AsyncVariationObjetRepository(session).delete_variation_objet(id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Variation objet: {id} non trouvé")
     return {"ok": True}
\ No newline at end of file
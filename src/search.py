@@ -0,0 +1,57 @@
+import re
+import unicodedata
+
+# Alphabet des textes normalisés, dans l'ordre de tri commun au binaire (SQLite) et aux collations MySQL
+NORMALIZED_ALPHABET = " 0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def normalize_text(value: str | None) -> str | None:
+    """
+    Normalise un texte pour la recherche : minuscules, sans accents, ponctuation remplacée
+    par des espaces, espaces consécutifs réduits. "  Le Bœuf-Éric " devient "le boeuf eric".
+    """
+    if value is None:
+        return None
+    value = unicodedata.normalize("NFKD", value.replace("œ", "oe").replace("Œ", "oe").replace("æ", "ae").replace("Æ", "ae"))
+    value = value.encode("ascii", "ignore").decode().lower()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", value).split()) or None
+
+
+def normalize_email(value: str | None) -> str | None:
+    """
+    Normalise une adresse email : sans espaces autour, en minuscules.
+    """
+    if value is None:
+        return None
+    return value.strip().lower() or None
+
+
+def normalize_phone(value: str | None) -> str | None:
+    """
+    Normalise un numéro de téléphone français : chiffres seuls, indicatif +33 ou 0033 remplacé par 0.
+    "+33 6 01 02 03 04" devient "0601020304".
+    """
+    if value is None:
+        return None
+    digits = re.sub(r"\D", "", value)
+    for prefix in ("0033", "33"):
+        if digits.startswith(prefix) and len(digits) == len(prefix) + 9:
+            digits = "0" + digits[len(prefix):]
+            break
+    return digits or None
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """
+    Retourne la plus petite chaîne normalisée qui suit toutes celles commençant par le préfixe,
+    ou None s'il n'y en a pas ("dup" donne "duq", "duz" donne "dv").
+
+    Une recherche par préfixe s'écrit alors `colonne >= préfixe AND colonne < borne` : une
+    plage d'index, quels que soient la base et le réglage de LIKE (sensible ou non à la casse).
+    """
+    while prefix:
+        position = NORMALIZED_ALPHABET.find(prefix[-1])
+        if 0 <= position < len(NORMALIZED_ALPHABET) - 1:
+            return prefix[:-1] + NORMALIZED_ALPHABET[position + 1]
+        prefix = prefix[:-1]
+    return None
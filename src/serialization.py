@@ -0,0 +1,35 @@
+from decimal import Decimal
+import orjson
+from fastapi import Response
+
+# En-têtes de la réponse injectée à ne pas recopier : ils décrivent le nouveau contenu
+_CONTENT_HEADERS = ("content-length", "content-type")
+
+
+def _default(value):
+    """
+    Sérialise les types qu'orjson ne connaît pas, comme le fait pydantic : Decimal en chaîne.
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload) -> bytes:
+    """
+    Sérialise une charge utile en JSON avec orjson (dates au format ISO 8601, Decimal en chaîne).
+    """
+    return orjson.dumps(payload, default=_default)
+
+
+def json_response(response: Response, payload) -> Response:
+    """
+    Construit la réponse JSON d'une liste de lignes déjà lues, sérialisée en une seule passe.
+
+    Les lignes ne repassent pas par le response_model de la route (il ne sert plus qu'à la
+    documentation OpenAPI) : elles viennent telles quelles des colonnes de la table.
+    Les en-têtes posés sur la réponse injectée (ETag, X-Next-Cursor) sont recopiés,
+    FastAPI ne les fusionnant pas dans une réponse retournée directement.
+    """
+    headers = {name: value for name, value in response.headers.items() if name not in _CONTENT_HEADERS}
+    return Response(content=dumps(payload), media_type="application/json", headers=headers)
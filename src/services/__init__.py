@@ -1 +1,5 @@
-from .client_service import ClientService
\ No newline at end of file
+from .client_service import ClientService, AsyncClientService
+from .commune_import_service import CommuneImportService, AsyncCommuneImportService
+from .valuation_service import CommandeValuationService, AsyncCommandeValuationService
+from .backlog_service import FulfilmentBacklogService, AsyncFulfilmentBacklogService
+from .postage_service import ColisPostageService, AsyncColisPostageService
\ No newline at end of file
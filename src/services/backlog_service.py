@@ -0,0 +1,145 @@
+from typing import Optional
+from sqlalchemy import func, select
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..models import Commande, DetailCommande, DetailColis, DetailCommandeBacklogRead
+
+
+class FulfilmentBacklogService:
+    """
+    Service class for the fulfilment backlog: the order lines that still have to ship.
+
+    The remaining quantity of a line is its ordered quantity minus the quantities
+    of the colis lines referencing it, whatever the colis. It is computed by the
+    database with one LEFT JOIN on t_details_colis (through the index on
+    fk_detail_commande_id) grouped by order line, and only the lines with a
+    positive remainder are returned.
+
+    Attributes:
+        session (Session): The SQLAlchemy session for database operations.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initializes the FulfilmentBacklogService with a database session.
+
+        Args:
+            session (Session): The SQLAlchemy session to be used for database operations.
+        """
+        self.session = session
+
+    def get_backlog(
+        self,
+        commande_id: Optional[int] = None,
+        client_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> list[DetailCommandeBacklogRead]:
+        """
+        Retrieves the order lines with a quantity left to ship.
+
+        Args:
+            commande_id (Optional[int]): Restricts the backlog to the lines of this order.
+            client_id (Optional[int]): Restricts the backlog to the orders of this client.
+            limit (Optional[int]): The maximum number of lines to return.
+            after (Optional[int]): The ID of the last line of the previous page, for keyset pagination.
+
+        Returns:
+            list[DetailCommandeBacklogRead]: The open lines, in ID order.
+        """
+        return self._get_backlog(self.session, commande_id, client_id, limit, after)
+
+    @staticmethod
+    def _get_backlog(
+        session: Session,
+        commande_id: Optional[int],
+        client_id: Optional[int],
+        limit: Optional[int],
+        after: Optional[int],
+    ) -> list[DetailCommandeBacklogRead]:
+        """
+        Runs the grouped LEFT JOIN of the order lines on the colis lines.
+        """
+        ordered = func.coalesce(DetailCommande.detail_commande_quantitee, 0)
+        shipped = func.coalesce(func.sum(DetailColis.detail_colis_quantitee), 0)
+        statement = (
+            select(
+                DetailCommande.detail_commande_id,
+                DetailCommande.fk_detail_commande_commande_id,
+                Commande.fk_client_id,
+                DetailCommande.fk_detail_commande_variation_objet_id,
+                ordered.label("ordered_quantity"),
+                shipped.label("shipped_quantity"),
+            )
+            .select_from(DetailCommande)
+            .outerjoin(Commande, Commande.commande_id == DetailCommande.fk_detail_commande_commande_id)
+            .outerjoin(DetailColis, DetailColis.fk_detail_commande_id == DetailCommande.detail_commande_id)
+        )
+        if commande_id is not None:
+            statement = statement.where(DetailCommande.fk_detail_commande_commande_id == commande_id)
+        if client_id is not None:
+            statement = statement.where(Commande.fk_client_id == client_id)
+        if after is not None:
+            statement = statement.where(DetailCommande.detail_commande_id > after)
+        statement = (
+            statement
+            # The other selected columns depend on the line (or on its order through the primary key join)
+            .group_by(DetailCommande.detail_commande_id)
+            .having(ordered > shipped)
+            .order_by(DetailCommande.detail_commande_id)
+            .limit(limit)
+        )
+        # SUM is a DECIMAL on MySQL: the quantities are brought back to integers
+        return [
+            DetailCommandeBacklogRead(
+                detail_commande_id=row.detail_commande_id,
+                fk_detail_commande_commande_id=row.fk_detail_commande_commande_id,
+                fk_client_id=row.fk_client_id,
+                fk_detail_commande_variation_objet_id=row.fk_detail_commande_variation_objet_id,
+                ordered_quantity=row.ordered_quantity,
+                shipped_quantity=int(row.shipped_quantity),
+                remaining_quantity=row.ordered_quantity - int(row.shipped_quantity),
+            )
+            for row in session.exec(statement)
+        ]
+
+
+class AsyncFulfilmentBacklogService(FulfilmentBacklogService):
+    """
+    Asynchronous counterpart of FulfilmentBacklogService.
+
+    Runs the same query through an AsyncSession.
+
+    Attributes:
+        session (AsyncSession): The SQLAlchemy async session for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initializes the AsyncFulfilmentBacklogService with an async database session.
+
+        Args:
+            session (AsyncSession): The SQLAlchemy async session to be used for database operations.
+        """
+        super().__init__(session)
+
+    async def get_backlog(
+        self,
+        commande_id: Optional[int] = None,
+        client_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> list[DetailCommandeBacklogRead]:
+        """
+        Retrieves the order lines with a quantity left to ship.
+
+        Args:
+            commande_id (Optional[int]): Restricts the backlog to the lines of this order.
+            client_id (Optional[int]): Restricts the backlog to the orders of this client.
+            limit (Optional[int]): The maximum number of lines to return.
+            after (Optional[int]): The ID of the last line of the previous page, for keyset pagination.
+
+        Returns:
+            list[DetailCommandeBacklogRead]: The open lines, in ID order.
+        """
+        return await self.session.run_sync(self._get_backlog, commande_id, client_id, limit, after)
@@ -1,8 +1,23 @@
 import re
 from typing import Optional
+from sqlalchemy import select, update
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import BULK_CONFIG
 from ..models import ClientCreate, ClientUpdate, ClientRead, Client
-from ..repositories import ClientRepository
+from ..repositories import ClientRepository, AsyncClientRepository
+from ..search import normalize_text, normalize_email, normalize_phone
+
+# Colonnes normalisées de recherche, et fonction de normalisation de chaque colonne source
+SEARCH_COLUMNS = {
+    "client_nom": ("client_nom_norm", normalize_text),
+    "client_prenom": ("client_prenom_norm", normalize_text),
+    "client_email": ("client_email_norm", normalize_email),
+    "client_telephone_fix": ("client_telephone_fix_norm", normalize_phone),
+    "client_telephone_portable": ("client_telephone_portable_norm", normalize_phone),
+}
+# Nombre minimal de chiffres pour qu'une requête sans lettres soit traitée comme un numéro de téléphone
+PHONE_MIN_DIGITS = 6
 
 
 class ClientService:
@@ -19,6 +34,7 @@ class ClientService:
     """
 
     EMAIL_REGEX = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    PHONE_QUERY_REGEX = r'^[0-9 .()+-]+$'
 
     def __init__(self, session: Session):
         """
@@ -30,19 +46,22 @@ class ClientService:
         self.session = session
         self.repository = ClientRepository(session)
 
-    def get_all(self, limit: int, offset: int) -> list[ClientRead]:
+    def get_all(self, limit: int, offset: int, after: int | None = None) -> list[dict]:
         """
         Retrieves all clients with pagination.
 
+        The rows are returned as read, without building ClientRead objects: ClientRead
+        exposes every public column of the table, so the rows are serialized as they are.
+
         Args:
             limit (int): The maximum number of clients to return.
             offset (int): The number of clients to skip before starting to collect the result set.
+            after (int | None): The ID of the last client of the previous page, for keyset pagination.
 
         Returns:
-            list[ClientRead]: A list of ClientRead objects representing the clients.
+            list[dict]: The column values of each client, with the ClientRead field names.
         """
-        clients = self.repository.get_all_clients(limit=limit, offset=offset)
-        return [ClientRead.model_validate(c) for c in clients]
+        return self.repository.get_all_clients(limit=limit, offset=offset, after=after)
 
     def get_by_id(self, client_id: int) -> Optional[ClientRead]:
         """
@@ -57,6 +76,48 @@ class ClientService:
         client = self.repository.get_client(client_id)
         return ClientRead.model_validate(client) if client else None
 
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """
+        Searches clients by name, first name, email or phone number.
+
+        A query containing "@" is matched exactly against the emails, a query made of
+        digits and phone punctuation (at least PHONE_MIN_DIGITS digits) against the fixed
+        and mobile numbers, and any other query against the names and first names, by
+        word prefix. Case, accents and punctuation are ignored in every case.
+
+        Args:
+            query (str): The search text.
+            limit (int): The maximum number of clients to return.
+
+        Returns:
+            list[dict]: The column values of each matching client, by decreasing relevance.
+        """
+        criteria = self._search_criteria(query)
+        return self.repository.search_clients(**criteria, limit=limit) if criteria else []
+
+    def rebuild_search_columns(self, chunk_size: Optional[int] = None) -> int:
+        """
+        Recomputes the normalized search columns of every client.
+
+        Used to fill the columns of clients written before they existed, or after a change
+        of the normalization rules. The clients are read and updated chunk by chunk, in ID
+        order, with one executemany UPDATE per chunk and one commit per chunk.
+
+        Args:
+            chunk_size (Optional[int]): The number of clients per chunk (defaults to DB_BULK_CHUNK_SIZE).
+
+        Returns:
+            int: The number of updated clients.
+        """
+        updated = 0
+        after = 0
+        while True:
+            count, after = self._rebuild_chunk(self.session, after, chunk_size or BULK_CONFIG["chunk_size"])
+            if not count:
+                return updated
+            self.session.commit()
+            updated += count
+
     def create(self, client_data: ClientCreate) -> ClientRead:
         """
         Creates a new client in the database.
@@ -70,13 +131,27 @@ class ClientService:
         Raises:
             ValueError: If required fields are missing or if the email format is invalid.
         """
-        data = client_data.model_dump(exclude_unset=True)
-        self.__validate_required_fields(data)
-        self.__validate_email(data.get("client_email"))
-        formatted_data = Client(**self.__format_data(data))
-        new_client = self.repository.create_client(formatted_data)
+        new_client = self.repository.create_client(self._prepare_create(client_data))
         return ClientRead.model_validate(new_client)
 
+    def create_many(self, clients_data: list[ClientCreate]) -> list[int]:
+        """
+        Creates several clients in the database at once.
+
+        All clients are validated before anything is written, so that a single
+        invalid client rejects the whole batch with every error reported.
+
+        Args:
+            clients_data (list[ClientCreate]): The data for the new clients.
+
+        Returns:
+            list[int]: The IDs of the created clients, in input order.
+
+        Raises:
+            ValueError: If any client has missing required fields or an invalid email format.
+        """
+        return self.repository.bulk_create_clients(self._prepare_create_many(clients_data))
+
     def patch(self, client_id: int, client_data: ClientUpdate) -> Optional[ClientRead]:
         """
         Updates an existing client in the database.
@@ -91,14 +166,8 @@ class ClientService:
         Raises:
             ValueError: If the email format is invalid.
         """
-        if not self.repository.get_client(client_id):
-            return None
-
-        data = client_data.model_dump(exclude_unset=True)
-        self.__validate_email(data.get("client_email"))
-        formatted_data = self.__format_data(data)
-        updated_client = self.repository.update_client(client_id, formatted_data)
-        return ClientRead.model_validate(updated_client)
+        updated_client = self.repository.update_client(client_id, self._prepare_patch(client_data))
+        return ClientRead.model_validate(updated_client) if updated_client else None
 
     def delete(self, client_id: int) -> bool:
         """
@@ -112,11 +181,128 @@ class ClientService:
         """
         return self.repository.delete_client(client_id)
 
+    def delete_many(self, client_ids: list[int]) -> int:
+        """
+        Deletes several clients from the database.
+
+        Args:
+            client_ids (list[int]): The IDs of the clients to delete. Unknown IDs are ignored.
+
+        Returns:
+            int: The number of deleted clients.
+        """
+        return self.repository.bulk_delete_clients(client_ids)
+
+    def _prepare_create(self, client_data: ClientCreate) -> Client:
+        """
+        Validates and formats the data of a new client.
+
+        Args:
+            client_data (ClientCreate): The data for the new client.
+
+        Returns:
+            Client: The Client instance ready to be persisted.
+
+        Raises:
+            ValueError: If required fields are missing or if the email format is invalid.
+        """
+        data = client_data.model_dump(exclude_unset=True)
+        self.__validate_required_fields(data)
+        self.__validate_email(data.get("client_email"))
+        return Client(**self.__format_data(data))
+
+    def _prepare_create_many(self, clients_data: list[ClientCreate]) -> list[dict]:
+        """
+        Validates and formats the data of several new clients in one pass.
+
+        Args:
+            clients_data (list[ClientCreate]): The data for the new clients.
+
+        Returns:
+            list[dict]: The column values of each client, ready to be inserted.
+
+        Raises:
+            ValueError: If any client is invalid, listing the position and error of each one.
+        """
+        rows = []
+        errors = []
+        for index, client_data in enumerate(clients_data):
+            try:
+                rows.append(self._prepare_create(client_data).model_dump(exclude={"client_id"}))
+            except ValueError as e:
+                errors.append(f"client {index}: {e}")
+        if errors:
+            raise ValueError(" ".join(errors))
+        return rows
+
+    def _prepare_patch(self, client_data: ClientUpdate) -> dict:
+        """
+        Validates and formats the data of a client update.
+
+        Args:
+            client_data (ClientUpdate): The data to update the client with.
+
+        Returns:
+            dict: The formatted values to apply.
+
+        Raises:
+            ValueError: If the email format is invalid.
+        """
+        data = client_data.model_dump(exclude_unset=True)
+        self.__validate_email(data.get("client_email"))
+        return self.__format_data(data)
+
+    @classmethod
+    def _search_criteria(cls, query: str) -> Optional[dict]:
+        """
+        Chooses the search criterion of a query and normalizes it.
+
+        Args:
+            query (str): The search text.
+
+        Returns:
+            Optional[dict]: The keyword arguments of ClientRepository.search_clients, or None if
+            nothing searchable is left after normalization.
+        """
+        if "@" in query:
+            email = normalize_email(query)
+            return {"email": email} if email else None
+        phone = normalize_phone(query)
+        if re.match(cls.PHONE_QUERY_REGEX, query) and phone and len(phone) >= PHONE_MIN_DIGITS:
+            return {"phone": phone}
+        text = normalize_text(query)
+        return {"tokens": text.split()} if text else None
+
+    @staticmethod
+    def _rebuild_chunk(session: Session, after: int, chunk_size: int) -> tuple[int, int]:
+        """
+        Recomputes the search columns of the clients following an ID, without committing.
+
+        Returns:
+            tuple[int, int]: The number of updated clients and the last ID of the chunk.
+        """
+        statement = (
+            select(Client.client_id, *(getattr(Client, source) for source in SEARCH_COLUMNS))
+            .where(Client.client_id > after)
+            .order_by(Client.client_id)
+            .limit(chunk_size)
+        )
+        rows = [
+            {"client_id": row.client_id, **{target: normalize(row._mapping[source]) for source, (target, normalize) in SEARCH_COLUMNS.items()}}
+            for row in session.exec(statement)
+        ]
+        if rows:
+            # ORM bulk UPDATE by primary key: one executemany statement
+            session.exec(update(Client).execution_options(synchronize_session=False), params=rows)
+        return len(rows), rows[-1]["client_id"] if rows else after
+
     @staticmethod
     def __format_data(data: dict) -> dict:
         """
         Formats client data by capitalizing the first name and uppercasing the last name.
 
+        The normalized search column of each given field is set along with it.
+
         Args:
             data (dict): The client data to format.
 
@@ -127,6 +313,9 @@ class ClientService:
             data["client_prenom"] = data["client_prenom"].capitalize()
         if "client_nom" in data and data["client_nom"]:
             data["client_nom"] = data["client_nom"].upper()
+        for source, (target, normalize) in SEARCH_COLUMNS.items():
+            if source in data:
+                data[target] = normalize(data[source])
         return data
 
     @classmethod
@@ -157,3 +346,160 @@ class ClientService:
         if not data.get("client_nom") or not data.get("client_prenom"):
             raise ValueError("Client 'nom' and 'prenom' are required.")
 
+
+class AsyncClientService(ClientService):
+    """
+    Asynchronous counterpart of ClientService.
+
+    Shares the validation and formatting rules of ClientService, but relies on
+    AsyncClientRepository and exposes its operations as coroutines.
+
+    Attributes:
+        session (AsyncSession): The SQLAlchemy async session for database operations.
+        repository (AsyncClientRepository): The repository for client-related database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initializes the AsyncClientService with an async database session.
+
+        Args:
+            session (AsyncSession): The SQLAlchemy async session to be used for database operations.
+        """
+        self.session = session
+        self.repository = AsyncClientRepository(session)
+
+    async def get_all(self, limit: int, offset: int, after: int | None = None) -> list[dict]:
+        """
+        Retrieves all clients with pagination.
+
+        The rows are returned as read, without building ClientRead objects: ClientRead
+        exposes every public column of the table, so the rows are serialized as they are.
+
+        Args:
+            limit (int): The maximum number of clients to return.
+            offset (int): The number of clients to skip before starting to collect the result set.
+            after (int | None): The ID of the last client of the previous page, for keyset pagination.
+
+        Returns:
+            list[dict]: The column values of each client, with the ClientRead field names.
+        """
+        return await self.repository.get_all_clients(limit=limit, offset=offset, after=after)
+
+    async def get_by_id(self, client_id: int) -> Optional[ClientRead]:
+        """
+        Retrieves a client by its ID.
+
+        Args:
+            client_id (int): The ID of the client to retrieve.
+
+        Returns:
+            Optional[ClientRead]: A ClientRead object representing the client, or None if not found.
+        """
+        client = await self.repository.get_client(client_id)
+        return ClientRead.model_validate(client) if client else None
+
+    async def search(self, query: str, limit: int = 20) -> list[dict]:
+        """
+        Searches clients by name, first name, email or phone number.
+
+        Args:
+            query (str): The search text.
+            limit (int): The maximum number of clients to return.
+
+        Returns:
+            list[dict]: The column values of each matching client, by decreasing relevance.
+        """
+        criteria = self._search_criteria(query)
+        return await self.repository.search_clients(**criteria, limit=limit) if criteria else []
+
+    async def rebuild_search_columns(self, chunk_size: Optional[int] = None) -> int:
+        """
+        Recomputes the normalized search columns of every client, one commit per chunk.
+
+        Args:
+            chunk_size (Optional[int]): The number of clients per chunk (defaults to DB_BULK_CHUNK_SIZE).
+
+        Returns:
+            int: The number of updated clients.
+        """
+        updated = 0
+        after = 0
+        while True:
+            count, after = await self.session.run_sync(self._rebuild_chunk, after, chunk_size or BULK_CONFIG["chunk_size"])
+            if not count:
+                return updated
+            await self.session.commit()
+            updated += count
+
+    async def create(self, client_data: ClientCreate) -> ClientRead:
+        """
+        Creates a new client in the database.
+
+        Args:
+            client_data (ClientCreate): The data for the new client.
+
+        Returns:
+            ClientRead: A ClientRead object representing the created client.
+
+        Raises:
+            ValueError: If required fields are missing or if the email format is invalid.
+        """
+        new_client = await self.repository.create_client(self._prepare_create(client_data))
+        return ClientRead.model_validate(new_client)
+
+    async def create_many(self, clients_data: list[ClientCreate]) -> list[int]:
+        """
+        Creates several clients in the database at once.
+
+        Args:
+            clients_data (list[ClientCreate]): The data for the new clients.
+
+        Returns:
+            list[int]: The IDs of the created clients, in input order.
+
+        Raises:
+            ValueError: If any client has missing required fields or an invalid email format.
+        """
+        return await self.repository.bulk_create_clients(self._prepare_create_many(clients_data))
+
+    async def patch(self, client_id: int, client_data: ClientUpdate) -> Optional[ClientRead]:
+        """
+        Updates an existing client in the database.
+
+        Args:
+            client_id (int): The ID of the client to update.
+            client_data (ClientUpdate): The data to update the client with.
+
+        Returns:
+            Optional[ClientRead]: A ClientRead object representing the updated client, or None if not found.
+
+        Raises:
+            ValueError: If the email format is invalid.
+        """
+        updated_client = await self.repository.update_client(client_id, self._prepare_patch(client_data))
+        return ClientRead.model_validate(updated_client) if updated_client else None
+
+    async def delete(self, client_id: int) -> bool:
+        """
+        Deletes a client from the database.
+
+        Args:
+            client_id (int): The ID of the client to delete.
+
+        Returns:
+            bool: True if the client was successfully deleted, False otherwise.
+        """
+        return await self.repository.delete_client(client_id)
+
+    async def delete_many(self, client_ids: list[int]) -> int:
+        """
+        Deletes several clients from the database.
+
+        Args:
+            client_ids (list[int]): The IDs of the clients to delete. Unknown IDs are ignored.
+
+        Returns:
+            int: The number of deleted clients.
+        """
+        return await self.repository.bulk_delete_clients(client_ids)
@@ -0,0 +1,312 @@
+import csv
+import re
+import unicodedata
+from typing import AsyncIterator, Iterable, Iterator, Optional
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import BULK_CONFIG
+from ..models import Commune, Departement
+from ..autocomplete import commune_index
+from ..repositories import DepartementRepository, AsyncDepartementRepository
+from ..repositories.commune_repository import commune_cache
+from ..repositories.departement_repository import departement_cache
+from ..repositories.bulk import upsert_many
+
+
+class CommuneImportService:
+    """
+    Service class for importing communes and departements from a CSV file.
+
+    The file is read row by row and written in chunks, each chunk in its own
+    transaction, so that memory use does not depend on the file size. Columns are
+    matched by name, INSEE/La Poste style: postal code, city and departement code,
+    plus an optional departement name. Communes are upserted on their
+    (commune_codepostal, commune_ville) natural key, so a file can be imported again.
+
+    Departement codes are resolved against the codes loaded once from the database
+    before the first chunk. Rows with an unknown departement are rejected, unless
+    create_departements is set, in which case the departement is created.
+
+    Attributes:
+        session (Session): The SQLAlchemy session for database operations.
+        chunk_size (int): The number of rows written per transaction.
+        create_departements (bool): Whether unknown departements are created instead of rejecting their rows.
+    """
+
+    # Accepted header names (normalized: lower case, no accents, "_" separators) for each field
+    COLUMN_ALIASES = {
+        "commune_codepostal": {"commune_codepostal", "code_postal", "codepostal", "cp", "postal_code"},
+        "commune_ville": {"commune_ville", "ville", "commune", "nom_commune", "nom_de_la_commune", "nom_commune_complet"},
+        "departement_code": {"departement_code", "fk_commune_departement", "departement", "code_departement", "code_dep", "dep"},
+        "departement_nom": {"departement_nom", "nom_departement", "nom_dep"},
+    }
+    REQUIRED_COLUMNS = ("commune_codepostal", "commune_ville")
+    DELIMITERS = ",;\t|"
+
+    def __init__(self, session: Session, chunk_size: Optional[int] = None, create_departements: bool = False):
+        """
+        Initializes the CommuneImportService with a database session.
+
+        Args:
+            session (Session): The SQLAlchemy session to be used for database operations.
+            chunk_size (Optional[int]): The number of rows written per transaction (defaults to DB_BULK_CHUNK_SIZE).
+            create_departements (bool): Whether unknown departements are created instead of rejecting their rows.
+        """
+        self.session = session
+        self.chunk_size = chunk_size or BULK_CONFIG["chunk_size"]
+        self.create_departements = create_departements
+
+    def import_csv(self, lines: Iterable[str]) -> Iterator[dict]:
+        """
+        Imports the communes of a CSV file, committing one transaction per chunk.
+
+        Args:
+            lines (Iterable[str]): The lines of the CSV file, header line first.
+
+        Yields:
+            dict: The progress after each chunk, then a final summary (see _summary).
+
+        Raises:
+            ValueError: If the header line lacks a required column.
+        """
+        departements = DepartementRepository(self.session).get_departement_codes()
+        totals = self._new_totals()
+        for chunk in self._read_chunks(lines):
+            communes, new_departements, rejected = self._resolve(chunk, departements)
+            inserted, updated = self._write_chunk(self.session, communes, new_departements)
+            self.session.commit()
+            self._invalidate_caches(new_departements)
+            yield self._progress(totals, chunk, inserted, updated, new_departements, rejected)
+        yield self._summary(totals)
+
+    def _read_chunks(self, lines: Iterable[str]) -> Iterator[list[tuple[int, dict]]]:
+        """
+        Parses the CSV lines into chunks of (line number, row) pairs.
+
+        The delimiter is detected on the header line. Each row holds the known
+        fields only, with surrounding spaces removed.
+
+        Args:
+            lines (Iterable[str]): The lines of the CSV file, header line first.
+
+        Yields:
+            list[tuple[int, dict]]: At most chunk_size parsed rows with their line number.
+
+        Raises:
+            ValueError: If the header line lacks a required column.
+        """
+        lines = iter(lines)
+        header_line = next(lines, "").lstrip("\ufeff")
+        delimiter = max(self.DELIMITERS, key=header_line.count)
+        header = next(csv.reader([header_line], delimiter=delimiter), [])
+        fields = {}
+        for index, name in enumerate(header):
+            field = self._field_for(name)
+            if field and field not in fields:
+                fields[field] = index
+        missing = [column for column in self.REQUIRED_COLUMNS if column not in fields]
+        if missing:
+            raise ValueError(f"CSV header is missing the {', '.join(missing)} column(s).")
+
+        reader = csv.reader(lines, delimiter=delimiter)
+        chunk = []
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            row = {field: values[index].strip() if index < len(values) else "" for field, index in fields.items()}
+            # The header is line 1
+            chunk.append((reader.line_num + 1, row))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _resolve(self, chunk: list[tuple[int, dict]], departements: set[str]) -> tuple[list[dict], dict[str, dict], list[dict]]:
+        """
+        Validates the rows of a chunk and resolves their departement.
+
+        Departements created for this chunk are added to the departements set, so
+        that later chunks find them.
+
+        Args:
+            chunk (list[tuple[int, dict]]): The parsed rows with their line number.
+            departements (set[str]): The known departement codes.
+
+        Returns:
+            tuple[list[dict], dict[str, dict], list[dict]]: The communes to write, the
+            departements to create by code, and the rejected rows with their line number and reason.
+        """
+        communes = []
+        new_departements = {}
+        rejected = []
+        for line, row in chunk:
+            try:
+                commune = self._to_commune(row)
+            except ValueError as e:
+                rejected.append({"line": line, "reason": str(e)})
+                continue
+            code = commune["fk_commune_departement"]
+            if code not in departements:
+                if not self.create_departements:
+                    rejected.append({"line": line, "reason": f"Unknown departement '{code}'."})
+                    continue
+                new_departements[code] = {"departement_code": code, "departement_nom": row.get("departement_nom") or None}
+                departements.add(code)
+            communes.append(commune)
+        return communes, new_departements, rejected
+
+    @classmethod
+    def _to_commune(cls, row: dict) -> dict:
+        """
+        Builds the column values of a Commune from a parsed CSV row.
+
+        The departement code defaults to the first two digits of the postal code, except
+        for Corsica (20xxx: 2A or 2B) and overseas (97xxx, 98xxx) where those digits are
+        not the departement, and single-digit codes are padded ("1" becomes "01").
+
+        Args:
+            row (dict): The parsed row.
+
+        Returns:
+            dict: The column values of the Commune.
+
+        Raises:
+            ValueError: If a field is missing or does not fit its column.
+        """
+        codepostal = row.get("commune_codepostal", "")
+        ville = row.get("commune_ville", "")
+        if not codepostal or not ville:
+            raise ValueError("Postal code and city are required.")
+        if len(codepostal) > 5:
+            raise ValueError(f"Postal code '{codepostal}' is longer than 5 characters.")
+        if len(ville) > 50:
+            raise ValueError("City name is longer than 50 characters.")
+
+        code = (row.get("departement_code") or "").upper()
+        if not code:
+            if codepostal.startswith("20"):
+                raise ValueError("Departement is required for Corsican postal codes (2A or 2B).")
+            if codepostal.startswith(("97", "98")):
+                raise ValueError(f"Departement cannot be derived from the overseas postal code '{codepostal}'.")
+            code = codepostal[:2]
+        if code.isdigit() and len(code) == 1:
+            code = code.zfill(2)
+        if len(code) != 2:
+            raise ValueError(f"Invalid departement code '{code}'.")
+        return {"fk_commune_departement": code, "commune_codepostal": codepostal, "commune_ville": ville}
+
+    @staticmethod
+    def _write_chunk(session: Session, communes: list[dict], new_departements: dict[str, dict]) -> tuple[int, int]:
+        """
+        Writes the departements then the communes of a chunk, without committing.
+
+        Args:
+            session (Session): The SQLModel session used for database operations.
+            communes (list[dict]): The column values of the communes to upsert.
+            new_departements (dict[str, dict]): The column values of the departements to create, by code.
+
+        Returns:
+            tuple[int, int]: The number of inserted and of updated communes.
+        """
+        if new_departements:
+            upsert_many(session, Departement, list(new_departements.values()), ["departement_code"])
+        return upsert_many(session, Commune, communes, ["commune_codepostal", "commune_ville"])
+
+    @staticmethod
+    def _invalidate_caches(new_departements: dict[str, dict]) -> None:
+        """
+        Drops the cached rows a committed chunk may have changed: the created departements and,
+        since communes are matched on their natural key rather than their ID, every cached commune.
+        The commune autocomplete index is marked stale.
+        """
+        departement_cache.invalidate(*new_departements)
+        commune_cache.clear()
+        commune_index.invalidate()
+
+    @classmethod
+    def _field_for(cls, name: str) -> Optional[str]:
+        """
+        Returns the field matching a CSV header name, or None if the column is not used.
+        """
+        normalized = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+        normalized = re.sub(r"[^a-z0-9]+", "_", normalized.lower()).strip("_")
+        for field, aliases in cls.COLUMN_ALIASES.items():
+            if normalized in aliases:
+                return field
+        return None
+
+    @staticmethod
+    def _new_totals() -> dict:
+        return {"chunks": 0, "rows": 0, "inserted": 0, "updated": 0, "rejected": 0, "departements_created": 0}
+
+    @staticmethod
+    def _progress(totals: dict, chunk: list, inserted: int, updated: int, new_departements: dict, rejected: list[dict]) -> dict:
+        """
+        Adds the counts of a written chunk to the running totals.
+
+        Returns:
+            dict: The running totals, with the rejected rows of this chunk.
+        """
+        totals["chunks"] += 1
+        totals["rows"] += len(chunk)
+        totals["inserted"] += inserted
+        totals["updated"] += updated
+        totals["rejected"] += len(rejected)
+        totals["departements_created"] += len(new_departements)
+        return {**totals, "rejected_rows": rejected}
+
+    @staticmethod
+    def _summary(totals: dict) -> dict:
+        """
+        Returns the final summary of an import: the totals, flagged as done.
+        """
+        return {**totals, "done": True}
+
+
+class AsyncCommuneImportService(CommuneImportService):
+    """
+    Asynchronous counterpart of CommuneImportService.
+
+    Shares the parsing and validation rules of CommuneImportService, but writes
+    each chunk through an AsyncSession and yields the progress asynchronously.
+
+    Attributes:
+        session (AsyncSession): The SQLAlchemy async session for database operations.
+        chunk_size (int): The number of rows written per transaction.
+        create_departements (bool): Whether unknown departements are created instead of rejecting their rows.
+    """
+
+    def __init__(self, session: AsyncSession, chunk_size: Optional[int] = None, create_departements: bool = False):
+        """
+        Initializes the AsyncCommuneImportService with an async database session.
+
+        Args:
+            session (AsyncSession): The SQLAlchemy async session to be used for database operations.
+            chunk_size (Optional[int]): The number of rows written per transaction (defaults to DB_BULK_CHUNK_SIZE).
+            create_departements (bool): Whether unknown departements are created instead of rejecting their rows.
+        """
+        super().__init__(session, chunk_size, create_departements)
+
+    async def import_csv(self, lines: Iterable[str]) -> AsyncIterator[dict]:
+        """
+        Imports the communes of a CSV file, committing one transaction per chunk.
+
+        Args:
+            lines (Iterable[str]): The lines of the CSV file, header line first.
+
+        Yields:
+            dict: The progress after each chunk, then a final summary.
+
+        Raises:
+            ValueError: If the header line lacks a required column.
+        """
+        departements = await AsyncDepartementRepository(self.session).get_departement_codes()
+        totals = self._new_totals()
+        for chunk in self._read_chunks(lines):
+            communes, new_departements, rejected = self._resolve(chunk, departements)
+            inserted, updated = await self.session.run_sync(self._write_chunk, communes, new_departements)
+            await self.session.commit()
+            self._invalidate_caches(new_departements)
+            yield self._progress(totals, chunk, inserted, updated, new_departements, rejected)
+        yield self._summary(totals)
@@ -0,0 +1,191 @@
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import func, select, update
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import BULK_CONFIG
+from ..models import Colis, DetailColis, DetailCommande, VariationObjet, ColisPostageRead, PostageRecomputeRead
+from ..repositories import TarifPostalRepository, AsyncTarifPostalRepository
+
+
+class ColisPostageService:
+    """
+    Service class for computing the weight and the postage of colis.
+
+    The weight of a colis is the sum, over its lines, of the quantity times the
+    weight of the ordered variation (DetailColis -> DetailCommande -> VariationObjet).
+    It is computed by the database with one aggregate query per chunk of colis. The
+    postage is the amount of the first bracket of the tariff grid whose maximum weight
+    covers it; the grid is read through the in-process cache of TarifPostalRepository.
+
+    Attributes:
+        session (Session): The SQLAlchemy session for database operations.
+        tarifs (TarifPostalRepository): The repository of the tariff grid.
+        chunk_size (int): The number of colis weighed and updated per statement.
+    """
+
+    def __init__(self, session: Session, chunk_size: Optional[int] = None):
+        """
+        Initializes the ColisPostageService with a database session.
+
+        Args:
+            session (Session): The SQLAlchemy session to be used for database operations.
+            chunk_size (Optional[int]): The number of colis per statement (defaults to DB_BULK_CHUNK_SIZE).
+        """
+        self.session = session
+        self.tarifs = TarifPostalRepository(session)
+        self.chunk_size = chunk_size or BULK_CONFIG["chunk_size"]
+
+    def get_postage(self, colis_id: int) -> Optional[ColisPostageRead]:
+        """
+        Computes the weight and postage of a colis, without storing them.
+
+        Args:
+            colis_id (int): The ID of the colis.
+
+        Returns:
+            Optional[ColisPostageRead]: The weight and postage of the colis, or None if the colis does not exist.
+        """
+        weights = self._weigh(self.session, [colis_id])
+        if colis_id not in weights:
+            return None
+        return self._postage(colis_id, weights[colis_id], self.tarifs.get_tarifs())
+
+    def recompute(self, colis_ids: list[int]) -> PostageRecomputeRead:
+        """
+        Recomputes and stores the postage (colis_timbre) of several colis.
+
+        Each chunk of colis is weighed with one aggregate query and updated with one
+        executemany UPDATE; the transaction is committed once at the end. Colis whose
+        weight is not covered by the grid keep their postage; unknown IDs are ignored.
+
+        Args:
+            colis_ids (list[int]): The IDs of the colis to recompute.
+
+        Returns:
+            PostageRecomputeRead: The number of updated colis and the IDs of the unpriced ones.
+        """
+        grid = self.tarifs.get_tarifs()
+        result = self._recompute(self.session, list(dict.fromkeys(colis_ids)), grid, self.chunk_size)
+        self.session.commit()
+        return result
+
+    @staticmethod
+    def _weigh(session: Session, colis_ids: list[int]) -> dict[int, Decimal]:
+        """
+        Weighs colis with one aggregate query.
+
+        The colis are LEFT JOINed to their lines, so that a colis without lines (or whose
+        lines reference no variation) weighs 0, while an unknown colis is absent.
+
+        Returns:
+            dict[int, Decimal]: The weight of each existing colis, by ID.
+        """
+        weight = func.sum(
+            func.coalesce(DetailColis.detail_colis_quantitee, 0) * func.coalesce(VariationObjet.variation_objet_poids, 0)
+        )
+        statement = (
+            select(Colis.colis_id, func.coalesce(weight, 0).label("poids"))
+            .select_from(Colis)
+            .outerjoin(DetailColis, DetailColis.fk_colis_id == Colis.colis_id)
+            .outerjoin(DetailCommande, DetailCommande.detail_commande_id == DetailColis.fk_detail_commande_id)
+            .outerjoin(VariationObjet, VariationObjet.variation_objet_id == DetailCommande.fk_detail_commande_variation_objet_id)
+            .where(Colis.colis_id.in_(colis_ids))
+            .group_by(Colis.colis_id)
+        )
+        # SQLite sums the NUMERIC column as a float: the weight is brought back to a 4-decimal Decimal
+        return {
+            row.colis_id: Decimal(str(row.poids)).quantize(Decimal("0.0001"))
+            for row in session.exec(statement)
+        }
+
+    @staticmethod
+    def _price(weight: Decimal, grid: list[dict]) -> Optional[float]:
+        """
+        Returns the amount of the first bracket covering a weight, or None if the weight exceeds the grid.
+        """
+        for tarif in grid:
+            if weight <= tarif["tarif_poids_max"]:
+                return tarif["tarif_montant"]
+        return None
+
+    @classmethod
+    def _postage(cls, colis_id: int, weight: Decimal, grid: list[dict]) -> ColisPostageRead:
+        return ColisPostageRead(colis_id=colis_id, poids=weight, timbre=cls._price(weight, grid))
+
+    @classmethod
+    def _recompute(cls, session: Session, colis_ids: list[int], grid: list[dict], chunk_size: int) -> PostageRecomputeRead:
+        """
+        Weighs and updates the colis chunk by chunk, without committing.
+        """
+        updated = 0
+        unpriced = []
+        for start in range(0, len(colis_ids), chunk_size):
+            weights = cls._weigh(session, colis_ids[start:start + chunk_size])
+            rows = []
+            for colis_id, weight in weights.items():
+                timbre = cls._price(weight, grid)
+                if timbre is None:
+                    unpriced.append(colis_id)
+                else:
+                    rows.append({"colis_id": colis_id, "colis_timbre": timbre})
+            if rows:
+                # ORM bulk UPDATE by primary key: one executemany statement
+                session.exec(update(Colis).execution_options(synchronize_session=False), params=rows)
+                updated += len(rows)
+        return PostageRecomputeRead(updated=updated, unpriced=sorted(unpriced))
+
+
+class AsyncColisPostageService(ColisPostageService):
+    """
+    Asynchronous counterpart of ColisPostageService.
+
+    Runs the same queries through an AsyncSession.
+
+    Attributes:
+        session (AsyncSession): The SQLAlchemy async session for database operations.
+        tarifs (AsyncTarifPostalRepository): The repository of the tariff grid.
+        chunk_size (int): The number of colis weighed and updated per statement.
+    """
+
+    def __init__(self, session: AsyncSession, chunk_size: Optional[int] = None):
+        """
+        Initializes the AsyncColisPostageService with an async database session.
+
+        Args:
+            session (AsyncSession): The SQLAlchemy async session to be used for database operations.
+            chunk_size (Optional[int]): The number of colis per statement (defaults to DB_BULK_CHUNK_SIZE).
+        """
+        self.session = session
+        self.tarifs = AsyncTarifPostalRepository(session)
+        self.chunk_size = chunk_size or BULK_CONFIG["chunk_size"]
+
+    async def get_postage(self, colis_id: int) -> Optional[ColisPostageRead]:
+        """
+        Computes the weight and postage of a colis, without storing them.
+
+        Args:
+            colis_id (int): The ID of the colis.
+
+        Returns:
+            Optional[ColisPostageRead]: The weight and postage of the colis, or None if the colis does not exist.
+        """
+        weights = await self.session.run_sync(self._weigh, [colis_id])
+        if colis_id not in weights:
+            return None
+        return self._postage(colis_id, weights[colis_id], await self.tarifs.get_tarifs())
+
+    async def recompute(self, colis_ids: list[int]) -> PostageRecomputeRead:
+        """
+        Recomputes and stores the postage (colis_timbre) of several colis, committing once at the end.
+
+        Args:
+            colis_ids (list[int]): The IDs of the colis to recompute.
+
+        Returns:
+            PostageRecomputeRead: The number of updated colis and the IDs of the unpriced ones.
+        """
+        grid = await self.tarifs.get_tarifs()
+        result = await self.session.run_sync(self._recompute, list(dict.fromkeys(colis_ids)), grid, self.chunk_size)
+        await self.session.commit()
+        return result
@@ -0,0 +1,211 @@
+import datetime
+from typing import Optional
+from sqlalchemy import func, select
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..models import Commande, DetailCommande, VariationObjet, Objet
+from ..models import CommandeValuationRead, CommandeValuationDetailRead, DetailCommandeValuationRead
+
+# Quantité et points d'une ligne, une valeur absente comptant pour 0
+_QUANTITY = func.coalesce(DetailCommande.detail_commande_quantitee, 0)
+_POINTS = func.coalesce(Objet.objet_points, 0)
+
+
+def _joined(*columns):
+    """
+    Selects columns from the orders, LEFT JOINed to their lines, the variations of the lines and
+    their objets: orders without lines, and lines without variation or objet, are kept.
+    """
+    return (
+        select(*columns)
+        .select_from(Commande)
+        .outerjoin(DetailCommande, DetailCommande.fk_detail_commande_commande_id == Commande.commande_id)
+        .outerjoin(VariationObjet, VariationObjet.variation_objet_id == DetailCommande.fk_detail_commande_variation_objet_id)
+        .outerjoin(Objet, Objet.objet_id == VariationObjet.fk_variation_objet_objet_id)
+    )
+
+
+class CommandeValuationService:
+    """
+    Service class for valuing orders in points.
+
+    The value of a line is its quantity times the points of the objet of its
+    variation; the value of an order is the sum of its lines. Both are computed by
+    the database in a single join over t_commandes, t_details_commandes,
+    t_variations_objets and t_objets, instead of loading the rows in Python.
+
+    Attributes:
+        session (Session): The SQLAlchemy session for database operations.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initializes the CommandeValuationService with a database session.
+
+        Args:
+            session (Session): The SQLAlchemy session to be used for database operations.
+        """
+        self.session = session
+
+    def value_commande(self, commande_id: int) -> Optional[CommandeValuationDetailRead]:
+        """
+        Values one order and each of its lines.
+
+        Args:
+            commande_id (int): The ID of the order to value.
+
+        Returns:
+            Optional[CommandeValuationDetailRead]: The order totals with the value of each line, or None if the order does not exist.
+        """
+        return self._value_commande(self.session, commande_id)
+
+    def value_commandes(
+        self,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> list[CommandeValuationRead]:
+        """
+        Values the orders placed in a date range, with one GROUP BY query.
+
+        Args:
+            date_from (Optional[datetime.date]): The first order date included, if any.
+            date_to (Optional[datetime.date]): The last order date included, if any.
+            limit (Optional[int]): The maximum number of orders to return.
+            after (Optional[int]): The ID of the last order of the previous page, for keyset pagination.
+
+        Returns:
+            list[CommandeValuationRead]: The totals of each order, in ID order. Orders without a date
+            are only included when no bound is given.
+        """
+        return self._value_commandes(self.session, date_from, date_to, limit, after)
+
+    @staticmethod
+    def _value_commande(session: Session, commande_id: int) -> Optional[CommandeValuationDetailRead]:
+        """
+        Reads the value of each line of an order and adds them up.
+
+        The lines are read in one query; the order totals are their sum, so that
+        the order and its lines always agree.
+        """
+        line_points = (_QUANTITY * _POINTS).label("line_points")
+        statement = _joined(
+            Commande.commande_id,
+            Commande.commande_date,
+            DetailCommande.detail_commande_id,
+            DetailCommande.fk_detail_commande_variation_objet_id,
+            Objet.objet_id,
+            _QUANTITY.label("detail_commande_quantitee"),
+            _POINTS.label("objet_points"),
+            line_points,
+        ).where(Commande.commande_id == commande_id).order_by(DetailCommande.detail_commande_id)
+        rows = session.exec(statement).mappings().all()
+        if not rows:
+            return None
+
+        # An order without lines comes back as one row without detail_commande_id
+        lines = [DetailCommandeValuationRead.model_validate(dict(row)) for row in rows if row["detail_commande_id"] is not None]
+        return CommandeValuationDetailRead(
+            commande_id=rows[0]["commande_id"],
+            commande_date=rows[0]["commande_date"],
+            line_count=len(lines),
+            total_quantity=sum(line.detail_commande_quantitee for line in lines),
+            total_points=sum(line.line_points for line in lines),
+            lines=lines,
+        )
+
+    @staticmethod
+    def _value_commandes(
+        session: Session,
+        date_from: Optional[datetime.date],
+        date_to: Optional[datetime.date],
+        limit: Optional[int],
+        after: Optional[int],
+    ) -> list[CommandeValuationRead]:
+        """
+        Computes the totals of the orders of a date range, grouped by order.
+        """
+        statement = _joined(
+            Commande.commande_id,
+            Commande.commande_date,
+            func.count(DetailCommande.detail_commande_id).label("line_count"),
+            func.coalesce(func.sum(_QUANTITY), 0).label("total_quantity"),
+            func.coalesce(func.sum(_QUANTITY * _POINTS), 0).label("total_points"),
+        )
+        if date_from is not None:
+            statement = statement.where(Commande.commande_date >= date_from)
+        if date_to is not None:
+            statement = statement.where(Commande.commande_date <= date_to)
+        if after is not None:
+            statement = statement.where(Commande.commande_id > after)
+        statement = (
+            statement
+            .group_by(Commande.commande_id, Commande.commande_date)
+            .order_by(Commande.commande_id)
+            .limit(limit)
+        )
+        # SUM is a DECIMAL on MySQL: the totals are brought back to integers
+        return [
+            CommandeValuationRead(
+                commande_id=row.commande_id,
+                commande_date=row.commande_date,
+                line_count=row.line_count,
+                total_quantity=int(row.total_quantity),
+                total_points=int(row.total_points),
+            )
+            for row in session.exec(statement)
+        ]
+
+
+class AsyncCommandeValuationService(CommandeValuationService):
+    """
+    Asynchronous counterpart of CommandeValuationService.
+
+    Runs the same queries through an AsyncSession.
+
+    Attributes:
+        session (AsyncSession): The SQLAlchemy async session for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initializes the AsyncCommandeValuationService with an async database session.
+
+        Args:
+            session (AsyncSession): The SQLAlchemy async session to be used for database operations.
+        """
+        super().__init__(session)
+
+    async def value_commande(self, commande_id: int) -> Optional[CommandeValuationDetailRead]:
+        """
+        Values one order and each of its lines.
+
+        Args:
+            commande_id (int): The ID of the order to value.
+
+        Returns:
+            Optional[CommandeValuationDetailRead]: The order totals with the value of each line, or None if the order does not exist.
+        """
+        return await self.session.run_sync(self._value_commande, commande_id)
+
+    async def value_commandes(
+        self,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> list[CommandeValuationRead]:
+        """
+        Values the orders placed in a date range, with one GROUP BY query.
+
+        Args:
+            date_from (Optional[datetime.date]): The first order date included, if any.
+            date_to (Optional[datetime.date]): The last order date included, if any.
+            limit (Optional[int]): The maximum number of orders to return.
+            after (Optional[int]): The ID of the last order of the previous page, for keyset pagination.
+
+        Returns:
+            list[CommandeValuationRead]: The totals of each order, in ID order.
+        """
+        return await self.session.run_sync(self._value_commandes, date_from, date_to, limit, after)
@@ -0,0 +1,140 @@
+import datetime
+import threading
+import time
+from collections import deque
+from sqlalchemy import event
+from .metrics import current_request, route_path
+
+# Instructions dont le plan n'est pas demandé (EXPLAIN n'a pas de sens pour elles, ou elles en sont déjà un)
+NO_EXPLAIN_PREFIXES = ("EXPLAIN", "PRAGMA", "SHOW", "SET", "BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "CREATE", "DROP", "ALTER")
+
+
+def redact(parameters) -> list | dict | None:
+    """
+    Remplace les valeurs des paramètres liés par leur type : le journal ne contient aucune donnée.
+    Pour un executemany, décrit la première ligne et le nombre de lignes.
+    """
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return {"rows": len(parameters), "first": redact(parameters[0])}
+    return [type(value).__name__ for value in parameters]
+
+
+def _is_streamed(context) -> bool:
+    """
+    Indique si l'instruction lit son résultat par un curseur côté serveur (yield_per, stream_results),
+    comme les exports. Sur aiomysql/pymysql, une autre requête sur la même connexion viderait
+    silencieusement le résultat encore en attente : le plan n'est donc pas demandé.
+    """
+    return bool(context._is_server_side or context.execution_options.get("stream_results"))
+
+
+class SlowQueryLog:
+    """
+    Journal des instructions SQL lentes, dans un tampon circulaire borné.
+
+    Les instructions dont la durée atteint le seuil sont enregistrées avec leurs paramètres
+    masqués (seuls les types sont gardés), la route HTTP qui les a émises (posée par le
+    middleware de src/metrics.py) et leur plan d'exécution : EXPLAIN, ou EXPLAIN QUERY PLAN
+    sur SQLite, relancé sur la même connexion avec les mêmes paramètres. Le plan n'est
+    demandé que pour les instructions lentes : les autres ne paient que deux lectures d'horloge.
+    Il ne l'est pas pour les résultats lus en flux (exports), encore en cours de lecture.
+    Le journal est propre au processus.
+    """
+
+    def __init__(self, enabled: bool = False, threshold_ms: float = 200, max_entries: int = 100, explain: bool = True):
+        self._lock = threading.Lock()
+        self.enabled = enabled
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._entries = deque(maxlen=max_entries)
+        self.recorded = 0
+
+    @property
+    def max_entries(self) -> int:
+        return self._entries.maxlen
+
+    def instrument(self, engine) -> None:
+        """
+        Installe les écouteurs du journal sur un moteur synchrone (`async_engine.sync_engine` pour un moteur asynchrone).
+        """
+        if not event.contains(engine, "after_cursor_execute", self._after_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not self.enabled:
+            return
+        duration_ms = (time.perf_counter() - context._slow_query_start) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        stats = current_request.get()
+        scope = stats.scope if stats is not None else None
+        entry = {
+            "at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "duration_ms": round(duration_ms, 3),
+            "method": scope["method"] if scope else None,
+            "route": route_path(scope) if scope else None,
+            "statement": statement,
+            "parameters": redact(parameters),
+            "executemany": executemany,
+            "plan": self._explain(conn, statement, parameters) if self.explain and not executemany and not _is_streamed(context) else None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters) -> list[dict] | str | None:
+        """
+        Demande le plan d'une instruction sur la connexion DBAPI qui l'a exécutée.
+
+        Le curseur DBAPI est utilisé directement : la requête EXPLAIN ne repasse pas par les
+        événements du moteur, et n'est donc ni comptée ni journalisée.
+        """
+        if statement.lstrip().upper().startswith(NO_EXPLAIN_PREFIXES):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                columns = [column[0] for column in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+        except Exception as e:
+            return f"EXPLAIN failed: {e}"
+
+    def entries(self) -> list[dict]:
+        """
+        Retourne les entrées du journal, de la plus récente à la plus ancienne.
+        """
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        """
+        Vide le journal.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Retourne la configuration du journal et ses entrées.
+        """
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": self.threshold_ms,
+            "max_entries": self.max_entries,
+            "explain": self.explain,
+            "recorded": self.recorded,
+            "entries": self.entries(),
+        }
@@ -2,17 +2,30 @@
 # Modules import #
 ##################
 
+import os
+from contextlib import contextmanager
 from decimal import Decimal
+from functools import partial
 import pytest
+from sqlalchemy import event
 from fastapi.testclient import TestClient
 from sqlmodel import create_engine, Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 
 ###############
 # SRC imports #
 ###############
 
+# Les tests utilisent leur propre base : pas de vérification de schéma ni de préchauffage au démarrage
+os.environ["DB_SCHEMA"] = "off"
+os.environ["DB_POOL_WARMUP"] = "0"
+os.environ["AUTOCOMPLETE_PRELOAD"] = "0"
+
 from src.main import app
-from src.database import get_db
+from src.database import get_db, get_async_db, get_async_read_db, get_async_session_factory, get_async_read_session_factory, slow_query_log
+from src.metrics import instrument_engine
 from src.models.client_model import Client as ClientModel
 from src.models.commune_model import Commune
 from src.models.departement_model import Departement
@@ -23,6 +36,55 @@ from src.models.variation_objet_model import VariationObjet
 from src.models.detail_colis_model import DetailColis
 from src.models.detail_commande_model import DetailCommande
 
+#################
+# Query budgets #
+#################
+
+class StatementRecorder:
+    """
+    Enregistre les instructions SQL exécutées sur les moteurs de test pendant chaque requête HTTP
+    du client de test, et fait échouer le test si une requête dépasse le budget en cours.
+
+    Le budget vient du marqueur `query_budget(n)` (toutes les requêtes du test) ou du
+    fixture `query_budget` (`with query_budget(n): ...`, pour quelques requêtes seulement).
+    Un executemany compte pour une instruction.
+    """
+
+    def __init__(self):
+        self.statements = None
+        self.budget = None
+
+    def listen(self, engine) -> None:
+        event.listen(engine, "after_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def start(self, request) -> None:
+        self.statements = []
+
+    def check(self, response) -> None:
+        statements, self.statements = self.statements or [], None
+        if self.budget is not None and len(statements) > self.budget:
+            listing = "\n".join(f"  {index}. {' '.join(statement.split())}" for index, statement in enumerate(statements, 1))
+            pytest.fail(
+                f"{response.request.method} {response.request.url.path} a exécuté {len(statements)} instructions SQL "
+                f"pour un budget de {self.budget} :\n{listing}",
+                pytrace=False,
+            )
+
+
+statement_recorder = StatementRecorder()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(n): fait échouer le test si une requête HTTP du client exécute plus de n instructions SQL",
+    )
+
+
 ############
 # Fixtures #
 ############
@@ -35,6 +97,10 @@ def test_session():
     """
     db_url = "sqlite:///./test.db"
     engine = create_engine(db_url, echo=False, connect_args={"check_same_thread": False})
+    # Instrumenté comme les moteurs de src/database.py, pour les métriques par requête et le journal des requêtes lentes (désactivé par défaut)
+    instrument_engine(engine)
+    slow_query_log.instrument(engine)
+    statement_recorder.listen(engine)
     SQLModel.metadata.drop_all(engine)
     SQLModel.metadata.create_all(engine)
 
@@ -105,16 +171,81 @@ def test_session():
 
 
 
+@pytest.fixture(scope="session")
+def test_async_engine(test_session):
+    """
+    Crée un moteur aiosqlite sur la même base SQLite de test.
+    NullPool évite de réutiliser une connexion entre les boucles d'événements des différents TestClient.
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///./test.db", echo=False, poolclass=NullPool)
+    instrument_engine(engine.sync_engine)
+    slow_query_log.instrument(engine.sync_engine)
+    statement_recorder.listen(engine.sync_engine)
+    yield engine
+
+
 @pytest.fixture(scope="function")
-def client(test_session):
-    """Crée un client FastAPI qui utilise la session de test en override."""
+def client(request, test_session, test_async_engine):
+    """
+    Crée un client FastAPI qui utilise la session de test en override.
+    Les instructions SQL de chaque requête sont comptées, et comparées au budget du marqueur query_budget.
+    """
     def override_get_session():
         yield test_session
+
+    async def override_get_async_session():
+        async with AsyncSession(test_async_engine, autoflush=False, expire_on_commit=False) as session:
+            yield session
         
     # Ecrase la connexion à l'ancienne base de données par la nouvelle
     app.dependency_overrides[get_db] = override_get_session
-
+    app.dependency_overrides[get_async_db] = override_get_async_session
+    # En test, le réplica en lecture est la même base que la base principale
+    app.dependency_overrides[get_async_read_db] = override_get_async_session
+    # Les réponses en streaming (exports, imports) ouvrent leur propre session sur la base de test
+    session_factory = partial(AsyncSession, test_async_engine, autoflush=False, expire_on_commit=False)
+    app.dependency_overrides[get_async_session_factory] = lambda: session_factory
+    app.dependency_overrides[get_async_read_session_factory] = lambda: session_factory
+
+    marker = request.node.get_closest_marker("query_budget")
+    statement_recorder.budget = marker.args[0] if marker else None
     with TestClient(app) as test_client:
+        test_client.event_hooks = {"request": [statement_recorder.start], "response": [statement_recorder.check]}
         yield test_client
 
-    app.dependency_overrides.clear()
\ No newline at end of file
+    statement_recorder.budget = None
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def query_budget(client):
+    """
+    Fixe un budget d'instructions SQL par requête HTTP pour un bloc du test :
+    `with query_budget(2): client.get(...)`.
+    """
+    @contextmanager
+    def budget(statements: int):
+        previous = statement_recorder.budget
+        statement_recorder.budget = statements
+        try:
+            yield
+        finally:
+            statement_recorder.budget = previous
+
+    return budget
+
+@pytest.fixture(scope="function")
+def foreign_keys(test_async_engine):
+    """
+    Active le contrôle des clés étrangères de SQLite (PRAGMA foreign_keys=ON) sur les
+    connexions du moteur asynchrone de test, comme MySQL le fait toujours.
+    Le moteur est en NullPool : chaque session ouvre une nouvelle connexion, qui reçoit le PRAGMA.
+    """
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    event.listen(test_async_engine.sync_engine, "connect", enable_foreign_keys)
+    yield
+    event.remove(test_async_engine.sync_engine, "connect", enable_foreign_keys)
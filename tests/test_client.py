@@ -1,8 +1,15 @@
+import csv
+import io
+import json
+import pytest
 from fastapi import Response
 from fastapi.testclient import TestClient
 
+from src.pagination import encode_cursor
+
 BASE_URL = "/client"
 
+@pytest.mark.query_budget(1)
 def test_get_all_clients(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/")
     assert result.status_code == 200
@@ -26,6 +33,34 @@ def test_get_all_clients_offset(client: TestClient):
     assert len(data) == 1
     assert data[0]["client_prenom"] == "Daniel"
 
+@pytest.mark.query_budget(1)
+def test_get_all_clients_cursor(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/?limit=1")
+    assert result.status_code == 200
+    cursor = result.headers["X-Next-Cursor"]
+    assert result.json()[0]["client_prenom"] == "Robin"
+
+    result = client.get(f"{BASE_URL}/?limit=1&cursor={cursor}")
+    assert result.status_code == 200
+    data = result.json()
+    assert len(data) == 1
+    assert data[0]["client_prenom"] == "Daniel"
+
+def test_get_all_clients_last_page_no_cursor(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/?limit=100")
+    assert result.status_code == 200
+    assert "X-Next-Cursor" not in result.headers
+
+def test_get_all_clients_invalid_cursor(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/?cursor=not-a-cursor")
+    assert result.status_code == 400
+
+def test_get_all_clients_cursor_wrong_key_type(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/", params={"cursor": encode_cursor("abc")})
+    assert result.status_code == 400
+    assert result.json()["detail"] == "Invalid cursor."
+
+@pytest.mark.query_budget(1)
 def test_get_client_by_id(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/1")
     assert result.status_code == 200
@@ -104,6 +139,116 @@ def test_delete_client(client: TestClient):
     result = client.get(f"{BASE_URL}/1")
     assert result.status_code == 404  
 
+def test_delete_client_detaches_commandes(client: TestClient, foreign_keys):
+    client_id = client.post(f"{BASE_URL}/", json={"client_prenom": "Paul", "client_nom": "REFERENCE"}).json()["client_id"]
+    commande = client.post("/commande/", json={"fk_client_id": client_id, "commande_commentaire": "à garder"}).json()
+
+    result: Response = client.delete(f"{BASE_URL}/{client_id}")
+    assert result.status_code == 204
+    assert client.get(f"{BASE_URL}/{client_id}").status_code == 404
+    kept = client.get(f"/commande/{commande['commande_id']}")
+    assert kept.status_code == 200
+    assert kept.json()["fk_client_id"] is None
+    assert client.delete(f"/commande/{commande['commande_id']}").status_code == 204
+
 def test_delete_404(client: TestClient):
     result = client.delete("/client/9999")
     assert result.status_code == 404
+
+def test_create_clients_bulk(client: TestClient):
+    new_clients = [
+        {"client_prenom": "alice", "client_nom": "martin", "client_email": "alice@example.com"},
+        {"client_prenom": "bob", "client_nom": "durand"},
+    ]
+    result: Response = client.post(f"{BASE_URL}/bulk", json=new_clients)
+    assert result.status_code == 201
+    data = result.json()
+    assert data["created"] == 2
+    assert len(data["ids"]) == 2
+
+    created_client = client.get(f"{BASE_URL}/{data['ids'][1]}").json()
+    assert created_client["client_prenom"] == "Bob"
+    assert created_client["client_nom"] == "DURAND"
+
+def test_create_clients_bulk_400(client: TestClient):
+    new_clients = [
+        {"client_prenom": "carole", "client_nom": "petit"},
+        {"client_nom": "sans-prenom"},
+        {"client_prenom": "eve", "client_nom": "roux", "client_email": "error"},
+    ]
+    result: Response = client.post(f"{BASE_URL}/bulk", json=new_clients)
+    assert result.status_code == 400
+    assert "client 1" in result.json()["detail"]
+    assert "client 2" in result.json()["detail"]
+
+def test_export_clients_ndjson(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/export")
+    assert result.status_code == 200
+    assert result.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in result.text.splitlines()]
+    assert [row["client_id"] for row in rows] == sorted(row["client_id"] for row in rows)
+    assert {"Bob", "Daniel"} <= {row["client_prenom"] for row in rows}
+
+def test_export_clients_csv(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/export", params={"format": "csv"})
+    assert result.status_code == 200
+    assert result.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(result.text)))
+    assert len(rows) == len(client.get(f"{BASE_URL}/export").text.splitlines())
+    assert "Bob" in {row["client_prenom"] for row in rows}
+
+def test_export_clients_invalid_format(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/export", params={"format": "xml"})
+    assert result.status_code == 422
+
+def test_search_clients(client: TestClient):
+    new_client = {
+        "client_prenom": "élodie",
+        "client_nom": "de la Fontaine",
+        "client_email": "Elodie.Fontaine@Example.com",
+        "client_telephone_portable": "0611223344",
+    }
+    created_id = client.post(f"{BASE_URL}", json=new_client).json()["client_id"]
+
+    for query in ["de la font", "DE LA FONTAINE", "elodie", "Élo", "élodie de la f", "de-la-fontaine élo"]:
+        result: Response = client.get(f"{BASE_URL}/search", params={"q": query})
+        assert result.status_code == 200
+        assert [row["client_id"] for row in result.json()] == [created_id], query
+
+    for query in ["elodie.fontaine@example.com", " ELODIE.FONTAINE@EXAMPLE.COM ", "06 11 22 33 44", "+33 6 11 22 33 44"]:
+        data = client.get(f"{BASE_URL}/search", params={"q": query}).json()
+        assert [row["client_id"] for row in data] == [created_id], query
+        assert not any(key.endswith("_norm") for key in data[0])
+
+    assert client.get(f"{BASE_URL}/search", params={"q": "fontainebleau"}).json() == []
+    assert client.get(f"{BASE_URL}/search", params={"q": "elodie@example.com"}).json() == []
+
+def test_search_clients_relevance(client: TestClient):
+    new_clients = [
+        {"client_prenom": "martine", "client_nom": "aubry"},
+        {"client_prenom": "paul", "client_nom": "martinez"},
+        {"client_prenom": "jean", "client_nom": "martin"},
+    ]
+    ids = client.post(f"{BASE_URL}/bulk", json=new_clients).json()["ids"]
+
+    data = client.get(f"{BASE_URL}/search", params={"q": "martin"}).json()
+    # Nom exact, puis nom commençant par la requête, puis prénom commençant par la requête
+    assert [row["client_id"] for row in data if row["client_id"] in ids] == [ids[2], ids[1], ids[0]]
+
+    data = client.get(f"{BASE_URL}/search", params={"q": "martin", "limit": 1}).json()
+    assert len(data) == 1
+
+    data = client.get(f"{BASE_URL}/search", params={"q": "jean martin"}).json()
+    assert [row["client_id"] for row in data] == [ids[2]]
+
+def test_search_clients_patch(client: TestClient):
+    result = client.patch(f"{BASE_URL}/2", json={"client_nom": "Hôtton-Lefèvre"})
+    assert result.status_code == 200
+    data = client.get(f"{BASE_URL}/search", params={"q": "hotton lef"}).json()
+    assert [row["client_id"] for row in data] == [2]
+
+def test_search_clients_422(client: TestClient):
+    assert client.get(f"{BASE_URL}/search").status_code == 422
+    assert client.get(f"{BASE_URL}/search", params={"q": ""}).status_code == 422
+    assert client.get(f"{BASE_URL}/search", params={"q": "a", "limit": 101}).status_code == 422
+    assert client.get(f"{BASE_URL}/search", params={"q": "?!"}).json() == []
@@ -1,8 +1,11 @@
+from decimal import Decimal
+import pytest
 from fastapi import Response
 from fastapi.testclient import TestClient
 
 BASE_URL = "/colis"
 
+@pytest.mark.query_budget(1)
 def test_get_all_colis(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/")
     assert result.status_code == 200
@@ -53,6 +56,53 @@ def test_create_commune_blank(client: TestClient):
     result: Response = client.post(f"{BASE_URL}/", json=new_colis)
     assert result.status_code == 201
 
+def test_put_get_tarifs(client: TestClient):
+    grid = [
+        {"tarif_poids_max": "10", "tarif_montant": 9.0},
+        {"tarif_poids_max": "0.5", "tarif_montant": 1.16},
+        {"tarif_poids_max": "2", "tarif_montant": 4.5},
+    ]
+    result: Response = client.put(f"{BASE_URL}/tarifs", json=grid)
+    assert result.status_code == 200
+    assert [tarif["tarif_montant"] for tarif in result.json()] == [1.16, 4.5, 9.0]
+    assert client.get(f"{BASE_URL}/tarifs").json() == result.json()
+
+    result = client.put(f"{BASE_URL}/tarifs", json=grid + [{"tarif_poids_max": "2.0000", "tarif_montant": 5}])
+    assert result.status_code == 400
+
+def test_get_colis_postage(client: TestClient):
+    # 4 items of the variation 1 (1.25 kg) in the colis 1
+    client.patch("/detail_colis/1", json={"fk_detail_commande_id": 1})
+    client.patch("/detail_commande/1", json={"fk_detail_commande_variation_objet_id": 1})
+    result: Response = client.get(f"{BASE_URL}/1/postage")
+    assert result.status_code == 200
+    data = result.json()
+    assert Decimal(data["poids"]) == Decimal("5")
+    assert data["timbre"] == 9.0
+
+    result = client.get(f"{BASE_URL}/3/postage")
+    assert Decimal(result.json()["poids"]) == 0
+    assert result.json()["timbre"] == 1.16
+
+    result = client.get(f"{BASE_URL}/100/postage")
+    assert result.status_code == 404
+
+def test_post_colis_postage(client: TestClient):
+    result: Response = client.post(f"{BASE_URL}/postage", json=[1, 3, 100])
+    assert result.status_code == 200
+    assert result.json() == {"updated": 2, "unpriced": []}
+    assert client.get(f"{BASE_URL}/1").json()["colis_timbre"] == 9.0
+    assert client.get(f"{BASE_URL}/3").json()["colis_timbre"] == 1.16
+
+    # 5 kg is above a grid ending at 2 kg: the colis keeps its postage
+    client.put(f"{BASE_URL}/tarifs", json=[{"tarif_poids_max": "2", "tarif_montant": 4.5}])
+    result = client.post(f"{BASE_URL}/postage", json=[1, 3])
+    assert result.json() == {"updated": 1, "unpriced": [1]}
+    assert client.get(f"{BASE_URL}/1").json()["colis_timbre"] == 9.0
+    assert client.get(f"{BASE_URL}/3").json()["colis_timbre"] == 4.5
+
+    client.patch("/detail_colis/1", json={"fk_detail_commande_id": None})
+
 def test_patch_colis(client: TestClient):
     update_colis = {
         "colis_commentaire" : "Colis envoyer à la mauvaise adresse",    
@@ -70,8 +120,10 @@ def test_patch_colis_404(client: TestClient):
     result: Response = client.patch(f"{BASE_URL}/1000000", json=update_colis)
     assert result.status_code == 404
 
-def test_delete_colis(client: TestClient):
-    result: Response = client.delete(f"{BASE_URL}/1")
+def test_delete_colis(client: TestClient, query_budget):
+    # Détachement des détails de colis, puis un seul DELETE
+    with query_budget(2):
+        result: Response = client.delete(f"{BASE_URL}/1")
     assert result.status_code == 204
     result_alt: Response = client.get(f"{BASE_URL}/1")
     assert result_alt.status_code == 404
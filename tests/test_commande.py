@@ -1,9 +1,11 @@
+import pytest
 from fastapi import Response
 from fastapi.testclient import TestClient
 import datetime
 
 BASE_URL = "/commande"
 
+@pytest.mark.query_budget(1)
 def test_get_all_commandes(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/")
     assert result.status_code == 200
@@ -25,6 +27,7 @@ def test_get_all_commandes_offset(client: TestClient):
     assert isinstance(data, list)
     assert len(data) == 0
 
+@pytest.mark.query_budget(1)
 def test_get_commande_by_id(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/1")
     assert result.status_code == 200
@@ -33,6 +36,91 @@ def test_get_commande_by_id(client: TestClient):
     assert len(data) > 0
     assert data["client_cheque"] == 20.0
 
+def test_get_commande_by_id_etag(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/1")
+    etag = result.headers["ETag"]
+    result = client.get(f"{BASE_URL}/1", headers={"If-None-Match": etag})
+    assert result.status_code == 304
+    assert result.content == b""
+    assert result.headers["ETag"] == etag
+    result = client.get(f"{BASE_URL}/1", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert result.status_code == 304
+    result = client.get(f"{BASE_URL}/1", headers={"If-None-Match": '"other"'})
+    assert result.status_code == 200
+
+def test_get_commande_full(client: TestClient, query_budget):
+    # Client 1 is deleted by test_client
+    result: Response = client.patch(f"{BASE_URL}/1", json={"fk_client_id": 2})
+    assert result.status_code == 200
+    result = client.patch("/detail_commande/1", json={"fk_detail_commande_commande_id": 1, "fk_detail_commande_variation_objet_id": 1})
+    assert result.status_code == 200
+
+    # The order, client, commune and departement in one query, the lines, variations and objets in another
+    with query_budget(2):
+        result = client.get(f"{BASE_URL}/1/full")
+    assert result.status_code == 200
+    data = result.json()
+    assert data["commande_id"] == 1
+    assert data["client"]["client_prenom"] == "Daniel"
+    assert data["client"]["commune"]["commune_ville"] == "Wervicq-Sud"
+    assert data["client"]["commune"]["departement"]["departement_nom"] == "Nord"
+    assert len(data["details_commande"]) == 1
+    line = data["details_commande"][0]
+    assert line["detail_commande_quantitee"] == 25
+    assert line["variation_objet"]["variation_objet_taille"] == "Moyen"
+    assert line["variation_objet"]["objet"]["objet_libelee"] == "Baton magique"
+
+    etag = result.headers["ETag"]
+    result = client.get(f"{BASE_URL}/1/full", headers={"If-None-Match": etag})
+    assert result.status_code == 304
+
+def test_get_commande_full_404(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/100/full")
+    assert result.status_code == 404
+
+@pytest.mark.query_budget(2)
+def test_get_commandes_full_batch(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/full", params={"ids": [100, 1, 1]})
+    assert result.status_code == 200
+    data = result.json()
+    assert [commande["commande_id"] for commande in data] == [1]
+    assert data[0] == client.get(f"{BASE_URL}/1/full").json()
+
+    result = client.get(f"{BASE_URL}/full")
+    assert result.status_code == 422
+
+def test_get_commande_valuation(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/1/valuation")
+    assert result.status_code == 200
+    data = result.json()
+    assert data["commande_id"] == 1
+    assert data["line_count"] == 1
+    assert data["total_quantity"] == 25
+    assert data["total_points"] == 25 * 30
+    assert data["lines"] == [{
+        "detail_commande_id": 1,
+        "fk_detail_commande_variation_objet_id": 1,
+        "objet_id": 2,
+        "detail_commande_quantitee": 25,
+        "objet_points": 30,
+        "line_points": 750,
+    }]
+
+    result = client.get(f"{BASE_URL}/100/valuation")
+    assert result.status_code == 404
+
+@pytest.mark.query_budget(1)
+def test_get_commandes_valuation(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/valuation")
+    assert result.status_code == 200
+    data = result.json()
+    assert data[0] == {"commande_id": 1, "commande_date": None, "line_count": 1, "total_quantity": 25, "total_points": 750}
+
+    # Orders without a date are outside any date range
+    result = client.get(f"{BASE_URL}/valuation", params={"date_from": "2000-01-01", "date_to": "2100-12-31"})
+    assert result.status_code == 200
+    assert all(commande["commande_id"] != 1 for commande in result.json())
+
 def test_get_commande_by_id_404(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/100")
     assert result.status_code == 404
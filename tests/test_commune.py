@@ -1,8 +1,13 @@
+import json
+import pytest
 from fastapi import Response
 from fastapi.testclient import TestClient
 
+from src.autocomplete import commune_index
+
 BASE_URL = "/commune"
 
+@pytest.mark.query_budget(1)
 def test_get_all_communes(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/")
     assert result.status_code == 200
@@ -76,12 +81,105 @@ def test_patch_commune_404(client: TestClient):
     result: Response = client.patch(f"{BASE_URL}/1000000", json=update_commune)
     assert result.status_code == 404
 
+def test_autocomplete_communes(client: TestClient):
+    for query in ["591", "59117", "zuid", "ZUID-wer", "Zuid wervik"]:
+        result: Response = client.get(f"{BASE_URL}/autocomplete", params={"q": query})
+        assert result.status_code == 200
+        assert 1 in [row["commune_id"] for row in result.json()], query
+    assert client.get(f"{BASE_URL}/autocomplete", params={"q": "la salv"}).json()[0]["commune_ville"] == "La Salvetat-sur-Agout"
+    assert client.get(f"{BASE_URL}/autocomplete", params={"q": "zuidw"}).json() == []
+
+    # L'index est rechargé après une écriture
+    client.patch(f"{BASE_URL}/1", json={"commune_ville": "Wervicq-Sud"})
+    assert client.get(f"{BASE_URL}/autocomplete", params={"q": "zuid"}).json() == []
+    assert [row["commune_id"] for row in client.get(f"{BASE_URL}/autocomplete", params={"q": "wervicq"}).json()] == [1]
+
+def test_autocomplete_communes_limit(client: TestClient):
+    assert len(client.get(f"{BASE_URL}/autocomplete", params={"q": "3", "limit": 1}).json()) == 1
+    assert client.get(f"{BASE_URL}/autocomplete", params={"q": ""}).status_code == 422
+    assert client.get(f"{BASE_URL}/autocomplete", params={"q": "3", "limit": 51}).status_code == 422
+
+def test_autocomplete_serves_previous_index_during_reload(client: TestClient, query_budget):
+    assert client.get(f"{BASE_URL}/autocomplete", params={"q": "wervicq"}).json()
+    commune_index.invalidate()
+    # Une autre requête recharge l'index : celle-ci sert la version précédente, sans requête SQL
+    assert commune_index.begin_reload()
+    try:
+        with query_budget(0):
+            assert [row["commune_id"] for row in client.get(f"{BASE_URL}/autocomplete", params={"q": "wervicq"}).json()] == [1]
+        assert commune_index.stale
+    finally:
+        commune_index.end_reload()
+    client.get(f"{BASE_URL}/autocomplete", params={"q": "wervicq"})
+    assert not commune_index.stale
+
 def test_delete_commune(client: TestClient):
     result: Response = client.delete(f"{BASE_URL}/1")
     assert result.status_code == 204
     result_alt: Response = client.get(f"{BASE_URL}/1")
     assert result_alt.status_code == 404
 
+def test_autocomplete_communes_after_delete(client: TestClient):
+    assert client.get(f"{BASE_URL}/autocomplete", params={"q": "wervicq"}).json() == []
+
 def test_delete_commune_404(client: TestClient):
     result: Response = client.delete(f"{BASE_URL}/1000")
-    assert result.status_code == 404
\ No newline at end of file
+    assert result.status_code == 404
+
+def test_upsert_communes_bulk(client: TestClient):
+    communes = [
+        {"fk_commune_departement": "59", "commune_codepostal": "34293", "commune_ville": "La Salvetat-sur-Agout"},
+        {"fk_commune_departement": "59", "commune_codepostal": "59000", "commune_ville": "Lille"},
+    ]
+    result: Response = client.put(f"{BASE_URL}/bulk", json=communes)
+    assert result.status_code == 200
+    assert result.json() == {"inserted": 1, "updated": 1}
+
+    result = client.put(f"{BASE_URL}/bulk", json=communes)
+    assert result.json() == {"inserted": 0, "updated": 2}
+
+def test_upsert_communes_bulk_400(client: TestClient):
+    communes = [{"fk_commune_departement": "59", "commune_ville": "Sans code postal"}]
+    result: Response = client.put(f"{BASE_URL}/bulk", json=communes)
+    assert result.status_code == 400
+
+def test_import_communes_csv(client: TestClient):
+    content = (
+        "Code_postal;Nom_commune;Département;Nom département\n"
+        "59200;Tourcoing;59;Nord\n"
+        "85000;La Roche-sur-Yon;85;Vendée\n"
+        ";Sans code postal;59;Nord\n"
+        "59100;Roubaix;;\n"
+    )
+    result: Response = client.post(f"{BASE_URL}/import", params={"chunk_size": 2}, content=content.encode())
+    assert result.status_code == 200
+    events = [json.loads(line) for line in result.text.splitlines()]
+    assert [event["chunks"] for event in events[:-1]] == [1, 2]
+    assert events[0]["rejected_rows"] == [{"line": 3, "reason": "Unknown departement '85'."}]
+    assert events[1]["rejected_rows"][0]["line"] == 4
+    assert events[-1] == {"chunks": 2, "rows": 4, "inserted": 2, "updated": 0, "rejected": 2, "departements_created": 0, "done": True}
+
+def test_import_communes_csv_create_departements(client: TestClient):
+    content = "code_postal,ville,departement,nom_departement\n85000,La Roche-sur-Yon,85,Vendée\n86000,Poitiers,86,Vienne\n"
+    result: Response = client.post(f"{BASE_URL}/import", params={"create_departements": True}, content=content.encode())
+    assert result.status_code == 200
+    summary = json.loads(result.text.splitlines()[-1])
+    assert summary["inserted"] == 2
+    assert summary["departements_created"] == 2
+    assert client.get("/departement/85").json()["departement_nom"] == "Vendée"
+
+def test_import_communes_csv_rejects_underived_departements(client: TestClient):
+    content = "code_postal;ville;departement\n20000;Ajaccio;\n97400;Saint-Denis;\n"
+    result: Response = client.post(f"{BASE_URL}/import", content=content.encode())
+    assert result.status_code == 200
+    events = [json.loads(line) for line in result.text.splitlines()]
+    reasons = [row["reason"] for row in events[0]["rejected_rows"]]
+    assert reasons == [
+        "Departement is required for Corsican postal codes (2A or 2B).",
+        "Departement cannot be derived from the overseas postal code '97400'.",
+    ]
+    assert events[-1]["inserted"] == 0
+
+def test_import_communes_csv_400(client: TestClient):
+    result: Response = client.post(f"{BASE_URL}/import", content=b"ville;departement\nLille;59\n")
+    assert result.status_code == 400
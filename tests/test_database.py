@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.database import get_async_db, get_async_read_db
+
+
+def _track(dependency, name: str, calls: list):
+    """Enveloppe l'override d'une dépendance de session pour enregistrer ses appels."""
+    original = app.dependency_overrides[dependency]
+
+    async def tracking_session():
+        calls.append(name)
+        async for session in original():
+            yield session
+
+    app.dependency_overrides[dependency] = tracking_session
+
+
+def test_get_uses_read_session(client: TestClient):
+    calls = []
+    _track(get_async_read_db, "read", calls)
+    _track(get_async_db, "primary", calls)
+    result = client.get("/objet/")
+    assert result.status_code == 200
+    assert calls == ["read"]
+
+
+def test_patch_uses_primary_session(client: TestClient):
+    calls = []
+    _track(get_async_read_db, "read", calls)
+    _track(get_async_db, "primary", calls)
+    result = client.patch("/objet/1000000", json={"objet_libelee": "Fantôme"})
+    assert result.status_code == 404
+    assert calls == ["primary"]
@@ -1,8 +1,14 @@
+import pytest
 from fastapi import Response
 from fastapi.testclient import TestClient
 
+from src.models.departement_model import Departement
+from src.pagination import encode_cursor
+from src.repositories.bulk import upsert_many
+
 BASE_URL = "/departement"
 
+@pytest.mark.query_budget(1)
 def test_get_all_departements(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/")
     assert result.status_code == 200
@@ -10,6 +16,21 @@ def test_get_all_departements(client: TestClient):
     assert isinstance(data, list)
     assert len(data) > 0
     
+@pytest.mark.query_budget(1)
+def test_get_all_departements_cursor(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/?limit=1")
+    assert result.status_code == 200
+    assert result.json()[0]["departement_code"] == "59"
+    cursor = result.headers["X-Next-Cursor"]
+
+    result = client.get(f"{BASE_URL}/?limit=1&cursor={cursor}")
+    assert result.status_code == 200
+    assert result.json()[0]["departement_code"] == "83"
+
+def test_get_all_departements_cursor_wrong_key_type(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/", params={"cursor": encode_cursor(59)})
+    assert result.status_code == 400
+
 def test_get_departement_by_id(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/59")
     assert result.status_code == 200
@@ -45,6 +66,17 @@ def test_delete_departement(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/83")
     assert result.status_code == 404
 
+def test_delete_referenced_departement_409(client: TestClient, foreign_keys):
+    assert client.post(f"{BASE_URL}/", json={"departement_code": "12", "departement_nom": "Aveyron"}).status_code == 201
+    commune = {"fk_commune_departement": "12", "commune_ville": "Rodez", "commune_codepostal": "12000"}
+    assert client.post("/commune/", json=commune).status_code == 201
+
+    result: Response = client.delete(f"{BASE_URL}/12")
+    assert result.status_code == 409
+    assert client.get(f"{BASE_URL}/12").status_code == 200
+    result = client.delete(BASE_URL + "/", params={"ids": ["12"]})
+    assert result.status_code == 409
+
 def test_delete_departement_404(client: TestClient):
     result:Response= client.delete(f"{BASE_URL}/64")
     assert result.status_code == 404
@@ -58,4 +90,44 @@ def test_get_departement_by_id_404(client: TestClient):
 
 
     
-    
\ No newline at end of file
+    
+def test_create_departements_bulk(client: TestClient):
+    new_departements = [
+        {"departement_code": "75", "departement_nom": "Paris"},
+        {"departement_code": "76", "departement_nom": "Seine-Maritime"},
+    ]
+    result: Response = client.post(f"{BASE_URL}/bulk", json=new_departements)
+    assert result.status_code == 201
+    assert result.json() == {"created": 2, "ids": ["75", "76"]}
+    result = client.get(f"{BASE_URL}/76")
+    assert result.status_code == 200
+
+def test_upsert_departements_bulk(client: TestClient):
+    departements = [
+        {"departement_code": "59", "departement_nom": "Nord"},
+        {"departement_code": "62", "departement_nom": "Pas-de-Calais"},
+    ]
+    result: Response = client.put(f"{BASE_URL}/bulk", json=departements)
+    assert result.status_code == 200
+    assert result.json() == {"inserted": 1, "updated": 1}
+    assert client.get(f"{BASE_URL}/59").json()["departement_nom"] == "Nord"
+    assert client.get(f"{BASE_URL}/62").json()["departement_nom"] == "Pas-de-Calais"
+
+def test_upsert_many_duplicate_key_across_chunks(test_session):
+    departements = [
+        {"departement_code": "63", "departement_nom": "Puy-de-Dome"},
+        {"departement_code": "63", "departement_nom": "Puy-de-Dôme"},
+    ]
+    try:
+        # Une clé répétée n'est écrite et comptée qu'une fois, même dans deux paquets : sa dernière occurrence l'emporte
+        assert upsert_many(test_session, Departement, departements, ["departement_code"], chunk_size=1) == (1, 0)
+        assert test_session.get(Departement, "63").departement_nom == "Puy-de-Dôme"
+    finally:
+        test_session.rollback()
+
+def test_delete_departements_bulk(client: TestClient):
+    result = client.delete(BASE_URL + "/", params={"ids": ["75", "76", "00"]})
+    assert result.status_code == 200
+    assert result.json() == {"deleted": 2}
+    assert client.get(f"{BASE_URL}/75").status_code == 404
+    assert client.get(f"{BASE_URL}/76").status_code == 404
@@ -1,8 +1,10 @@
+import pytest
 from fastapi import Response
 from fastapi.testclient import TestClient
 
 BASE_URL = "/detail_commande"
 
+@pytest.mark.query_budget(1)
 def test_get_all_detail_commandes(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/")
     assert result.status_code == 200
@@ -58,6 +60,35 @@ def test_patch_detail_commande_404(client: TestClient):
     result: Response = client.patch(f"{BASE_URL}/5555", json=update_detail_commandecommande)
     assert result.status_code == 404
 
+def test_get_detail_commandes_backlog(client: TestClient):
+    # Commande 1 is deleted by test_commande
+    client.patch("/commande/2", json={"fk_client_id": 2})
+    client.patch(f"{BASE_URL}/1", json={"fk_detail_commande_commande_id": 2})
+    result: Response = client.get(f"{BASE_URL}/backlog", params={"commande_id": 2})
+    assert result.status_code == 200
+    assert result.json() == [{
+        "detail_commande_id": 1,
+        "fk_detail_commande_commande_id": 2,
+        "fk_client_id": 2,
+        "fk_detail_commande_variation_objet_id": 1,
+        "ordered_quantity": 5,
+        "shipped_quantity": 0,
+        "remaining_quantity": 5,
+    }]
+
+    # 4 of the 5 ordered items put in a colis
+    client.patch("/detail_colis/1", json={"fk_detail_commande_id": 1})
+    data = client.get(f"{BASE_URL}/backlog", params={"client_id": 2}).json()
+    assert [(line["shipped_quantity"], line["remaining_quantity"]) for line in data] == [(4, 1)]
+
+    result = client.get(f"{BASE_URL}/backlog", params={"limit": 1})
+    assert len(result.json()) == 1
+    cursor = result.headers["X-Next-Cursor"]
+    data = client.get(f"{BASE_URL}/backlog", params={"limit": 1, "cursor": cursor}).json()
+    assert data[0]["detail_commande_id"] > 1
+
+    client.patch("/detail_colis/1", json={"fk_detail_commande_id": None})
+
 def test_delete_detail_commande(client: TestClient):
     result: Response = client.delete(f"{BASE_URL}/1")
     assert result.status_code == 204
@@ -1,8 +1,10 @@
+import pytest
 from fastapi import Response
 from fastapi.testclient import TestClient
 
 BASE_URL = "/detail_colis"
 
+@pytest.mark.query_budget(1)
 def test_get_all_detail_colis(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/")
     assert result.status_code == 200
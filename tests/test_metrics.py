@@ -0,0 +1,54 @@
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from src.metrics import RequestContextMiddleware, current_request, route_path
+
+BASE_URL = "/metrics"
+
+def _sample(text: str, name: str, **labels) -> float:
+    """Retourne la valeur d'un échantillon du texte Prometheus, ou 0 s'il est absent."""
+    selector = name + "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+    for line in text.splitlines():
+        if line.startswith(selector + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+def test_get_metrics(client: TestClient):
+    client.get("/objet/2")
+    result: Response = client.get(BASE_URL)
+    assert result.status_code == 200
+    assert result.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in result.text
+    assert _sample(result.text, "http_requests_total", method="GET", route="/objet/{id}", status="200") >= 1
+
+def test_metrics_count_statements(client: TestClient):
+    before = client.get(BASE_URL).text
+    client.get("/client/", params={"limit": 1})
+    client.get("/client/", params={"limit": 1})
+    after = client.get(BASE_URL).text
+
+    labels = {"method": "GET", "route": "/client/"}
+    assert _sample(after, "http_request_duration_seconds_count", **labels) == _sample(before, "http_request_duration_seconds_count", **labels) + 2
+    # Une page de liste est lue en une instruction
+    assert _sample(after, "http_request_db_statements_sum", **labels) == _sample(before, "http_request_db_statements_sum", **labels) + 2
+    assert _sample(after, "http_request_db_duration_seconds_sum", **labels) > _sample(before, "http_request_db_duration_seconds_sum", **labels)
+    assert _sample(after, "http_request_db_statements_bucket", **labels, le="+Inf") == _sample(after, "http_request_db_statements_count", **labels)
+
+def test_metrics_unmatched_route(client: TestClient):
+    client.get("/does-not-exist")
+    text = client.get(BASE_URL).text
+    assert _sample(text, "http_requests_total", method="GET", route="<unmatched>", status="404") >= 1
+
+def test_request_context_without_metrics():
+    # Sans METRICS_ENABLED, la route reste connue du journal des requêtes lentes
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/commande/{id}")
+    def read_route(id: int):
+        stats = current_request.get()
+        return {"method": stats.scope["method"], "route": route_path(stats.scope)}
+
+    with TestClient(app) as test_client:
+        assert test_client.get("/commande/12").json() == {"method": "GET", "route": "/commande/{id}"}
+    assert current_request.get() is None
@@ -0,0 +1,96 @@
+from fastapi import Response
+from fastapi.testclient import TestClient
+from src import cache
+from src.database import slow_query_log
+
+BASE_URL = "/monitoring"
+
+def test_get_pool(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/pool")
+    assert result.status_code == 200
+    data = result.json()
+    assert isinstance(data, dict)
+    assert "primary" in data
+    assert "primary_async" in data
+    assert "wait_avg_ms" in data["primary"]
+
+def test_get_cache(client: TestClient):
+    objet_id = client.post("/objet/", json={"objet_libelee": "Cape", "objet_points": 5}).json()["objet_id"]
+    before = client.get(f"{BASE_URL}/cache").json()["t_objets"]
+    assert client.get(f"/objet/{objet_id}").json()["objet_libelee"] == "Cape"
+    after = client.get(f"{BASE_URL}/cache").json()["t_objets"]
+    assert after["hits"] == before["hits"] + 1
+    assert {"t_departements", "t_communes", "t_variations_objets"} <= set(client.get(f"{BASE_URL}/cache").json())
+
+def test_cache_invalidated_on_update(client: TestClient):
+    objet_id = client.post("/objet/", json={"objet_libelee": "Cape", "objet_points": 5}).json()["objet_id"]
+    client.get(f"/objet/{objet_id}")
+    client.patch(f"/objet/{objet_id}", json={"objet_points": 6})
+    assert client.get(f"/objet/{objet_id}").json()["objet_points"] == 6
+    client.delete(f"/objet/{objet_id}")
+    assert client.get(f"/objet/{objet_id}").status_code == 404
+
+def test_cache_drops_rows_read_before_invalidation():
+    objets = cache.TTLCache("test", max_size=10, ttl=60)
+    generation = objets.generation
+    # Une écriture invalide la ligne pendant que la lecture est en cours
+    objets.invalidate(1)
+    objets.set(1, {"objet_points": 5}, generation)
+    assert objets.get(1) is None
+    objets.set(1, {"objet_points": 6}, objets.generation)
+    assert objets.get(1) == {"objet_points": 6}
+
+def test_cache_not_filled_from_replica(monkeypatch):
+    class ReplicaSession:
+        bind = object()
+
+    assert cache.fills_cache(ReplicaSession())
+    monkeypatch.setattr(cache, "async_read_engine", ReplicaSession.bind)
+    assert not cache.fills_cache(ReplicaSession())
+
+def test_get_autocomplete(client: TestClient):
+    client.get("/commune/autocomplete", params={"q": "59"})
+    data = client.get(f"{BASE_URL}/autocomplete").json()
+    assert data["keys"] > 0
+    assert data["stale"] is False
+
+def test_get_slow_queries(client: TestClient, monkeypatch):
+    monkeypatch.setattr(slow_query_log, "enabled", True)
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    client.delete(f"{BASE_URL}/slow-queries")
+    client.get("/client/", params={"limit": 1, "offset": 0})
+
+    data = client.get(f"{BASE_URL}/slow-queries").json()
+    assert data["enabled"] is True
+    entry = data["entries"][0]
+    assert entry["method"] == "GET"
+    assert entry["route"] == "/client/"
+    assert entry["statement"].startswith("SELECT")
+    # Only the types of the bound values are kept
+    assert entry["parameters"] == ["int", "int"]
+    assert any("t_clients" in row["detail"] for row in entry["plan"])
+
+    assert client.delete(f"{BASE_URL}/slow-queries").status_code == 204
+    assert client.get(f"{BASE_URL}/slow-queries").json()["entries"] == []
+
+def test_slow_queries_skip_explain_on_streamed_export(client: TestClient, monkeypatch):
+    monkeypatch.setattr(slow_query_log, "enabled", True)
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    client.delete(f"{BASE_URL}/slow-queries")
+
+    result = client.get("/client/export")
+    assert result.status_code == 200
+    assert result.text.splitlines()
+
+    entries = [entry for entry in client.get(f"{BASE_URL}/slow-queries").json()["entries"] if entry["route"] == "/client/export"]
+    assert entries
+    # The export reads its rows through a server-side cursor: no EXPLAIN on its connection
+    assert all(entry["plan"] is None for entry in entries)
+    client.delete(f"{BASE_URL}/slow-queries")
+
+def test_slow_queries_disabled(client: TestClient):
+    client.delete(f"{BASE_URL}/slow-queries")
+    client.get("/client/", params={"limit": 1})
+    data = client.get(f"{BASE_URL}/slow-queries").json()
+    assert data["enabled"] is False
+    assert data["entries"] == []
@@ -1,8 +1,13 @@
+import pytest
 from fastapi import Response
 from fastapi.testclient import TestClient
 
+from src.models.objet_model import Objet
+from src.repositories.bulk import insert_many
+
 BASE_URL = "/objet"
 
+@pytest.mark.query_budget(1)
 def test_get_all_objets(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/")
     assert result.status_code == 200
@@ -66,3 +71,56 @@ def test_delete_objet(client: TestClient):
 def test_delete_objet_404(client: TestClient):
     result = client.delete(f"{BASE_URL}/9999")
     assert result.status_code == 404
+
+def test_create_objets_bulk(client: TestClient):
+    new_objets = [{"objet_libelee": f"Objet {i}", "objet_points": i} for i in range(5)]
+    result: Response = client.post(BASE_URL + "/bulk", json=new_objets)
+    assert result.status_code == 201
+    data = result.json()
+    assert data["created"] == 5
+    assert data["ids"] == sorted(data["ids"])
+    last_objet = client.get(f"{BASE_URL}/{data['ids'][-1]}").json()
+    assert last_objet["objet_libelee"] == "Objet 4"
+
+def test_insert_many_mixed_primary_keys(test_session):
+    rows = [
+        {"objet_id": 700, "objet_libelee": "Clé fournie", "objet_points": 1},
+        {"objet_id": None, "objet_libelee": "Clé générée", "objet_points": 2},
+        {"objet_id": 701, "objet_libelee": "Autre clé fournie", "objet_points": 3},
+    ]
+    try:
+        ids = insert_many(test_session, Objet, rows)
+        assert ids[0] == 700 and ids[2] == 701
+        assert ids[1] not in (None, 700, 701)
+        for objet_id, row in zip(ids, rows):
+            assert test_session.get(Objet, objet_id).objet_libelee == row["objet_libelee"]
+    finally:
+        test_session.rollback()
+
+def test_upsert_objets_bulk(client: TestClient):
+    objets = [
+        {"objet_id": 2, "objet_libelee": "Baton légendaire", "objet_points": 80},
+        {"objet_id": 500, "objet_libelee": "Bouclier", "objet_points": 20},
+    ]
+    result: Response = client.put(BASE_URL + "/bulk", json=objets)
+    assert result.status_code == 200
+    assert result.json() == {"inserted": 1, "updated": 1}
+    assert client.get(f"{BASE_URL}/2").json()["objet_points"] == 80
+    assert client.get(f"{BASE_URL}/500").json()["objet_libelee"] == "Bouclier"
+
+def test_delete_objets_bulk(client: TestClient):
+    ids = client.post(BASE_URL + "/bulk", json=[{"objet_libelee": "Jetable", "objet_points": 1}] * 2).json()["ids"]
+    result = client.delete(BASE_URL + "/", params={"ids": ids + [9999]})
+    assert result.status_code == 200
+    assert result.json() == {"deleted": 2}
+    for objet_id in ids:
+        assert client.get(f"{BASE_URL}/{objet_id}").status_code == 404
+
+def test_get_all_objets_etag(client: TestClient):
+    etag = client.get(f"{BASE_URL}/").headers["ETag"]
+    result = client.get(f"{BASE_URL}/", headers={"If-None-Match": etag})
+    assert result.status_code == 304
+    client.post(f"{BASE_URL}/", json={"objet_libelee": "Anneau", "objet_points": 15})
+    result = client.get(f"{BASE_URL}/", headers={"If-None-Match": etag})
+    assert result.status_code == 200
+    assert result.headers["ETag"] != etag
@@ -0,0 +1,15 @@
+import pytest
+from fastapi.testclient import TestClient
+
+def test_query_budget_exceeded(client: TestClient, query_budget):
+    with query_budget(0), pytest.raises(pytest.fail.Exception, match=r"GET /client/ a exécuté 1 instructions SQL pour un budget de 0"):
+        client.get("/client/")
+
+@pytest.mark.query_budget(1)
+def test_query_budget_marker(client: TestClient, query_budget):
+    client.get("/client/")
+    # The fixture overrides the marker inside its block only: a creation is an INSERT followed by a SELECT
+    with query_budget(2):
+        client.post("/client/", json={"client_prenom": "anne", "client_nom": "budget"})
+    with pytest.raises(pytest.fail.Exception):
+        client.post("/client/", json={"client_prenom": "anne", "client_nom": "budget"})
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlmodel import SQLModel
+
+from src.database import _missing_unique_constraints
+
+# Budget de temps (en secondes) pour importer src.main dans un processus neuf
+IMPORT_BUDGET = float(os.getenv("STARTUP_IMPORT_BUDGET", "3.0"))
+
+MEASURE_IMPORT = (
+    "import time; start = time.perf_counter(); import src.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def test_import_main_within_budget():
+    # Aucune base n'est joignable ici : l'import ne doit ouvrir aucune connexion
+    env = {**os.environ, "DB_URL": "", "DB_HOST": "unreachable.invalid"}
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE_IMPORT],
+        capture_output=True, text=True, env=env, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    elapsed = float(result.stdout.strip().splitlines()[-1])
+    assert elapsed < IMPORT_BUDGET, f"import src.main took {elapsed:.3f}s (budget {IMPORT_BUDGET}s)"
+
+
+def test_lifespan_starts_without_schema_check(client: TestClient):
+    result = client.get("/")
+    assert result.status_code == 200
+
+
+def test_verify_reports_missing_unique_constraint():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with engine.connect() as connection:
+        assert _missing_unique_constraints(connection) == []
+
+    # Table t_communes créée avant l'ajout de uq_communes_codepostal_ville
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t_communes (commune_id INTEGER PRIMARY KEY, commune_codepostal VARCHAR(5), commune_ville VARCHAR(50))"))
+        assert _missing_unique_constraints(connection) == ["t_communes (commune_codepostal, commune_ville)"]
+        connection.execute(text("CREATE UNIQUE INDEX uq_communes_codepostal_ville ON t_communes (commune_codepostal, commune_ville)"))
+        assert _missing_unique_constraints(connection) == []
+
+
+def test_forked_child_does_not_reuse_parent_pools():
+    from src import database
+
+    parent_pools = [database.engine.pool, database.async_engine.sync_engine.pool]
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        child_pools = [database.engine.pool, database.async_engine.sync_engine.pool]
+        os.write(write_fd, b"1" if all(child is not parent for child, parent in zip(child_pools, parent_pools)) else b"0")
+        os._exit(0)
+    os.close(write_fd)
+    try:
+        assert os.read(read_fd, 1) == b"1"
+    finally:
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+    assert database.engine.pool is parent_pools[0]
+    assert database.async_engine.sync_engine.pool is parent_pools[1]
@@ -1,9 +1,11 @@
+import pytest
 from fastapi import Response
 from fastapi.testclient import TestClient
 from decimal import Decimal
 
 BASE_URL = "/variation_objet"
 
+@pytest.mark.query_budget(1)
 def test_get_all_variation_objets(client: TestClient):
     result: Response = client.get(f"{BASE_URL}/")
     assert result.status_code == 200
@@ -71,3 +73,13 @@ def test_delete_variation_objet(client: TestClient):
 def test_delete_variation_objet_404(client: TestClient):
     result = client.delete(f"{BASE_URL}/9999")
     assert result.status_code == 404
+
+def test_get_all_variation_objets_matches_get_by_id(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/")
+    assert result.status_code == 200
+    assert result.headers["content-type"] == "application/json"
+    items = result.json()
+    assert items
+    for item in items:
+        assert isinstance(item["variation_objet_poids"], (str, type(None)))
+        assert client.get(f"{BASE_URL}/{item['variation_objet_id']}").json() == item